@@ -0,0 +1,195 @@
+"""
+Activity Log Writer
+===================
+
+Asynchronous, batched writer for the user_activity_log table. Events are
+appended to an in-memory queue by the caller and written by a background
+thread with one executemany per batch, so logging an activity never waits
+on the database. A batch is written when it reaches ``batch_size`` events
+or ``flush_interval`` seconds after its first event, whichever comes first;
+``flush()`` writes everything queued so far (used on logout) and the queue
+is drained when the process exits.
+
+High-volume event types can be sampled: ``sample_rates`` maps an activity
+type to the fraction of its events that are kept (1.0 keeps all, 0 drops
+all). Types not listed are always kept.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import atexit
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Defaults, overridable through the "activity_log" configuration section
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_BATCH_SIZE = 100
+
+# Events kept in memory while the database is unreachable; the oldest are
+# dropped beyond this
+MAX_PENDING_EVENTS = 10000
+
+# Queue marker that stops the writer thread
+_STOP = object()
+
+
+class ActivityLogWriter:
+    """Background writer that batches user activity events"""
+
+    def __init__(self, db_conn, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 sample_rates: Optional[Dict[str, float]] = None):
+        """
+        Initialize the writer
+
+        Args:
+            db_conn: DatabaseConnection used for the inserts
+            flush_interval: Maximum seconds an event waits before being written
+            batch_size: Events per insert batch
+            sample_rates: Fraction of events kept per activity type
+        """
+        self.db_conn = db_conn
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.sample_rates = dict(sample_rates or {})
+        self.dropped_events = 0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._pending: List[Tuple] = []
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def log(self, user_id: int, session_id: Optional[str], activity_type: str,
+            description: str, ip_address: str = None) -> bool:
+        """
+        Queue an activity event
+
+        Args:
+            user_id: User ID
+            session_id: Session the event belongs to
+            activity_type: Type of activity
+            description: Activity description
+            ip_address: Client IP address
+
+        Returns:
+            True if the event was queued, False if it was sampled out
+        """
+        rate = self.sample_rates.get(activity_type, 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            return False
+
+        self._ensure_started()
+        # The event time is taken now, not when the batch is written
+        self._queue.put((user_id, session_id, activity_type, description, ip_address,
+                         datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Write all queued events now
+
+        Args:
+            timeout: Maximum seconds to wait for the write
+
+        Returns:
+            True if the queued events were written within the timeout
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Write the remaining events and stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _ensure_started(self):
+        """Start the writer thread on first use"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer",
+                                                daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        """Writer thread: collect events into batches and write them"""
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write_pending()
+                return
+
+            if isinstance(item, threading.Event):
+                self._write_pending()
+                deadline = time.monotonic() + self.flush_interval if self._pending else None
+                item.set()
+                continue
+
+            if item is not None:
+                self._pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if len(self._pending) >= self.batch_size or (
+                    deadline is not None and time.monotonic() >= deadline):
+                self._write_pending()
+                deadline = time.monotonic() + self.flush_interval if self._pending else None
+
+    def _write_pending(self):
+        """Insert the pending events in batches; keep them for a retry on failure"""
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            conn = cursor = None
+            try:
+                conn = self.db_conn.connect()
+                cursor = conn.cursor()
+                is_mysql = hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
+                placeholder = '%s' if is_mysql else '?'
+                cursor.executemany(f"""
+                    INSERT INTO user_activity_log (user_id, session_id, activity_type,
+                                                 activity_description, ip_address, timestamp)
+                    VALUES ({', '.join([placeholder] * 6)})
+                """, batch)
+                conn.commit()
+            except Exception as e:
+                print(f"Error writing activity log batch: {e}")
+                if conn is not None:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                if len(self._pending) > MAX_PENDING_EVENTS:
+                    overflow = len(self._pending) - MAX_PENDING_EVENTS
+                    del self._pending[:overflow]
+                    self.dropped_events += overflow
+                    print(f"Activity log backlog full, dropped {overflow} oldest events")
+                return
+            finally:
+                # Failed batches are retried every flush interval: never leak the connection
+                if cursor is not None:
+                    cursor.close()
+                if conn is not None:
+                    conn.close()
+            del self._pending[:len(batch)]
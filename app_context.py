@@ -0,0 +1,92 @@
+"""
+Application Context
+===================
+
+Objects shared by the login window and the main application: the loaded
+configuration, one pooled database connection manager and one UserManager.
+They are created once at startup and passed through login into the main
+window, so the user schema DDL and the default admin check run only once.
+Data the main window needs can be prefetched on the worker pool while the
+login window is shown and taken once the main window is built. When
+``backup.enabled`` and ``backup.run_in_app`` are set, the backup scheduler
+runs on a background thread for the life of the application.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+from typing import Any, Callable, Dict
+
+import background_tasks
+from backup_scheduler import BackupScheduler
+from db_config import get_database_connection, get_pooled_database_connection
+from user_manager import UserManager, create_default_admin_user
+
+
+class AppContext:
+    """Shared application state created once at startup"""
+
+    def __init__(self, config_file: str = "config.json"):
+        """
+        Initialize application context
+
+        Args:
+            config_file: Path to database configuration file
+        """
+        self.config_file = config_file
+        self.db_conn = get_pooled_database_connection(config_file)
+        self.config = self.db_conn.config
+        self.user_manager = UserManager(config_file, db_conn=self.db_conn)
+        self._prefetched: Dict[str, Any] = {}
+        self.backup_scheduler = None
+
+        backup_config = self.config.get_backup_config()
+        if backup_config.get('enabled') and backup_config.get('run_in_app'):
+            try:
+                # Own connections, so backup workers do not drain the pool
+                self.backup_scheduler = BackupScheduler.from_config(get_database_connection(config_file))
+                self.backup_scheduler.start()
+            except Exception as e:
+                print(f"Could not start the backup scheduler: {e}")
+
+    def ensure_default_admin(self) -> bool:
+        """Create the default admin account if no users exist"""
+        return create_default_admin_user(self.user_manager)
+
+    def close(self):
+        """Flush background writers before the application exits"""
+        if self.backup_scheduler is not None:
+            self.backup_scheduler.stop()
+        self.user_manager.close()
+
+    def prefetch(self, name: str, func: Callable, *args):
+        """Start loading data on the worker pool.
+
+        Args:
+            name: Key the result is taken by (see take_prefetched)
+            func: Loader to run in the worker; must not touch Tk
+            *args: Arguments passed to func
+        """
+        self._prefetched[name] = background_tasks.submit(func, *args)
+
+    def take_prefetched(self, name: str, default: Any = None, timeout: float = None) -> Any:
+        """Take a prefetched result, waiting for it if it is still loading.
+
+        Each result can only be taken once, so later reloads go to the source.
+
+        Args:
+            name: Key passed to prefetch
+            default: Returned if nothing was prefetched or the loader failed
+            timeout: Maximum seconds to wait (None waits until done)
+
+        Returns:
+            The loader's return value, or default
+        """
+        future = self._prefetched.pop(name, None)
+        if future is None:
+            return default
+        try:
+            return future.result(timeout)
+        except Exception as e:
+            print(f"Prefetch of {name} failed: {e}")
+            return default
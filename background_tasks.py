@@ -0,0 +1,70 @@
+"""
+Background Tasks
+================
+
+Runs slow, non-UI work (password hashing, database round trips, data
+prefetch) on a shared worker pool and hands the result back to the Tk
+thread. Tk widgets must only be touched from the thread running mainloop,
+so completion is detected by polling with ``widget.after`` and the callbacks
+always run on the Tk thread.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+# Interval between completion checks, in milliseconds
+POLL_INTERVAL_MS = 50
+
+# Shared worker pool; hashlib's PBKDF2 and database drivers release the GIL
+# while they work, so the Tk thread stays responsive
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="workflow-bg")
+
+
+def submit(func: Callable, *args, **kwargs) -> Future:
+    """Run func(*args, **kwargs) on the worker pool"""
+    return executor.submit(func, *args, **kwargs)
+
+
+def run_in_background(widget, func: Callable, on_success: Callable,
+                      on_error: Optional[Callable] = None, *args, **kwargs) -> Future:
+    """Run a function on the worker pool and deliver its result on the Tk thread.
+
+    Args:
+        widget: Any Tk widget, used to schedule the completion polling
+        func: Function to run in the worker; must not touch Tk
+        on_success: Called on the Tk thread with the function's return value
+        on_error: Called on the Tk thread with the raised exception
+            (the callbacks are skipped if the widget has been destroyed)
+        *args, **kwargs: Arguments passed to func
+
+    Returns:
+        The Future for the submitted work
+    """
+    future = executor.submit(func, *args, **kwargs)
+
+    def poll():
+        # The window may have been closed while the work was running
+        try:
+            if not widget.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        if not future.done():
+            widget.after(POLL_INTERVAL_MS, poll)
+            return
+
+        error = future.exception()
+        if error is None:
+            on_success(future.result())
+        elif on_error:
+            on_error(error)
+        else:
+            print(f"Background task failed: {error}")
+
+    widget.after(POLL_INTERVAL_MS, poll)
+    return future
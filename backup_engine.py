@@ -0,0 +1,1219 @@
+"""
+Backup Engine
+=============
+
+Native database backups without external binaries. Every table is dumped
+by a streaming cursor into compressed, chunked JSON Lines files, and a
+``manifest.json`` records the schema, row counts and SHA-256 checksums of
+every file together with the run's throughput.
+
+On MySQL the tables are dumped in parallel, one worker connection each,
+under a consistent snapshot: all workers open ``START TRANSACTION WITH
+CONSISTENT SNAPSHOT`` while a brief ``FLUSH TABLES WITH READ LOCK`` holds
+writes. Without the RELOAD privilege needed for that lock, each worker gets
+its own snapshot and the manifest records ``"snapshot": "per-connection"``.
+SQLite is dumped on one connection inside a single read transaction.
+
+Backup layout::
+
+    <location>/backup_YYYYmmdd_HHMMSS/
+        manifest.json
+        <table>.0001.jsonl.gz
+        <table>.0002.jsonl.gz
+        ...
+
+Files are compressed with gzip, or zstd when the optional ``zstandard``
+package is installed and selected. A backup is written to a ``.partial``
+directory and renamed when complete, so readers never see half a backup.
+
+Incremental backups dump only the rows changed since the previous backup.
+Tables with a change-tracking column (``last_update``, ``last_updated``,
+...) and a primary key record a watermark; the next backup selects the rows
+whose change time is at or after it, writes the table's current primary
+keys in key order to ``<table>.keys.*`` and the keys that disappeared since
+the parent backup (found by merging the two sorted key lists) to
+``<table>.tombstones.*``. Other tables are dumped in full. Every
+``full_every`` backups a new full backup starts a fresh chain, and
+BackupRestorer replays a chain (the full backup, then each incremental in
+order) to restore any backup in it.
+
+Restores load tables in parallel on MySQL, one worker connection per table,
+with multi-row INSERTs and foreign key and unique checks disabled.
+Secondary indexes are left out of the CREATE TABLE and built once the
+table's rows are loaded. Every file is checked against the manifest's
+SHA-256 before anything is dropped.
+
+Backup writes can be throttled to a number of bytes per second, shared by
+all workers, so scheduled backups do not saturate the disk.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import base64
+import datetime
+import decimal
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from db_config import begin_transaction
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+BACKUP_FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+BACKUP_PREFIX = "backup_"
+
+# Defaults, overridable through the "backup" configuration section
+DEFAULT_WORKERS = 4
+DEFAULT_COMPRESSION = "gzip"
+DEFAULT_CHUNK_ROWS = 100000
+DEFAULT_FULL_EVERY = 7  # Backups per chain: one full, then incrementals
+
+# Rows fetched from the server per round trip
+FETCH_BATCH_ROWS = 1000
+
+# Rows per multi-row INSERT on restore; SQLite statements are also limited
+# to SQLITE_MAX_VARIABLES parameters
+INSERT_BATCH_ROWS = 500
+SQLITE_MAX_VARIABLES = 999
+
+FILE_EXTENSIONS = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+
+# Columns updated on every change, in order of preference, and the insert
+# time used for rows that have never been updated. Only columns that every
+# write of the table sets qualify (timestamp being the insert time of the
+# append-only logs): sessions are deactivated without touching last_activity,
+# so tables tracked by last_activity or modified_date are dumped in full.
+WATERMARK_COLUMNS = ('last_update', 'last_updated', 'timestamp')
+INSERT_WATERMARK_COLUMNS = ('created_date', 'created_at')
+
+# Incrementals re-read rows changed this long before the parent backup
+# started, to cover transactions still open when its snapshot was taken
+WATERMARK_OVERLAP_SECONDS = 300
+
+WATERMARK_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# MySQL key column types whose ORDER BY matches Python's ordering of the
+# decoded values (text is compared as binary); other keys are not tracked
+MYSQL_ORDERED_KEY_TYPES = ('tinyint', 'smallint', 'mediumint', 'int', 'bigint',
+                           'char', 'varchar', 'tinytext', 'text', 'mediumtext', 'longtext',
+                           'date', 'datetime', 'timestamp')
+MYSQL_TEXT_TYPES = ('char', 'varchar', 'tinytext', 'text', 'mediumtext', 'longtext')
+
+
+def _encode_value(value: Any) -> Any:
+    """JSON encoding for column values that json cannot serialise natively"""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat(sep=' ') if isinstance(value, datetime.datetime) else value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {'$b64': base64.b64encode(bytes(value)).decode('ascii')}
+    if isinstance(value, set):
+        return ','.join(sorted(value))
+    raise TypeError(f"Cannot back up value of type {type(value).__name__}")
+
+
+def encode_row(row) -> str:
+    """One row as a JSON Lines record"""
+    return json.dumps(list(row), default=_encode_value, separators=(',', ':'), ensure_ascii=False)
+
+
+def decode_row(line: str) -> List[Any]:
+    """Inverse of encode_row (binary values come back as bytes)"""
+    return [bytes(base64.b64decode(value['$b64'])) if isinstance(value, dict) else value
+            for value in json.loads(line)]
+
+
+def watermark_columns(columns: List[str]) -> List[str]:
+    """Change-tracking columns of a table (empty if it has none)"""
+    changed = [name for name in WATERMARK_COLUMNS if name in columns][:1]
+    if not changed:
+        return []
+    return changed + [name for name in INSERT_WATERMARK_COLUMNS if name in columns][:1]
+
+
+def watermark_text(value: Any) -> Optional[str]:
+    """A change time as 'YYYY-mm-dd HH:MM:SS', or None if it is not a time"""
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.strftime(WATERMARK_FORMAT)
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time()).strftime(WATERMARK_FORMAT)
+    try:
+        return datetime.datetime.fromisoformat(str(value).strip()).strftime(WATERMARK_FORMAT)
+    except ValueError:
+        return None
+
+
+def key_order(info: Dict[str, Any], is_mysql: bool) -> Optional[str]:
+    """
+    ORDER BY list putting a table's primary keys in key_sort_value order
+
+    Args:
+        info: The table's schema from BackupEngine._table_schema
+        is_mysql: Whether the table is in MySQL
+
+    Returns:
+        Comma-separated order expressions, or None if the table has no
+        primary key or its key cannot be ordered the same way in Python
+    """
+    column_types = info.get('column_types', {})
+    order = []
+    for name in info['primary_key']:
+        quoted = quote_identifier(name, is_mysql)
+        column_type = column_types.get(name, '')
+        if is_mysql:
+            if column_type not in MYSQL_ORDERED_KEY_TYPES:
+                return None
+            order.append(f"CAST({quoted} AS BINARY)" if column_type in MYSQL_TEXT_TYPES else quoted)
+        else:
+            # SQLite orders NULL, numbers, text, blobs like key_sort_value;
+            # text must be compared by code point whatever the column's collation
+            order.append(quoted if 'INT' in column_type.upper() else f"{quoted} COLLATE BINARY")
+    return ", ".join(order) or None
+
+
+def key_sort_value(key: List[Any]) -> Tuple:
+    """Sort value of a decoded primary key, ranking types the way SQLite does"""
+    value = []
+    for part in key:
+        if part is None:
+            value.append((0, 0))
+        elif isinstance(part, (int, float)):
+            value.append((1, part))
+        elif isinstance(part, str):
+            value.append((2, part))
+        else:
+            value.append((3, bytes(part)))
+    return tuple(value)
+
+
+def _ascending_keys(table: str, lines):
+    """(sort value, line) of encoded keys, failing if they are not strictly ascending"""
+    previous = None
+    for line in lines:
+        value = key_sort_value(decode_row(line))
+        if previous is not None and value <= previous:
+            raise ValueError(f"Primary keys of {table} are not in key order")
+        previous = value
+        yield value, line
+
+
+class IOThrottle:
+    """Limits the combined write rate of all backup workers"""
+
+    def __init__(self, bytes_per_second: float):
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._next_free = time.monotonic()
+
+    def consume(self, size: int):
+        """Wait until size more bytes fit within the rate"""
+        with self._lock:
+            now = time.monotonic()
+            self._next_free = max(self._next_free, now) + size / self.bytes_per_second
+            delay = self._next_free - now
+        # A second of burst is allowed before writers are held back
+        if delay > 1.0:
+            time.sleep(delay - 1.0)
+
+
+class _HashingWriter(io.RawIOBase):
+    """File wrapper that tracks the SHA-256 and size of the bytes written"""
+
+    def __init__(self, path: str, throttle: Optional[IOThrottle] = None):
+        self._file = open(path, 'wb')
+        self.sha256 = hashlib.sha256()
+        self.bytes_written = 0
+        self.throttle = throttle
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.throttle is not None:
+            self.throttle.consume(len(data))
+        self.sha256.update(data)
+        self.bytes_written += len(data)
+        return self._file.write(data)
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def open_chunk_writer(hashing_writer: _HashingWriter, compression: str):
+    """Compressed binary stream writing into a _HashingWriter"""
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=3).stream_writer(hashing_writer, closefd=False)
+    return gzip.GzipFile(fileobj=hashing_writer, mode='wb', compresslevel=6)
+
+
+def open_chunk_reader(path: str, compression: str):
+    """Text stream over a compressed chunk file"""
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("This backup is zstd-compressed; install the 'zstandard' package")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return io.TextIOWrapper(raw, encoding='utf-8')
+    return gzip.open(path, 'rt', encoding='utf-8')
+
+
+class _ChunkWriter:
+    """Writes JSON Lines records into numbered, compressed chunk files"""
+
+    def __init__(self, directory: str, prefix: str, compression: str, chunk_rows: int,
+                 throttle: Optional[IOThrottle] = None):
+        self.directory = directory
+        self.prefix = prefix
+        self.compression = compression
+        self.chunk_rows = chunk_rows
+        self.throttle = throttle
+        self.files: List[Dict[str, Any]] = []
+        self.rows = 0
+        self._chunk = None
+        self._writer = None
+        self._stream = None
+
+    def write(self, line: str):
+        if self._chunk is None or self._chunk['rows'] >= self.chunk_rows:
+            self._close_chunk()
+            name = f"{self.prefix}.{len(self.files) + 1:04d}{FILE_EXTENSIONS[self.compression]}"
+            self._chunk = {'file': name, 'rows': 0}
+            self._writer = _HashingWriter(os.path.join(self.directory, name), self.throttle)
+            self._stream = open_chunk_writer(self._writer, self.compression)
+        self._stream.write(line.encode('utf-8') + b'\n')
+        self._chunk['rows'] += 1
+        self.rows += 1
+
+    def _close_chunk(self):
+        if self._chunk is None:
+            return
+        self._stream.close()
+        self._writer.close()
+        self._chunk['bytes'] = self._writer.bytes_written
+        self._chunk['sha256'] = self._writer.sha256.hexdigest()
+        self.files.append(self._chunk)
+        self._chunk = None
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish the last chunk; returns the files written (name, rows, bytes, sha256)"""
+        self._close_chunk()
+        return self.files
+
+    def abort(self):
+        """Release the open file after an error"""
+        if self._writer is not None and not self._writer.closed:
+            self._writer.close()
+
+
+def iter_chunk_lines(backup_dir: str, files: List[Dict[str, Any]], compression: str):
+    """Yield the records of a list of chunk files, in order"""
+    for chunk in files:
+        with open_chunk_reader(os.path.join(backup_dir, chunk['file']), compression) as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if line:
+                    yield line
+
+
+def table_files(info: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Every chunk file of a table in a manifest (rows, keys and tombstones)"""
+    return (info.get('files', []) + info.get('keys', {}).get('files', [])
+            + info.get('tombstones', {}).get('files', []))
+
+
+_MYSQL_INDEX = re.compile(r'^(?:UNIQUE |FULLTEXT |SPATIAL )?KEY\s+`[^`]+`\s*\((.*)\)')
+_MYSQL_FOREIGN_KEY = re.compile(r'FOREIGN KEY\s*\(([^)]*)\)')
+
+
+def split_mysql_indexes(create_sql: str) -> Tuple[str, List[str]]:
+    """
+    Separate the secondary indexes from a SHOW CREATE TABLE statement
+
+    Indexes that back a foreign key stay in the table definition, since
+    the constraint needs them when the table is created.
+
+    Returns:
+        (create statement without the indexes, index definitions)
+    """
+    lines = create_sql.split('\n')
+    foreign_keys = [match.group(1) for match in _MYSQL_FOREIGN_KEY.finditer(create_sql)]
+    kept, deferred = [], []
+    for line in lines[1:-1]:
+        definition = line.strip().rstrip(',')
+        match = _MYSQL_INDEX.match(definition)
+        if match and not any(match.group(1).startswith(columns) for columns in foreign_keys):
+            deferred.append(definition)
+        else:
+            kept.append(line.rstrip().rstrip(','))
+    return '\n'.join([lines[0], ',\n'.join(kept), lines[-1]]), deferred
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_mysql_connection(conn) -> bool:
+    """Check whether a connection is a MySQL connection"""
+    return hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
+
+
+def quote_identifier(name: str, is_mysql: bool) -> str:
+    """Quote a table or column name"""
+    return f"`{name}`" if is_mysql else f'"{name}"'
+
+
+def load_manifest(backup_dir: str) -> Dict[str, Any]:
+    """Read a backup's manifest"""
+    with open(os.path.join(backup_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_backups(location: str) -> List[Dict[str, Any]]:
+    """
+    Completed backups in a location, oldest first
+
+    Returns:
+        Manifests, each with an added 'path' key
+    """
+    backups = []
+    if not os.path.isdir(location):
+        return backups
+    for name in sorted(os.listdir(location)):
+        path = os.path.join(location, name)
+        if not name.startswith(BACKUP_PREFIX) or name.endswith('.partial') \
+                or not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+            continue
+        try:
+            manifest = load_manifest(path)
+        except Exception as e:
+            logger.warning(f"Skipping unreadable backup {path}: {e}")
+            continue
+        manifest['path'] = path
+        backups.append(manifest)
+    # Same-second backups are numbered backup_..._2, backup_..._3, ...
+    backups.sort(key=lambda manifest: (manifest.get('created', ''), len(manifest['id']), manifest['id']))
+    return backups
+
+
+class BackupEngine:
+    """Creates native, compressed, checksummed database backups"""
+
+    def __init__(self, db_conn, location: str, workers: int = DEFAULT_WORKERS,
+                 compression: str = DEFAULT_COMPRESSION,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 full_every: int = DEFAULT_FULL_EVERY,
+                 throttle_bytes_per_second: float = 0,
+                 progress: Optional[Callable[[str, int], None]] = None):
+        """
+        Initialize the engine
+
+        Args:
+            db_conn: DatabaseConnection to back up
+            location: Directory that receives the backup directories
+            workers: Parallel worker connections (MySQL only)
+            compression: 'gzip' or 'zstd' (gzip if zstandard is not installed)
+            chunk_rows: Rows per chunk file
+            full_every: Backups per chain; an incremental request makes a
+                full backup when the chain would grow past this
+            throttle_bytes_per_second: Maximum combined write rate of the
+                backup files (0 for no limit)
+            progress: Optional callback(table, rows_dumped), called from
+                worker threads as each table finishes
+        """
+        self.db_conn = db_conn
+        self.location = location
+        self.workers = max(1, int(workers))
+        if compression == 'zstd' and zstandard is None:
+            logger.warning("zstandard is not installed, compressing backups with gzip")
+            compression = 'gzip'
+        if compression not in FILE_EXTENSIONS:
+            raise ValueError(f"Unsupported backup compression: {compression}")
+        self.compression = compression
+        self.chunk_rows = max(1, int(chunk_rows))
+        self.full_every = max(1, int(full_every))
+        self.throttle = IOThrottle(throttle_bytes_per_second) if throttle_bytes_per_second > 0 else None
+        self.progress = progress
+
+    @classmethod
+    def from_config(cls, db_conn, location: str = None, **kwargs) -> 'BackupEngine':
+        """Create an engine from the "backup" configuration section"""
+        backup_config = db_conn.config.get_backup_config()
+        return cls(
+            db_conn,
+            location or backup_config.get('location', './backups'),
+            workers=int(backup_config.get('workers', DEFAULT_WORKERS)),
+            compression=backup_config.get('compression', DEFAULT_COMPRESSION),
+            chunk_rows=int(backup_config.get('chunk_rows', DEFAULT_CHUNK_ROWS)),
+            full_every=int(backup_config.get('full_every', DEFAULT_FULL_EVERY)),
+            **kwargs
+        )
+
+    def create_backup(self, incremental: bool = False) -> Dict[str, Any]:
+        """
+        Dump the database into a new backup directory
+
+        Args:
+            incremental: Dump only the rows changed since the latest backup in
+                the location; a full backup is made instead if there is none
+                or its chain already holds full_every backups
+
+        Returns:
+            The backup's manifest, with an added 'path' key
+        """
+        started = time.monotonic()
+        created = datetime.datetime.now()
+        backup_id = self._new_backup_id(created)
+        backup_dir = os.path.join(self.location, backup_id)
+        partial_dir = backup_dir + '.partial'
+        os.makedirs(partial_dir, exist_ok=True)
+        # Watermarks never pass the snapshot time minus the overlap
+        cutoff = (created - datetime.timedelta(seconds=WATERMARK_OVERLAP_SECONDS)).strftime(WATERMARK_FORMAT)
+
+        connections, snapshot = self._open_snapshots()
+        try:
+            is_mysql = is_mysql_connection(connections[0])
+            db_type = 'mysql' if is_mysql else 'sqlite'
+            parent = self._find_parent(db_type) if incremental else None
+
+            cursor = connections[0].cursor()
+            tables = self._list_tables(cursor, is_mysql)
+            schema = {name: self._table_schema(cursor, name, is_mysql) for name, _ in tables}
+            triggers = self._list_triggers(cursor, is_mysql)
+            cursor.close()
+
+            plans = {name: self._table_plan(name, schema[name], parent)
+                     for name, _ in tables if schema[name]['data']}
+            table_manifests = self._dump_tables(connections, list(plans), schema, plans,
+                                                partial_dir, is_mysql, cutoff)
+        except Exception:
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            raise
+        finally:
+            for conn in connections:
+                try:
+                    conn.rollback()
+                    conn.close()
+                except Exception:
+                    pass
+
+        for name, _ in tables:
+            schema[name].update(table_manifests.get(name, {'mode': 'full', 'rows': 0, 'files': []}))
+
+        duration = time.monotonic() - started
+        total_rows = sum(table['rows'] for table in schema.values())
+        total_deleted = sum(table.get('tombstones', {}).get('rows', 0) for table in schema.values())
+        total_bytes = sum(chunk['bytes'] for table in schema.values() for chunk in table_files(table))
+        manifest = {
+            'format_version': BACKUP_FORMAT_VERSION,
+            'id': backup_id,
+            'type': 'incremental' if parent else 'full',
+            'parent': parent['id'] if parent else None,
+            'base': parent.get('base', parent['id']) if parent else backup_id,
+            'chain_length': parent.get('chain_length', 0) + 1 if parent else 0,
+            'created': created.isoformat(sep=' ', timespec='seconds'),
+            'db_type': db_type,
+            'database': self.db_conn.db_config.get('database_name'),
+            'compression': self.compression,
+            'snapshot': snapshot,
+            'tables': schema,
+            'triggers': triggers,
+            'rows': total_rows,
+            'deleted': total_deleted,
+            'bytes': total_bytes,
+            'duration_seconds': round(duration, 3),
+            'rows_per_second': round(total_rows / duration, 1) if duration else None,
+            'bytes_per_second': round(total_bytes / duration, 1) if duration else None,
+        }
+        with open(os.path.join(partial_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.rename(partial_dir, backup_dir)
+
+        logger.info(f"Backup {backup_id} ({manifest['type']}): {len(schema)} tables, "
+                    f"{total_rows} rows, {total_deleted} deletes, "
+                    f"{total_bytes / 1024 / 1024:.1f} MB in {duration:.1f}s "
+                    f"({manifest['rows_per_second'] or 0:.0f} rows/s)")
+        manifest['path'] = backup_dir
+        return manifest
+
+    def _find_parent(self, db_type: str) -> Optional[Dict[str, Any]]:
+        """The backup an incremental builds on, or None if a full backup is due"""
+        database = self.db_conn.db_config.get('database_name')
+        backups = [manifest for manifest in list_backups(self.location)
+                   if manifest.get('db_type') == db_type and manifest.get('database') == database]
+        if not backups:
+            return None
+        parent = backups[-1]
+        if parent.get('format_version', 1) < 2 or parent.get('chain_length', 0) + 1 >= self.full_every:
+            return None
+        return parent
+
+    @staticmethod
+    def _table_plan(table: str, info: Dict[str, Any],
+                    parent: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Whether a table is dumped in full or incrementally, and from when"""
+        parent_table = parent['tables'].get(table) if parent else None
+        if (parent_table is None or not info['watermark_columns'] or not info['primary_key']
+                or parent_table.get('watermark') is None
+                or parent_table.get('keys', {}).get('order') != 'primary_key'
+                or any(parent_table.get(key) != info[key]
+                       for key in ('columns', 'primary_key', 'watermark_columns'))):
+            return {'mode': 'full'}
+        return {
+            'mode': 'incremental',
+            'since': parent_table['watermark'],
+            'parent_dir': parent['path'],
+            'parent_keys': parent_table['keys']['files'],
+            'parent_compression': parent['compression'],
+        }
+
+    def _new_backup_id(self, created: datetime.datetime) -> str:
+        """backup_YYYYmmdd_HHMMSS, with a counter if that name is taken"""
+        backup_id = f"{BACKUP_PREFIX}{created.strftime('%Y%m%d_%H%M%S')}"
+        candidate, counter = backup_id, 1
+        while any(os.path.exists(os.path.join(self.location, candidate + suffix))
+                  for suffix in ('', '.partial')):
+            counter += 1
+            candidate = f"{backup_id}_{counter}"
+        return candidate
+
+    def _open_snapshots(self) -> Tuple[list, str]:
+        """Open the worker connections, all reading the same snapshot if possible"""
+        first = self.db_conn.connect()
+        if not is_mysql_connection(first):
+            # SQLite: one connection; the read transaction is the snapshot
+            first.execute("BEGIN")
+            return [first], 'consistent'
+
+        connections = [first]
+        coordinator = None
+        locked = False
+        try:
+            try:
+                coordinator = self.db_conn.connect()
+                coordinator.cursor().execute("FLUSH TABLES WITH READ LOCK")
+                locked = True
+            except Exception as e:
+                logger.warning(f"Could not lock tables for a shared snapshot, "
+                               f"using per-connection snapshots: {e}")
+            while len(connections) < self.workers:
+                connections.append(self.db_conn.connect())
+            for conn in connections:
+                cursor = conn.cursor()
+                cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+                cursor.close()
+        except Exception:
+            for conn in connections:
+                conn.close()
+            raise
+        finally:
+            if coordinator is not None:
+                if locked:
+                    coordinator.cursor().execute("UNLOCK TABLES")
+                coordinator.close()
+        return connections, 'consistent' if locked or len(connections) == 1 else 'per-connection'
+
+    def _list_tables(self, cursor, is_mysql: bool) -> List[Tuple[str, int]]:
+        """(table, estimated rows) for every table, largest first"""
+        if is_mysql:
+            cursor.execute("""
+                SELECT TABLE_NAME, COALESCE(TABLE_ROWS, 0) FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'
+                ORDER BY TABLE_ROWS DESC, TABLE_NAME
+            """)
+            return [(name, int(rows)) for name, rows in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+            ORDER BY name
+        """)
+        rows = cursor.fetchall()
+        # Shadow tables of virtual tables are recreated with the virtual table
+        virtual = [name for name, sql in rows if (sql or '').upper().startswith('CREATE VIRTUAL TABLE')]
+        return [(name, 0) for name, _ in rows
+                if not any(name.startswith(f"{vtab}_") for vtab in virtual)]
+
+    def _table_schema(self, cursor, table: str, is_mysql: bool) -> Dict[str, Any]:
+        """Create statement, columns, primary key and indexes of a table"""
+        quoted = quote_identifier(table, is_mysql)
+        if is_mysql:
+            cursor.execute(f"SHOW CREATE TABLE {quoted}")
+            create_sql = cursor.fetchone()[1]
+            cursor.execute("""
+                SELECT COLUMN_NAME, COLUMN_KEY, DATA_TYPE FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                ORDER BY ORDINAL_POSITION
+            """, (table,))
+            column_rows = cursor.fetchall()
+            columns = [name for name, _, _ in column_rows]
+            column_types = {name: data_type.lower() for name, _, data_type in column_rows}
+            primary_key = [name for name, key, _ in column_rows if key == 'PRI']
+            indexes = []  # Part of SHOW CREATE TABLE
+            virtual = False
+        else:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            create_sql = cursor.fetchone()[0]
+            virtual = create_sql.upper().startswith('CREATE VIRTUAL TABLE')
+            cursor.execute(f"PRAGMA table_info({quoted})")
+            column_rows = cursor.fetchall()
+            columns = [row[1] for row in column_rows]
+            column_types = {row[1]: (row[2] or '').lower() for row in column_rows}
+            primary_key = [row[1] for row in sorted(column_rows, key=lambda row: row[5]) if row[5]]
+            cursor.execute("""
+                SELECT sql FROM sqlite_master
+                WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL
+            """, (table,))
+            indexes = [row[0] for row in cursor.fetchall()]
+
+        return {
+            'create_sql': create_sql,
+            'columns': columns,
+            'column_types': column_types,
+            'primary_key': primary_key,
+            'indexes': indexes,
+            'virtual': virtual,
+            'watermark_columns': [] if virtual else watermark_columns(columns),
+            # Virtual tables are rebuilt from their content table, not dumped
+            'data': not virtual,
+        }
+
+    def _list_triggers(self, cursor, is_mysql: bool) -> List[str]:
+        """Create statements of all triggers (restored after the data)"""
+        if not is_mysql:
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND sql IS NOT NULL")
+            return [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT TRIGGER_NAME FROM information_schema.TRIGGERS
+            WHERE TRIGGER_SCHEMA = DATABASE()
+        """)
+        triggers = []
+        for (name,) in cursor.fetchall():
+            cursor.execute(f"SHOW CREATE TRIGGER `{name}`")
+            triggers.append(cursor.fetchone()[2])
+        return triggers
+
+    def _dump_tables(self, connections: list, tables: List[str], schema: Dict[str, Dict[str, Any]],
+                     plans: Dict[str, Dict[str, Any]], backup_dir: str, is_mysql: bool,
+                     cutoff: str) -> Dict[str, Dict[str, Any]]:
+        """Dump tables in parallel, one worker per connection"""
+        def dump_on(conn, table):
+            return self._dump_table(conn, table, schema[table], plans[table], backup_dir, is_mysql, cutoff)
+
+        if len(connections) == 1:
+            # SQLite connections stay on the thread that opened them
+            return {table: dump_on(connections[0], table) for table in tables}
+
+        idle = queue.Queue()
+        for conn in connections:
+            idle.put(conn)
+
+        def dump(table):
+            conn = idle.get()
+            try:
+                return table, dump_on(conn, table)
+            finally:
+                idle.put(conn)
+
+        with ThreadPoolExecutor(max_workers=len(connections), thread_name_prefix="backup") as pool:
+            return dict(pool.map(dump, tables))
+
+    def _dump_table(self, conn, table: str, info: Dict[str, Any], plan: Dict[str, Any],
+                    backup_dir: str, is_mysql: bool, cutoff: str) -> Dict[str, Any]:
+        """
+        Stream one table into chunk files
+
+        Args:
+            conn: Connection holding the snapshot
+            table: Table name
+            info: The table's schema from _table_schema
+            plan: The table's plan from _table_plan
+            backup_dir: Directory receiving the chunk files
+            is_mysql: Whether conn is MySQL
+            cutoff: Latest watermark this backup may record
+
+        Returns:
+            Dictionary with 'mode', 'rows' and 'files' (name, rows, bytes,
+            sha256), plus 'watermark', 'keys' and 'tombstones' for tables
+            with change tracking
+        """
+        incremental = plan['mode'] == 'incremental'
+        quoted = quote_identifier(table, is_mysql)
+        columns = info['columns']
+        watermark_index = [columns.index(name) for name in info['watermark_columns']]
+        order = key_order(info, is_mysql)
+        track_keys = bool(watermark_index and order)
+
+        where, params = "", ()
+        if incremental:
+            changed = [quote_identifier(name, is_mysql) for name in info['watermark_columns']]
+            changed = changed[0] if len(changed) == 1 else f"COALESCE({', '.join(changed)})"
+            if is_mysql:
+                since = "%s"
+            else:
+                # Normalise text timestamps ('T' separator, fractions) before comparing
+                changed, since = f"datetime({changed})", "datetime(?)"
+            where = f"WHERE {changed} >= {since} OR {changed} IS NULL"
+            params = (plan['since'],)
+
+        cursor = conn.cursor()
+        data = _ChunkWriter(backup_dir, table, self.compression, self.chunk_rows, self.throttle)
+        latest = None
+        try:
+            cursor.execute(f"SELECT * FROM {quoted} {where}", params)
+            while True:
+                rows = cursor.fetchmany(FETCH_BATCH_ROWS)
+                if not rows:
+                    break
+                for row in rows:
+                    data.write(encode_row(row))
+                    if watermark_index:
+                        value = watermark_text(next((row[i] for i in watermark_index
+                                                     if row[i] is not None), None))
+                        if value is not None and (latest is None or value > latest):
+                            latest = value
+            entry = {'mode': plan['mode'], 'rows': data.rows, 'files': data.close()}
+
+            if incremental:
+                entry['since'] = plan['since']
+            if watermark_index:
+                seen = [value for value in (latest, plan.get('since')) if value]
+                entry['watermark'] = min(max(seen), cutoff) if seen else cutoff
+            if track_keys:
+                entry.update(self._write_keys(cursor, table, info, plan, backup_dir,
+                                              is_mysql, order))
+        except Exception:
+            data.abort()
+            raise
+        finally:
+            cursor.close()
+
+        if self.progress:
+            self.progress(table, entry['rows'])
+        return entry
+
+    def _write_keys(self, cursor, table: str, info: Dict[str, Any], plan: Dict[str, Any],
+                    backup_dir: str, is_mysql: bool, order: str) -> Dict[str, Any]:
+        """
+        Write a table's primary keys in key order, and for incrementals the
+        tombstones: parent keys that no longer exist
+
+        Both key lists are sorted, so the tombstones come from a single
+        merge of the two streams and no keys are held in memory.
+
+        Returns:
+            Dictionary with 'keys' and, for incrementals, 'tombstones'
+            (each with 'rows' and 'files')
+        """
+        key_columns = ", ".join(quote_identifier(name, is_mysql) for name in info['primary_key'])
+        cursor.execute(f"SELECT {key_columns} FROM {quote_identifier(table, is_mysql)} "
+                       f"ORDER BY {order}")
+
+        def fetched():
+            while True:
+                rows = cursor.fetchmany(FETCH_BATCH_ROWS)
+                if not rows:
+                    return
+                for row in rows:
+                    yield encode_row(row)
+
+        current = _ascending_keys(table, fetched())
+        keys = _ChunkWriter(backup_dir, f"{table}.keys", self.compression,
+                            self.chunk_rows, self.throttle)
+        tombstones = None
+        try:
+            if plan['mode'] == 'incremental':
+                tombstones = _ChunkWriter(backup_dir, f"{table}.tombstones", self.compression,
+                                          self.chunk_rows, self.throttle)
+                parent = _ascending_keys(table, iter_chunk_lines(
+                    plan['parent_dir'], plan['parent_keys'], plan['parent_compression']))
+                value, line = next(current, (None, None))
+                for parent_value, parent_line in parent:
+                    while line is not None and value < parent_value:
+                        keys.write(line)
+                        value, line = next(current, (None, None))
+                    if line is not None and value == parent_value:
+                        keys.write(line)
+                        value, line = next(current, (None, None))
+                    else:
+                        tombstones.write(parent_line)
+                if line is not None:
+                    keys.write(line)
+            for _, line in current:
+                keys.write(line)
+
+            entry = {'keys': {'rows': keys.rows, 'files': keys.close(), 'order': 'primary_key'}}
+            if tombstones is not None:
+                entry['tombstones'] = {'rows': tombstones.rows, 'files': tombstones.close()}
+            return entry
+        except Exception:
+            keys.abort()
+            if tombstones is not None:
+                tombstones.abort()
+            raise
+
+
+class BackupRestorer:
+    """Restores native backups in parallel, replaying incremental chains"""
+
+    def __init__(self, db_conn, workers: int = DEFAULT_WORKERS, verify: bool = True,
+                 progress: Optional[Callable[[str, int], None]] = None):
+        """
+        Initialize the restorer
+
+        Args:
+            db_conn: DatabaseConnection to restore into
+            workers: Parallel worker connections (MySQL only; SQLite has a
+                single writer and is restored on one connection)
+            verify: Check every file against the manifest checksums first
+            progress: Optional callback(table, rows_loaded), called from
+                worker threads as each table finishes
+        """
+        self.db_conn = db_conn
+        self.workers = max(1, int(workers))
+        self.verify = verify
+        self.progress = progress
+
+    @classmethod
+    def from_config(cls, db_conn, **kwargs) -> 'BackupRestorer':
+        """Create a restorer from the "backup" configuration section"""
+        backup_config = db_conn.config.get_backup_config()
+        return cls(db_conn, workers=int(backup_config.get('workers', DEFAULT_WORKERS)), **kwargs)
+
+    @staticmethod
+    def resolve_chain(backup_dir: str) -> List[Dict[str, Any]]:
+        """
+        The backups needed to restore a backup
+
+        Args:
+            backup_dir: Directory of a full or incremental backup
+
+        Returns:
+            Manifests (with 'path') from the full backup to backup_dir, in
+            replay order
+        """
+        chain = []
+        path = os.path.abspath(backup_dir)
+        while True:
+            manifest = load_manifest(path)
+            if manifest.get('format_version', 1) > BACKUP_FORMAT_VERSION:
+                raise ValueError(f"Backup {manifest.get('id')} was written by a newer version "
+                                 f"(format {manifest['format_version']})")
+            manifest['path'] = path
+            chain.append(manifest)
+            if manifest.get('type', 'full') == 'full':
+                break
+            path = os.path.join(os.path.dirname(path), manifest['parent'])
+            if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+                raise FileNotFoundError(f"Backup {manifest['id']} needs its parent backup "
+                                        f"{manifest['parent']}, which is missing")
+        chain.reverse()
+        return chain
+
+    def verify_checksums(self, chain: List[Dict[str, Any]]) -> int:
+        """
+        Check every file of a chain against its manifest
+
+        Args:
+            chain: Manifests from resolve_chain
+
+        Returns:
+            Number of files checked
+
+        Raises:
+            ValueError: If a file is missing or its checksum does not match
+        """
+        checks = [(os.path.join(manifest['path'], chunk['file']), chunk['sha256'])
+                  for manifest in chain for info in manifest['tables'].values()
+                  for chunk in table_files(info)]
+
+        def check(item):
+            path, expected = item
+            if not os.path.exists(path):
+                return f"{path}: missing"
+            return None if file_sha256(path) == expected else f"{path}: checksum mismatch"
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="restore-verify") as pool:
+            errors = [error for error in pool.map(check, checks) if error]
+        if errors:
+            raise ValueError(f"Backup failed verification ({len(errors)} files):\n" + "\n".join(errors[:10]))
+        return len(checks)
+
+    def restore(self, backup_dir: str) -> Dict[str, Any]:
+        """
+        Restore the database to the state of a backup
+
+        Each table in the backup is dropped and recreated from its latest
+        full dump in the chain, then every later incremental deletes its
+        tombstoned rows and upserts its changed rows; the table's secondary
+        indexes are built after that. Tables are restored in parallel,
+        largest first. Tables not in the backup are left alone.
+
+        Args:
+            backup_dir: Directory of a full or incremental backup
+
+        Returns:
+            Summary with 'backups' (IDs replayed), 'tables', 'rows',
+            'deleted', 'files_verified' and 'duration_seconds'
+        """
+        started = time.monotonic()
+        chain = self.resolve_chain(backup_dir)
+        target = chain[-1]
+        files_verified = self.verify_checksums(chain) if self.verify else 0
+
+        # Each table is replayed from its latest full dump in the chain
+        steps: Dict[str, List[Tuple[Dict[str, Any], Dict[str, Any]]]] = {}
+        for manifest in chain:
+            for table, info in manifest['tables'].items():
+                if info.get('virtual') or table not in target['tables']:
+                    continue
+                if info.get('mode', 'full') == 'full':
+                    steps[table] = []
+                steps.setdefault(table, []).append((manifest, info))
+        tables = sorted(steps, key=lambda table: -sum(
+            chunk['bytes'] for _, info in steps[table] for chunk in table_files(info)))
+
+        conn = self.db_conn.connect()
+        is_mysql = is_mysql_connection(conn)
+        if target['db_type'] != ('mysql' if is_mysql else 'sqlite'):
+            conn.close()
+            raise ValueError(f"Backup {target['id']} is a {target['db_type']} backup")
+
+        connections = [conn]
+        try:
+            while is_mysql and len(connections) < min(self.workers, len(tables)):
+                connections.append(self.db_conn.connect())
+            for worker in connections:
+                self._set_checks(worker, is_mysql, False)
+
+            results = self._replay_tables(connections, tables, steps, is_mysql)
+
+            cursor = conn.cursor()
+            # Tables dropped during the chain
+            for table in {name for manifest in chain[:-1] for name in manifest['tables']} - set(target['tables']):
+                cursor.execute(f"DROP TABLE IF EXISTS {quote_identifier(table, is_mysql)}")
+            self._create_virtual_tables(cursor, target, is_mysql)
+            self._create_triggers(cursor, target)
+            conn.commit()
+            cursor.close()
+        finally:
+            for worker in connections:
+                try:
+                    self._set_checks(worker, is_mysql, True)
+                    worker.close()
+                except Exception:
+                    pass
+
+        duration = time.monotonic() - started
+        total_rows = sum(rows for rows, _ in results.values())
+        total_deleted = sum(deleted for _, deleted in results.values())
+        logger.info(f"Restored {target['id']} ({len(chain)} backups, {len(connections)} workers): "
+                    f"{total_rows} rows, {total_deleted} deletes in {duration:.1f}s")
+        return {
+            'backups': [manifest['id'] for manifest in chain],
+            'tables': len(target['tables']),
+            'rows': total_rows,
+            'deleted': total_deleted,
+            'files_verified': files_verified,
+            'duration_seconds': round(duration, 3),
+        }
+
+    def _replay_tables(self, connections: list, tables: List[str], steps: Dict[str, list],
+                       is_mysql: bool) -> Dict[str, Tuple[int, int]]:
+        """Replay tables in parallel, one worker per connection"""
+        if len(connections) == 1:
+            # SQLite connections stay on the thread that opened them
+            return {table: self._replay_table(connections[0], table, steps[table], is_mysql)
+                    for table in tables}
+
+        idle = queue.Queue()
+        for conn in connections:
+            idle.put(conn)
+
+        def replay(table):
+            conn = idle.get()
+            try:
+                return table, self._replay_table(conn, table, steps[table], is_mysql)
+            finally:
+                idle.put(conn)
+
+        with ThreadPoolExecutor(max_workers=len(connections), thread_name_prefix="restore") as pool:
+            return dict(pool.map(replay, tables))
+
+    def _replay_table(self, conn, table: str, steps: list, is_mysql: bool) -> Tuple[int, int]:
+        """
+        Restore one table from its chain of dumps
+
+        Args:
+            conn: Worker connection
+            table: Table name
+            steps: (manifest, table info) pairs: a full dump, then incrementals
+            is_mysql: Whether conn is MySQL
+
+        Returns:
+            (rows loaded, rows deleted)
+        """
+        rows = deleted = 0
+        deferred_indexes = []
+        cursor = conn.cursor()
+        try:
+            for manifest, info in steps:
+                begin_transaction(conn)
+                if info.get('mode', 'full') == 'full':
+                    deferred_indexes = self._create_table(cursor, table, info, is_mysql)
+                else:
+                    deleted += self._delete_rows(cursor, manifest, table, info, is_mysql)
+                rows += self._load_rows(cursor, manifest, table, info, is_mysql,
+                                        replace=info.get('mode') == 'incremental')
+                conn.commit()
+            for index_sql in deferred_indexes:
+                cursor.execute(index_sql)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+        if self.progress:
+            self.progress(table, rows)
+        return rows, deleted
+
+    @staticmethod
+    def _set_checks(conn, is_mysql: bool, enabled: bool):
+        """Toggle foreign key (and on MySQL unique) checks for a connection"""
+        cursor = conn.cursor()
+        if is_mysql:
+            cursor.execute(f"SET FOREIGN_KEY_CHECKS = {int(enabled)}, UNIQUE_CHECKS = {int(enabled)}")
+        else:
+            cursor.execute(f"PRAGMA foreign_keys = {'ON' if enabled else 'OFF'}")
+        cursor.close()
+
+    @staticmethod
+    def _create_table(cursor, table: str, info: Dict[str, Any], is_mysql: bool) -> List[str]:
+        """
+        Drop and recreate a table without its secondary indexes
+
+        Returns:
+            Statements that build the indexes, to run once the rows are loaded
+        """
+        quoted = quote_identifier(table, is_mysql)
+        cursor.execute(f"DROP TABLE IF EXISTS {quoted}")
+        if not is_mysql:
+            cursor.execute(info['create_sql'])
+            return list(info.get('indexes', []))
+
+        create_sql, indexes = split_mysql_indexes(info['create_sql'])
+        cursor.execute(create_sql)
+        # One sort pass for the B-tree indexes; InnoDB builds FULLTEXT indexes one at a time
+        btree = [index for index in indexes if not index.startswith('FULLTEXT ')]
+        statements = [f"ALTER TABLE {quoted} " + ", ".join(f"ADD {index}" for index in btree)] if btree else []
+        return statements + [f"ALTER TABLE {quoted} ADD {index}" for index in indexes
+                             if index.startswith('FULLTEXT ')]
+
+    @staticmethod
+    def _load_rows(cursor, manifest: Dict[str, Any], table: str, info: Dict[str, Any],
+                   is_mysql: bool, replace: bool = False) -> int:
+        """Insert a table's rows from a backup with multi-row INSERTs"""
+        placeholder = '%s' if is_mysql else '?'
+        column_count = len(info['columns'])
+        columns = ", ".join(quote_identifier(name, is_mysql) for name in info['columns'])
+        # REPLACE also clears rows holding a unique value the changed row now
+        # has; foreign key checks are off, so it does not cascade
+        verb = ('REPLACE' if is_mysql else 'INSERT OR REPLACE') if replace else 'INSERT'
+        prefix = f"{verb} INTO {quote_identifier(table, is_mysql)} ({columns}) VALUES "
+        values = f"({', '.join([placeholder] * column_count)})"
+        batch_rows = INSERT_BATCH_ROWS if is_mysql else \
+            max(1, min(INSERT_BATCH_ROWS, SQLITE_MAX_VARIABLES // column_count))
+        batch_sql = prefix + ", ".join([values] * batch_rows)
+
+        rows = 0
+        params = []
+        pending = 0
+        for line in iter_chunk_lines(manifest['path'], info['files'], manifest['compression']):
+            params.extend(decode_row(line))
+            pending += 1
+            if pending == batch_rows:
+                cursor.execute(batch_sql, params)
+                rows += pending
+                params, pending = [], 0
+        if pending:
+            cursor.execute(prefix + ", ".join([values] * pending), params)
+            rows += pending
+        return rows
+
+    @staticmethod
+    def _delete_rows(cursor, manifest: Dict[str, Any], table: str, info: Dict[str, Any],
+                     is_mysql: bool) -> int:
+        """Delete the rows an incremental backup recorded as deleted"""
+        tombstones = info.get('tombstones')
+        if not tombstones or not tombstones['rows']:
+            return 0
+        placeholder = '%s' if is_mysql else '?'
+        condition = " AND ".join(f"{quote_identifier(name, is_mysql)} = {placeholder}"
+                                 for name in info['primary_key'])
+        sql = f"DELETE FROM {quote_identifier(table, is_mysql)} WHERE {condition}"
+
+        batch = []
+        for line in iter_chunk_lines(manifest['path'], tombstones['files'], manifest['compression']):
+            batch.append(decode_row(line))
+            if len(batch) >= FETCH_BATCH_ROWS:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+        return tombstones['rows']
+
+    @staticmethod
+    def _create_virtual_tables(cursor, manifest: Dict[str, Any], is_mysql: bool):
+        """Recreate virtual (full-text) tables and rebuild them from their content tables"""
+        for table, info in manifest['tables'].items():
+            if not info.get('virtual'):
+                continue
+            quoted = quote_identifier(table, is_mysql)
+            try:
+                cursor.execute(f"DROP TABLE IF EXISTS {quoted}")
+                cursor.execute(info['create_sql'])
+                if 'content=' in info['create_sql'].replace(' ', '').lower():
+                    cursor.execute(f"INSERT INTO {quoted}({quoted}) VALUES ('rebuild')")
+            except Exception as e:
+                logger.warning(f"Could not restore virtual table {table}: {e}")
+
+    @staticmethod
+    def _create_triggers(cursor, manifest: Dict[str, Any]):
+        """Recreate the backup's triggers once the data is loaded"""
+        for trigger_sql in manifest.get('triggers', []):
+            try:
+                cursor.execute(trigger_sql)
+            except Exception as e:
+                logger.warning(f"Could not restore trigger: {e}")
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Backup Scheduler
+================
+
+Runs BackupEngine on the cadence set in the "backup" configuration section
+(``enabled``, ``frequency``, ``location``), either as a standalone headless
+process or as a background thread of the application.
+
+Scheduled backups are incremental between the periodic full backups
+(``full_every``) and run at low priority: the standalone process lowers its
+CPU priority with ``nice`` and all backup writes are throttled to
+``throttle_mb_per_second``. After each run, old backup chains are deleted
+by the retention policy (``keep_chains``, ``max_age_days``); a chain is only
+ever deleted as a whole, so every kept backup can still be restored.
+
+Every run is appended to ``backup_history.jsonl`` in the backup location
+with its status, type, duration, rows and size. The next run is due one
+interval after the last successful run, so a restarted scheduler keeps its
+cadence. A lock file in the location stops two schedulers from backing up
+at the same time.
+
+Usage:
+    python backup_scheduler.py [--config config.json] [--once] [--history]
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from backup_engine import BACKUP_PREFIX, BackupEngine, list_backups
+from db_config import DatabaseConfig, DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+FREQUENCIES = {
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+    'weekly': timedelta(weeks=1),
+    'monthly': timedelta(days=30),
+}
+
+HISTORY_FILE = "backup_history.jsonl"
+LOCK_FILE = ".backup.lock"
+
+# Defaults, overridable through the "backup" configuration section
+DEFAULT_FREQUENCY = "daily"
+DEFAULT_KEEP_CHAINS = 4
+DEFAULT_MAX_AGE_DAYS = 0  # 0 keeps chains regardless of age
+DEFAULT_THROTTLE_MB_PER_SECOND = 20
+DEFAULT_NICE = 10
+
+# Seconds between checks whether a backup is due
+POLL_SECONDS = 60
+
+# Wait after a failed backup before retrying, doubled for each further
+# failure in a row up to the scheduled interval
+RETRY_SECONDS = 300
+
+# A lock or .partial directory untouched this long was left by a crashed run
+STALE_SECONDS = 12 * 3600
+
+
+def load_history(location: str, limit: int = None) -> List[Dict[str, Any]]:
+    """
+    Scheduled backup runs recorded in a location, oldest first
+
+    Args:
+        location: Backup location
+        limit: Only the most recent runs
+
+    Returns:
+        History entries
+    """
+    path = os.path.join(location, HISTORY_FILE)
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries[-limit:] if limit else entries
+
+
+def append_history(location: str, entry: Dict[str, Any]):
+    """Record a backup run"""
+    os.makedirs(location, exist_ok=True)
+    with open(os.path.join(location, HISTORY_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+
+
+def rotate_backups(location: str, keep_chains: int = DEFAULT_KEEP_CHAINS,
+                   max_age_days: float = DEFAULT_MAX_AGE_DAYS) -> List[str]:
+    """
+    Delete backup chains beyond the retention policy
+
+    A chain is a full backup and the incrementals built on it. The newest
+    chain is always kept.
+
+    Args:
+        location: Backup location
+        keep_chains: Number of most recent chains to keep
+        max_age_days: Also delete chains whose newest backup is older than
+            this (0 to disable)
+
+    Returns:
+        Paths of the deleted backup directories
+    """
+    chains: Dict[str, List[Dict[str, Any]]] = {}
+    for manifest in list_backups(location):
+        chains.setdefault(manifest.get('base') or manifest['id'], []).append(manifest)
+    ordered = list(chains.values())  # Oldest chain first
+
+    expired = ordered[:-max(1, keep_chains)]
+    if max_age_days:
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat(sep=' ', timespec='seconds')
+        expired += [chain for chain in ordered[len(expired):-1] if chain[-1]['created'] < cutoff]
+
+    removed = []
+    for chain in expired:
+        # Newest first, so a failure never leaves incrementals without their parent
+        for manifest in reversed(chain):
+            shutil.rmtree(manifest['path'])
+            removed.append(manifest['path'])
+
+    # Half-written backups of crashed runs
+    for name in os.listdir(location) if os.path.isdir(location) else []:
+        path = os.path.join(location, name)
+        if name.startswith(BACKUP_PREFIX) and name.endswith('.partial') \
+                and time.time() - os.path.getmtime(path) > STALE_SECONDS:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    return removed
+
+
+class BackupScheduler:
+    """Runs backups on a configured cadence with retention and history"""
+
+    def __init__(self, db_conn, location: str, frequency: str = DEFAULT_FREQUENCY,
+                 enabled: bool = True, incremental: bool = True,
+                 keep_chains: int = DEFAULT_KEEP_CHAINS,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+                 throttle_mb_per_second: float = DEFAULT_THROTTLE_MB_PER_SECOND,
+                 on_run: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            db_conn: DatabaseConnection to back up (not pooled: the backup
+                opens one connection per worker)
+            location: Directory that receives the backups and the history
+            frequency: One of FREQUENCIES
+            enabled: Whether scheduled backups run at all
+            incremental: Make incremental backups between full backups
+            keep_chains: Backup chains kept by the rotation
+            max_age_days: Maximum age of a kept chain (0 for no limit)
+            throttle_mb_per_second: Maximum write rate (0 for no limit)
+            on_run: Optional callback(history_entry) after every run, called
+                from the scheduler thread
+        """
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Unsupported backup frequency: {frequency}")
+        self.db_conn = db_conn
+        self.location = location
+        self.frequency = frequency
+        self.enabled = enabled
+        self.incremental = incremental
+        self.keep_chains = keep_chains
+        self.max_age_days = max_age_days
+        self.throttle_mb_per_second = throttle_mb_per_second
+        self.on_run = on_run
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, db_conn, **kwargs) -> 'BackupScheduler':
+        """Create a scheduler from the "backup" configuration section"""
+        backup_config = db_conn.config.get_backup_config()
+        settings = {
+            'location': backup_config.get('location', './backups'),
+            'frequency': backup_config.get('frequency', DEFAULT_FREQUENCY),
+            'enabled': bool(backup_config.get('enabled', False)),
+            'keep_chains': int(backup_config.get('keep_chains', DEFAULT_KEEP_CHAINS)),
+            'max_age_days': float(backup_config.get('max_age_days', DEFAULT_MAX_AGE_DAYS)),
+            'throttle_mb_per_second': float(backup_config.get('throttle_mb_per_second',
+                                                              DEFAULT_THROTTLE_MB_PER_SECOND)),
+        }
+        settings.update(kwargs)
+        return cls(db_conn, **settings)
+
+    @property
+    def interval(self) -> timedelta:
+        """Time between scheduled backups"""
+        return FREQUENCIES[self.frequency]
+
+    def last_success(self) -> Optional[Dict[str, Any]]:
+        """The most recent successful run, if any"""
+        for entry in reversed(load_history(self.location)):
+            if entry.get('status') == 'success':
+                return entry
+        return None
+
+    def next_run(self) -> datetime:
+        """When the next scheduled backup is due (now if overdue), backing off after failures"""
+        due = datetime.now()
+        failures, last_failure = 0, None
+        for entry in reversed(load_history(self.location)):
+            if entry.get('status') == 'success':
+                due = max(due, datetime.fromisoformat(entry['started']) + self.interval)
+                break
+            failures += 1
+            last_failure = last_failure or datetime.fromisoformat(entry['started'])
+        if failures:
+            retry = min(self.interval, timedelta(seconds=RETRY_SECONDS * 2 ** (failures - 1)))
+            due = max(due, last_failure + retry)
+        return due
+
+    def run_pending(self) -> Optional[Dict[str, Any]]:
+        """Run a backup if one is due; returns its history entry"""
+        if not self.enabled or self.next_run() > datetime.now():
+            return None
+        return self.run_once()
+
+    def run_once(self) -> Optional[Dict[str, Any]]:
+        """
+        Back up now, rotate old backups and record the run
+
+        Returns:
+            The run's history entry, or None if another scheduler holds
+            the lock
+        """
+        if not self._acquire_lock():
+            logger.info(f"Another backup is running in {self.location}, skipping")
+            return None
+
+        started = datetime.now()
+        entry: Dict[str, Any] = {'started': started.isoformat(sep=' ', timespec='seconds')}
+        try:
+            try:
+                engine = BackupEngine.from_config(
+                    self.db_conn, self.location,
+                    throttle_bytes_per_second=self.throttle_mb_per_second * 1024 * 1024)
+                manifest = engine.create_backup(incremental=self.incremental)
+                entry.update({
+                    'status': 'success',
+                    'id': manifest['id'],
+                    'type': manifest['type'],
+                    'rows': manifest['rows'],
+                    'deleted': manifest['deleted'],
+                    'bytes': manifest['bytes'],
+                })
+            except Exception as e:
+                logger.error(f"Scheduled backup failed: {e}")
+                entry.update({'status': 'failed', 'error': str(e)})
+
+            if entry['status'] == 'success':
+                # The backup stands even if old ones could not be removed
+                try:
+                    entry['removed'] = [os.path.basename(path) for path in
+                                        rotate_backups(self.location, self.keep_chains,
+                                                       self.max_age_days)]
+                except Exception as e:
+                    logger.error(f"Could not rotate old backups: {e}")
+                    entry['rotation_error'] = str(e)
+        finally:
+            self._release_lock()
+
+        entry['duration_seconds'] = round((datetime.now() - started).total_seconds(), 3)
+        try:
+            append_history(self.location, entry)
+        except Exception as e:
+            logger.error(f"Could not record backup history: {e}")
+
+        if self.on_run:
+            self.on_run(entry)
+        return entry
+
+    def start(self):
+        """Run the schedule on a background daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="backup-scheduler",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread (a running backup finishes first)"""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def run_forever(self):
+        """Check for due backups until stop() is called"""
+        logger.info(f"Backup scheduler started: {self.frequency} backups to {self.location}, "
+                    f"next at {self.next_run():%Y-%m-%d %H:%M}")
+        while not self._stop.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                logger.error(f"Backup scheduler error: {e}")
+            self._stop.wait(POLL_SECONDS)
+
+    def _acquire_lock(self) -> bool:
+        """Create the lock file, replacing a stale one"""
+        os.makedirs(self.location, exist_ok=True)
+        path = os.path.join(self.location, LOCK_FILE)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode('ascii'))
+                os.close(fd)
+                return True
+            except FileExistsError:
+                if time.time() - os.path.getmtime(path) <= STALE_SECONDS:
+                    return False
+                os.remove(path)
+        return False
+
+    def _release_lock(self):
+        try:
+            os.remove(os.path.join(self.location, LOCK_FILE))
+        except OSError:
+            pass
+
+
+def lower_priority(niceness: int = DEFAULT_NICE):
+    """Lower this process's CPU priority (on Linux, also its best-effort I/O priority)"""
+    if niceness and hasattr(os, 'nice'):
+        try:
+            os.nice(niceness)
+        except OSError as e:
+            logger.warning(f"Could not lower process priority: {e}")
+
+
+def print_history(location: str, limit: int = 20):
+    """Print the most recent scheduled runs"""
+    entries = load_history(location, limit)
+    if not entries:
+        print(f"No scheduled backups recorded in {location}")
+        return
+    for entry in entries:
+        if entry.get('status') == 'success':
+            print(f"  ✓ {entry['started']}  {entry['type']:<11} {entry['rows']:>10,} rows "
+                  f"{entry['bytes'] / 1024 / 1024:>9.1f} MB {entry['duration_seconds']:>8.1f}s  {entry['id']}")
+            if entry.get('rotation_error'):
+                print(f"      rotation failed: {entry['rotation_error']}")
+        else:
+            print(f"  ✗ {entry['started']}  failed after {entry['duration_seconds']:.1f}s: {entry.get('error')}")
+
+
+def main() -> bool:
+    """Run the backup scheduler"""
+    parser = argparse.ArgumentParser(description="Run scheduled database backups")
+    parser.add_argument('--config', default='config.json', help="Database configuration file")
+    parser.add_argument('--once', action='store_true',
+                        help="Make one backup now and exit, even if backups are disabled")
+    parser.add_argument('--history', action='store_true', help="Print the recent backup runs and exit")
+    args = parser.parse_args()
+
+    db_conn = DatabaseConnection(DatabaseConfig(args.config))
+    scheduler = BackupScheduler.from_config(db_conn)
+
+    if args.history:
+        print_history(scheduler.location)
+        return True
+
+    lower_priority(int(db_conn.config.get_backup_config().get('nice', DEFAULT_NICE)))
+
+    if args.once:
+        entry = scheduler.run_once()
+        print_history(scheduler.location, 1)
+        return entry is not None and entry['status'] == 'success'
+
+    if not scheduler.enabled:
+        print("✗ Scheduled backups are disabled (set backup.enabled in the configuration)")
+        return False
+
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        print("\nBackup scheduler stopped")
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Bulk User Import
+================
+
+Command line tool for onboarding many users at once from a CSV or JSON file
+through UserAdministration.bulk_import_users. Every row is validated before
+anything is written, passwords are hashed across all CPU cores, and all
+valid users are inserted in a single transaction. A per-row result report
+is printed and can be written to a CSV file.
+
+Input columns / keys:
+    username, email, password (required)
+    role, privilege_level, company, position, department, employee_id,
+    phone_number, privileges (';'-separated in CSV, a list in JSON)
+
+Usage:
+    python bulk_user_import.py users.csv [--activate] [--dry-run]
+                               [--created-by ADMIN] [--report report.csv]
+
+WARNING: Administrative use only.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+from user_admin import UserAdministration
+
+REPORT_FIELDS = ['row', 'username', 'status', 'user_id', 'message']
+
+
+def load_user_rows(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Read user records from a CSV or JSON file
+
+    Args:
+        file_path: Path to a .csv file with a header row, or a .json file
+            holding a list of objects (or {"users": [...]})
+
+    Returns:
+        List of row dictionaries
+    """
+    if file_path.lower().endswith('.json'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('users', [])
+        return list(data)
+
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def write_report(results: List[Dict[str, Any]], report_path: str):
+    """Write the per-row import results to a CSV file"""
+    with open(report_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main() -> bool:
+    """Run the bulk import"""
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or JSON")
+    parser.add_argument('file', help="CSV or JSON file with user records")
+    parser.add_argument('--config', default='config.json', help="Database configuration file")
+    parser.add_argument('--created-by', help="Username of the admin performing the import")
+    parser.add_argument('--activate', action='store_true', help="Activate users immediately")
+    parser.add_argument('--workers', type=int, help="Hashing processes (default: CPU count)")
+    parser.add_argument('--dry-run', action='store_true', help="Validate only, create nothing")
+    parser.add_argument('--report', help="Write the per-row results to this CSV file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"✗ File not found: {args.file}")
+        return False
+
+    try:
+        rows = load_user_rows(args.file)
+    except Exception as e:
+        print(f"✗ Could not read {args.file}: {e}")
+        return False
+
+    admin = UserAdministration(args.config)
+
+    created_by = None
+    if args.created_by:
+        admin_user = admin.get_user_by_username(args.created_by)
+        if not admin_user:
+            print(f"✗ Admin user '{args.created_by}' not found")
+            return False
+        created_by = admin_user.user_id
+
+    print(f"Importing {len(rows)} users from {args.file}{' (dry run)' if args.dry_run else ''}")
+    results = admin.bulk_import_users(rows, created_by=created_by, auto_activate=args.activate,
+                                      max_workers=args.workers, dry_run=args.dry_run)
+
+    for result in results:
+        if result['status'] in ('invalid', 'failed'):
+            print(f"  ✗ Row {result['row']} ({result['username']}): {result['message']}")
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    print("Summary: " + ", ".join(f"{status} {count}" for status, count in sorted(counts.items())))
+
+    if args.report:
+        write_report(results, args.report)
+        print(f"Report written to {args.report}")
+
+    return not counts.get('invalid') and not counts.get('failed')
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Import Time Budget Check
+========================
+
+Measures how long it takes to import the application entry modules using
+``python -X importtime`` and fails when the import time exceeds the budget or
+when heavy libraries (pandas, matplotlib, image/SVG libraries) are pulled in
+at import time instead of on first use.
+
+Usage:
+    python check_import_budget.py [--budget-ms 750] [module ...]
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# Modules checked when none are given on the command line
+DEFAULT_MODULES = ['main', 'login_gui', 'question_sheet_gui']
+
+# Default budget for importing each module, in milliseconds
+DEFAULT_BUDGET_MS = 750
+
+# Libraries that must only be imported lazily
+HEAVY_MODULES = ['pandas', 'matplotlib', 'cairosvg', 'PIL']
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import(module: str):
+    """Import a module in a fresh interpreter and collect -X importtime data.
+
+    Args:
+        module: Module name to import
+
+    Returns:
+        Tuple (cumulative_ms, timings, error) where timings maps each imported
+        module to its cumulative import time in milliseconds
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=here, capture_output=True, text=True
+    )
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2)) / 1000.0
+
+    error = None
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"
+
+    return timings.get(module, 0.0), timings, error
+
+
+def check_module(module: str, budget_ms: float) -> bool:
+    """Check one module against the budget and print a report"""
+    print(f"\n{module}:")
+    cumulative_ms, timings, error = measure_import(module)
+
+    if error:
+        print(f"  ✗ Import failed: {error}")
+        return False
+
+    ok = True
+    status = "✓" if cumulative_ms <= budget_ms else "✗"
+    print(f"  {status} Import time {cumulative_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    if cumulative_ms > budget_ms:
+        ok = False
+
+    heavy = sorted({name.split('.')[0] for name in timings} & set(HEAVY_MODULES))
+    if heavy:
+        print(f"  ✗ Heavy modules imported eagerly: {', '.join(heavy)}")
+        ok = False
+
+    # Slowest top-level dependencies
+    top_level = sorted(
+        ((ms, name) for name, ms in timings.items() if '.' not in name and name != module),
+        reverse=True
+    )[:5]
+    for ms, name in top_level:
+        print(f"    {ms:8.1f} ms  {name}")
+
+    return ok
+
+
+def main():
+    """Run the import budget check"""
+    parser = argparse.ArgumentParser(description="Check application import time budget")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES,
+                        help="Modules to check (default: %(default)s)")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum import time per module in milliseconds")
+    args = parser.parse_args()
+
+    print("Import Time Budget Check")
+    print("=" * 50)
+
+    results = [check_module(module, args.budget_ms) for module in args.modules]
+
+    print("\n" + "=" * 50)
+    if all(results):
+        print("✓ All modules within import budget")
+        return True
+    print("✗ Import budget exceeded")
+    return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
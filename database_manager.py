@@ -15,9 +15,13 @@ import sqlite3
 import os
 import shutil
 import datetime
+import json
 from typing import List, Dict, Optional, Tuple
-import pandas as pd
 from db_config import get_database_connection
+from background_tasks import run_in_background
+from backup_engine import MANIFEST_FILE, BackupEngine, BackupRestorer
+from backup_scheduler import FREQUENCIES, BackupScheduler
+from treeview_sync import TreeRow, sync_treeview
 
 
 class DatabaseManager:
@@ -123,18 +127,22 @@ class DatabaseManager:
         stats_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
         
         # Create treeview for statistics
-        columns = ('table', 'records', 'size', 'last_modified')
+        columns = ('table', 'records', 'size', 'index_size', 'data_free', 'last_modified')
         self.stats_tree = ttk.Treeview(stats_frame, columns=columns, show='headings', height=8)
         
         # Configure columns
         self.stats_tree.heading('table', text='Table Name')
         self.stats_tree.heading('records', text='Record Count')
-        self.stats_tree.heading('size', text='Size (KB)')
+        self.stats_tree.heading('size', text='Data (KB)')
+        self.stats_tree.heading('index_size', text='Indexes (KB)')
+        self.stats_tree.heading('data_free', text='Free (KB)')
         self.stats_tree.heading('last_modified', text='Last Modified')
         
         self.stats_tree.column('table', width=150)
         self.stats_tree.column('records', width=100)
-        self.stats_tree.column('size', width=100)
+        self.stats_tree.column('size', width=90)
+        self.stats_tree.column('index_size', width=90)
+        self.stats_tree.column('data_free', width=90)
         self.stats_tree.column('last_modified', width=150)
         
         # Add scrollbar
@@ -144,10 +152,27 @@ class DatabaseManager:
         self.stats_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         stats_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Record counts are estimates unless exact counting is enabled
+        self.exact_counts_var = tk.BooleanVar(value=False)
+        self.stats_status_label = ttk.Label(overview_frame, text="")
+        self.stats_status_label.pack(anchor=tk.W, padx=10)
+        
+        button_frame = ttk.Frame(overview_frame)
+        button_frame.pack(pady=10)
+        
         # Refresh button
-        refresh_btn = ttk.Button(overview_frame, text="Refresh Information", 
-                               command=self.refresh_database_info)
-        refresh_btn.pack(pady=10)
+        refresh_btn = ttk.Button(button_frame, text="Refresh Information", 
+                               command=self.refresh_overview)
+        refresh_btn.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Checkbutton(button_frame, text="Exact record counts (slow on large tables)",
+                        variable=self.exact_counts_var,
+                        command=self.load_database_info).pack(side=tk.LEFT, padx=5)
+    
+    def refresh_overview(self):
+        """Refresh connection status and table statistics"""
+        self.refresh_database_info()
+        self.load_database_info()
     
     def create_backup_tab(self):
         """Create database backup tab"""
@@ -175,13 +200,18 @@ class DatabaseManager:
         location_frame.pack(fill=tk.X, pady=10)
         
         ttk.Label(location_frame, text="Backup Location:").pack(side=tk.LEFT)
-        self.backup_location_var = tk.StringVar()
+        self.backup_location_var = tk.StringVar(
+            value=self.db_conn.config.get_backup_config().get('location', ''))
         self.backup_location_entry = ttk.Entry(location_frame, textvariable=self.backup_location_var, width=50)
         self.backup_location_entry.pack(side=tk.LEFT, padx=(10, 5), fill=tk.X, expand=True)
         
         browse_btn = ttk.Button(location_frame, text="Browse", command=self.browse_backup_location)
         browse_btn.pack(side=tk.RIGHT)
         
+        self.incremental_backup_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(backup_section, text="Incremental (only rows changed since the last backup)", 
+                       variable=self.incremental_backup_var).pack(anchor=tk.W, pady=2)
+        
         # Backup button
         backup_btn = ttk.Button(backup_section, text="Create Backup", 
                               command=self.create_backup)
@@ -198,7 +228,7 @@ class DatabaseManager:
         restore_frame = ttk.Frame(restore_section)
         restore_frame.pack(fill=tk.X, pady=10)
         
-        ttk.Label(restore_frame, text="Backup File:").pack(side=tk.LEFT)
+        ttk.Label(restore_frame, text="Backup:").pack(side=tk.LEFT)
         self.restore_file_var = tk.StringVar()
         self.restore_file_entry = ttk.Entry(restore_frame, textvariable=self.restore_file_var, width=50)
         self.restore_file_entry.pack(side=tk.LEFT, padx=(10, 5), fill=tk.X, expand=True)
@@ -320,7 +350,8 @@ class DatabaseManager:
         ttk.Label(config_section, text="Auto-backup Settings:", 
                  font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(0, 10))
         
-        self.auto_backup_var = tk.BooleanVar(value=False)
+        backup_config = self.db_conn.config.get_backup_config()
+        self.auto_backup_var = tk.BooleanVar(value=bool(backup_config.get('enabled', False)))
         ttk.Checkbutton(config_section, text="Enable automatic backups", 
                        variable=self.auto_backup_var).pack(anchor=tk.W, pady=2)
         
@@ -329,11 +360,19 @@ class DatabaseManager:
         freq_frame.pack(fill=tk.X, pady=5)
         
         ttk.Label(freq_frame, text="Backup Frequency:").pack(side=tk.LEFT)
-        self.backup_freq_var = tk.StringVar(value="daily")
+        self.backup_freq_var = tk.StringVar(value=backup_config.get('frequency', 'daily'))
         freq_combo = ttk.Combobox(freq_frame, textvariable=self.backup_freq_var, 
-                                 values=["daily", "weekly", "monthly"], state="readonly")
+                                 values=list(FREQUENCIES), state="readonly")
         freq_combo.pack(side=tk.LEFT, padx=(10, 0))
         
+        # Last and next scheduled backup
+        self.schedule_status_label = ttk.Label(config_section, text=self.get_schedule_status())
+        self.schedule_status_label.pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(config_section, 
+                 text="Scheduled backups run in the application (backup.run_in_app) "
+                      "or in a separate 'python backup_scheduler.py' process.",
+                 foreground='gray').pack(anchor=tk.W, pady=(2, 0))
+        
         # Database paths
         paths_section = ttk.LabelFrame(settings_frame, text="Database Paths", padding="10")
         paths_section.pack(fill=tk.X, padx=10, pady=10)
@@ -413,66 +452,93 @@ class DatabaseManager:
     
     def load_database_info(self):
         """Load database statistics into the treeview"""
+        self.stats_status_label.config(text="Loading table statistics...")
+        exact = self.exact_counts_var.get()
+        
+        def on_stats(stats):
+            self.show_database_stats(stats)
+            if exact:
+                self.stats_status_label.config(text="Counting records...")
+                run_in_background(self.root, self.count_table_records, on_counts, on_error,
+                                  list(stats))
+            else:
+                self.stats_status_label.config(
+                    text=f"{len(stats)} tables; record counts are estimates (~)")
+        
+        def on_counts(counts):
+            for table, count in counts.items():
+                if self.stats_tree.exists(f"table:{table}"):
+                    self.stats_tree.set(f"table:{table}", 'records', f"{count:,}")
+            self.stats_status_label.config(text=f"{len(counts)} tables; exact record counts")
+        
+        def on_error(error):
+            print(f"Error loading database info: {error}")
+            self.stats_status_label.config(text=f"Could not load table statistics: {error}")
+        
+        run_in_background(self.root, self._query_database_stats, on_stats, on_error)
+    
+    def _query_database_stats(self) -> Dict:
+        """Fetch the table statistics on a connection of its own (worker thread)"""
+        conn = self.db_conn.connect()
         try:
-            # Clear existing items
-            for item in self.stats_tree.get_children():
-                self.stats_tree.delete(item)
-            
-            # Get MySQL database stats
-            try:
-                conn = self.db_conn.connect()
-                stats = self.get_mysql_database_stats(conn)
-                for table, table_stats in stats.items():
-                    self.stats_tree.insert('', 'end', values=(
-                        table,
-                        table_stats['records'],
-                        f"{table_stats['size']:.1f}",
-                        table_stats['last_modified']
-                    ))
-                conn.close()
-                    
-            except Exception as e:
-                print(f"Error loading database info: {e}")
-                
-        except Exception as e:
-            print(f"Error in load_database_info: {e}")
+            return self.get_mysql_database_stats(conn)
+        finally:
+            conn.close()
+    
+    def show_database_stats(self, stats: Dict):
+        """Show table statistics in the treeview"""
+        sync_treeview(self.stats_tree, [
+            TreeRow(f"table:{table}", values=(
+                table,
+                f"{'~' if table_stats['estimated'] else ''}{table_stats['records']:,}",
+                f"{table_stats['size']:.1f}",
+                f"{table_stats['index_size']:.1f}",
+                f"{table_stats['data_free']:.1f}",
+                table_stats['last_modified']
+            ))
+            for table, table_stats in stats.items()
+        ])
     
     def get_mysql_database_stats(self, conn) -> Dict:
-        """Get MySQL database statistics"""
+        """
+        Get MySQL database statistics for all tables in one query
+        
+        Record counts are InnoDB's estimates (information_schema TABLE_ROWS);
+        use count_table_records for exact counts. Sizes are in KB.
+        
+        Args:
+            conn: Open MySQL connection
+            
+        Returns:
+            Dictionary of table name to records, estimated, size, index_size,
+            data_free and last_modified
+        """
         stats = {}
         try:
             cursor = conn.cursor()
             
-            # Get all tables
-            cursor.execute("SHOW TABLES")
-            tables = cursor.fetchall()
+            # MySQL 8 caches these statistics for a day by default; read them fresh
+            try:
+                cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+            except Exception:
+                pass  # Older servers have no cache
             
-            for table in tables:
-                table_name = table[0]
-                
-                # Get record count
-                cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
-                record_count = cursor.fetchone()[0]
-                
-                # Get table size from information_schema
-                cursor.execute("""
-                    SELECT 
-                        ROUND(((data_length + index_length) / 1024), 2) AS 'Size (KB)'
-                    FROM information_schema.TABLES 
-                    WHERE table_schema = DATABASE() 
-                    AND table_name = %s
-                """, (table_name,))
-                
-                size_result = cursor.fetchone()
-                table_size = size_result[0] if size_result and size_result[0] else 0.0
-                
-                # Get last modified (approximate)
-                last_modified = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-                
+            cursor.execute("""
+                SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH, DATA_FREE, UPDATE_TIME
+                FROM information_schema.TABLES 
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'
+                ORDER BY TABLE_NAME
+            """)
+            
+            for table_name, table_rows, data_length, index_length, data_free, update_time in cursor.fetchall():
                 stats[table_name] = {
-                    'records': record_count,
-                    'size': table_size,
-                    'last_modified': last_modified
+                    'records': int(table_rows or 0),
+                    'estimated': True,
+                    'size': (data_length or 0) / 1024,
+                    'index_size': (index_length or 0) / 1024,
+                    'data_free': (data_free or 0) / 1024,
+                    # UPDATE_TIME is NULL until the table is written after a server restart
+                    'last_modified': update_time.strftime("%Y-%m-%d %H:%M") if update_time else "N/A"
                 }
             
             cursor.close()
@@ -482,6 +548,28 @@ class DatabaseManager:
         
         return stats
     
+    def count_table_records(self, tables: List[str]) -> Dict[str, int]:
+        """
+        Count the records of each table exactly (full scans; run in the background)
+        
+        Args:
+            tables: Table names, as returned by get_mysql_database_stats
+            
+        Returns:
+            Dictionary of table name to record count
+        """
+        counts = {}
+        conn = self.db_conn.connect()
+        try:
+            cursor = conn.cursor()
+            for table_name in tables:
+                cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
+                counts[table_name] = cursor.fetchone()[0]
+            cursor.close()
+        finally:
+            conn.close()
+        return counts
+    
     def get_database_stats(self, db_path: str) -> Dict:
         """Get database statistics (legacy SQLite method)"""
         stats = {}
@@ -527,27 +615,104 @@ class DatabaseManager:
             self.backup_location_var.set(directory)
     
     def browse_restore_file(self):
-        """Browse for restore file"""
+        """Browse for a backup's manifest or an older .sql dump"""
         filename = filedialog.askopenfilename(
-            title="Select Backup File",
-            filetypes=[("SQLite files", "*.db"), ("All files", "*.*")]
+            title="Select Backup Manifest or SQL Dump",
+            initialdir=self.backup_location_var.get() or None,
+            filetypes=[("Backup manifest", MANIFEST_FILE), ("MySQL dump", "*.sql"), ("All files", "*.*")]
         )
         if filename:
-            self.restore_file_var.set(filename)
+            self.restore_file_var.set(filename if filename.lower().endswith('.sql')
+                                      else os.path.dirname(filename))
     
     def create_backup(self):
-        """Create database backup (MySQL dump)"""
+        """Create a native, compressed database backup in the background"""
+        backup_location = self.backup_location_var.get()
+        if not backup_location:
+            messagebox.showwarning("Warning", "Please select a backup location.")
+            return
+        
+        def on_done(manifest):
+            messagebox.showinfo(
+                "Success",
+                f"Database backed up to:\n{manifest['path']}\n\n"
+                f"{manifest['type'].capitalize()} backup: {len(manifest['tables'])} tables, "
+                f"{manifest['rows']:,} rows, {manifest['deleted']:,} deletes, "
+                f"{manifest['bytes'] / 1024 / 1024:.1f} MB in {manifest['duration_seconds']:.1f}s\n"
+                f"Throughput: {manifest['rows_per_second'] or 0:,.0f} rows/s, "
+                f"{(manifest['bytes_per_second'] or 0) / 1024 / 1024:.1f} MB/s"
+            )
+        
+        try:
+            engine = BackupEngine.from_config(self.db_conn, backup_location)
+            run_in_background(self.root, engine.create_backup, on_done,
+                              lambda error: messagebox.showerror("Error", f"Failed to create backup: {error}"),
+                              self.incremental_backup_var.get())
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to create backup: {e}")
+    
+    def restore_database(self):
+        """Restore the database from a native backup in the background"""
+        backup_dir = self.restore_file_var.get()
+        if backup_dir.lower().endswith('.sql'):
+            # mysql_backup_*.sql dumps made before native backups
+            self.restore_sql_dump(backup_dir)
+            return
+        if os.path.basename(backup_dir) == MANIFEST_FILE:
+            backup_dir = os.path.dirname(backup_dir)
+        if not backup_dir:
+            messagebox.showwarning("Warning", "Please select a backup to restore.")
+            return
+        
+        if not os.path.exists(os.path.join(backup_dir, MANIFEST_FILE)):
+            messagebox.showerror("Error", "The selected directory is not a backup.")
+            return
+        
+        try:
+            chain = BackupRestorer.resolve_chain(backup_dir)
+        except Exception as e:
+            messagebox.showerror("Error", f"Cannot restore this backup: {e}")
+            return
+        
+        # Confirm restore
+        if not messagebox.askyesno("Confirm Restore", 
+                                   f"Restore the database to backup {chain[-1]['id']} "
+                                   f"({chain[-1]['created']}, {len(chain)} backup(s) in chain)?\n"
+                                   "This will overwrite every table in the backup."):
+            return
+        
+        def on_done(summary):
+            messagebox.showinfo(
+                "Success",
+                f"Database restored from {len(summary['backups'])} backup(s).\n\n"
+                f"{summary['tables']} tables, {summary['rows']:,} rows loaded, "
+                f"{summary['deleted']:,} deletes, {summary['files_verified']} files verified "
+                f"in {summary['duration_seconds']:.1f}s"
+            )
+            self.refresh_overview()
+        
+        try:
+            restorer = BackupRestorer.from_config(self.db_conn)
+            run_in_background(self.root, restorer.restore, on_done,
+                              lambda error: messagebox.showerror("Error", f"Failed to restore database: {error}"),
+                              backup_dir)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to restore database: {e}")
+    
+    def restore_sql_dump(self, restore_file: str):
+        """Restore the database from a .sql dump with the mysql client"""
+        if not os.path.exists(restore_file):
+            messagebox.showerror("Error", "Backup file does not exist.")
+            return
+        
+        # Confirm restore
+        if not messagebox.askyesno("Confirm Restore", 
+                                   "Are you sure you want to restore the MySQL database?\n"
+                                   "This will overwrite the current database."):
+            return
+        
         try:
-            backup_location = self.backup_location_var.get()
-            if not backup_location:
-                messagebox.showwarning("Warning", "Please select a backup location.")
-                return
-            
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Create MySQL dump
             import subprocess
-            import json
             
             # Get database configuration
             with open(self.config_file, 'r') as f:
@@ -560,83 +725,29 @@ class DatabaseManager:
             host = db_config.get('host', 'localhost')
             port = db_config.get('port', 3306)
             
-            # Create mysqldump command
-            dump_file = os.path.join(backup_location, f"mysql_backup_{timestamp}.sql")
-            
+            # Create mysql command
             cmd = [
-                'mysqldump',
+                'mysql',
                 f'--host={host}',
                 f'--port={port}',
                 f'--user={username}',
                 f'--password={password}',
-                '--single-transaction',
-                '--routines',
-                '--triggers',
                 db_name
             ]
             
-            with open(dump_file, 'w') as f:
-                result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, text=True)
-            
-            if result.returncode == 0:
-                messagebox.showinfo("Success", f"MySQL database backed up to:\n{dump_file}")
-            else:
-                messagebox.showerror("Error", f"Failed to create MySQL backup:\n{result.stderr}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create backup: {e}")
-    
-    def restore_database(self):
-        """Restore database from MySQL dump"""
-        try:
-            restore_file = self.restore_file_var.get()
-            if not restore_file:
-                messagebox.showwarning("Warning", "Please select a backup file to restore.")
-                return
-            
-            if not os.path.exists(restore_file):
-                messagebox.showerror("Error", "Backup file does not exist.")
-                return
-            
-            # Confirm restore
-            if messagebox.askyesno("Confirm Restore", 
-                                 "Are you sure you want to restore the MySQL database?\n"
-                                 "This will overwrite the current database."):
-                
-                import subprocess
-                import json
-                
-                # Get database configuration
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                
-                db_config = config.get('database', {})
-                db_name = db_config.get('database_name', 'degrow_workflow')
-                username = db_config.get('username', 'root')
-                password = db_config.get('password', '')
-                host = db_config.get('host', 'localhost')
-                port = db_config.get('port', 3306)
-                
-                # Create mysql command
-                cmd = [
-                    'mysql',
-                    f'--host={host}',
-                    f'--port={port}',
-                    f'--user={username}',
-                    f'--password={password}',
-                    db_name
-                ]
-                
+            def run_mysql():
                 with open(restore_file, 'r') as f:
-                    result = subprocess.run(cmd, stdin=f, stderr=subprocess.PIPE, text=True)
-                
+                    return subprocess.run(cmd, stdin=f, stderr=subprocess.PIPE, text=True)
+            
+            def on_done(result):
                 if result.returncode == 0:
                     messagebox.showinfo("Success", "MySQL database restored successfully.")
-                    self.refresh_database_info()
-                    self.load_database_info()
+                    self.refresh_overview()
                 else:
                     messagebox.showerror("Error", f"Failed to restore MySQL database:\n{result.stderr}")
             
+            run_in_background(self.root, run_mysql, on_done,
+                              lambda error: messagebox.showerror("Error", f"Failed to restore database: {error}"))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to restore database: {e}")
     
@@ -806,6 +917,18 @@ class DatabaseManager:
         if filename:
             self.milestone_path_var.set(filename)
     
+    def get_schedule_status(self) -> str:
+        """Describe the last and next scheduled backup"""
+        try:
+            scheduler = BackupScheduler.from_config(self.db_conn)
+            last = scheduler.last_success()
+            last_text = (f"{last['started']} ({last['type']}, {last['bytes'] / 1024 / 1024:.1f} MB, "
+                         f"{last['duration_seconds']:.0f}s)") if last else "never"
+            next_text = f"{scheduler.next_run():%Y-%m-%d %H:%M}" if scheduler.enabled else "disabled"
+            return f"Last scheduled backup: {last_text}    Next: {next_text}"
+        except Exception as e:
+            return f"Backup schedule unavailable: {e}"
+    
     def save_settings(self):
         """Save database settings"""
         try:
@@ -813,8 +936,25 @@ class DatabaseManager:
             self.main_db_path = self.main_path_var.get()
             self.milestone_db_path = self.milestone_path_var.get()
             
-            # Save other settings (implement as needed)
-            messagebox.showinfo("Success", "Settings saved successfully.")
+            # Auto-backup settings, read by the backup scheduler. Only these
+            # keys change: the file is re-read rather than rewritten from the
+            # loaded configuration, which includes defaults never saved to it
+            backup_settings = {
+                'enabled': self.auto_backup_var.get(),
+                'frequency': self.backup_freq_var.get(),
+            }
+            config = {}
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r') as f:
+                    config = json.load(f)
+            config.setdefault('backup', {}).update(backup_settings)
+            with open(self.config_file, 'w') as f:
+                json.dump(config, f, indent=2)
+            self.db_conn.config.config.setdefault('backup', {}).update(backup_settings)
+            self.schedule_status_label.config(text=self.get_schedule_status())
+            
+            messagebox.showinfo("Success", "Settings saved successfully.\n"
+                                "A running backup scheduler picks up the new schedule when restarted.")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {e}")
@@ -12,8 +12,10 @@ Version: 1.0.0
 import json
 import os
 import sqlite3
+import threading
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector import pooling
 from typing import Optional, Dict, Any, Union
 import logging
 
@@ -62,12 +64,40 @@ class DatabaseConfig:
                 "password": "",
                 "database_name": "degrow_workflow",
                 "charset": "utf8mb4",
-                "autocommit": True
+                "autocommit": True,
+                "pool_size": 5
+            },
+            "activity_log": {
+                "flush_interval_seconds": 2,
+                "batch_size": 100,
+                "sample_rates": {}
+            },
+            "sessions": {
+                "secret": "",
+                "token_ttl_hours": 12,
+                "idle_timeout_minutes": 30,
+                "activity_flush_seconds": 60,
+                "sweep_interval_seconds": 300
+            },
+            "audit_retention": {
+                "max_age_days": 365,
+                "archive": "table",
+                "archive_dir": "./audit_archive",
+                "chunk_size": 5000
             },
             "backup": {
                 "enabled": False,
                 "frequency": "daily",
-                "location": "./backups"
+                "location": "./backups",
+                "workers": 4,
+                "compression": "gzip",
+                "chunk_rows": 100000,
+                "full_every": 7,
+                "keep_chains": 4,
+                "max_age_days": 0,
+                "throttle_mb_per_second": 20,
+                "nice": 10,
+                "run_in_app": False
             },
             "logging": {
                 "level": "INFO",
@@ -91,17 +121,27 @@ class DatabaseConfig:
 class DatabaseConnection:
     """Database connection manager"""
     
-    def __init__(self, config: DatabaseConfig):
+    def __init__(self, config: DatabaseConfig, pool_size: int = 0):
         """
         Initialize database connection manager
         
         Args:
             config: Database configuration instance
+            pool_size: Number of pooled MySQL connections (0 disables pooling)
         """
         self.config = config
         self.db_config = config.get_database_config()
         self.db_type = self.db_config.get('type', 'sqlite')
         self.connection = None
+        self.pool_size = pool_size
+        self._pool = None
+        # connect() is called from worker threads; only one may create the pool
+        self._pool_lock = threading.Lock()
+    
+    @property
+    def is_mysql(self) -> bool:
+        """Whether this connection manager targets MySQL"""
+        return self.db_type.lower() == 'mysql'
         
     def connect(self) -> Union[sqlite3.Connection, mysql.connector.MySQLConnection]:
         """
@@ -112,6 +152,8 @@ class DatabaseConnection:
         """
         try:
             if self.db_type.lower() == 'mysql':
+                if self.pool_size:
+                    return self._connect_pooled_mysql()
                 return self._connect_mysql()
             else:
                 return self._connect_sqlite()
@@ -142,6 +184,36 @@ class DatabaseConnection:
             logger.error(f"MySQL connection error: {e}")
             raise
     
+    def _connect_pooled_mysql(self) -> mysql.connector.MySQLConnection:
+        """Get a MySQL connection from the pool.
+        
+        close() on the returned connection hands it back to the pool. When
+        every pooled connection is in use a regular connection is opened
+        instead of failing.
+        """
+        try:
+            if self._pool is None:
+                with self._pool_lock:
+                    if self._pool is None:
+                        self._pool = pooling.MySQLConnectionPool(
+                            pool_name=f"workflow_pool_{id(self)}",
+                            pool_size=self.pool_size,
+                            pool_reset_session=True,
+                            host=self.db_config.get('host', 'localhost'),
+                            port=self.db_config.get('port', 3306),
+                            user=self.db_config.get('username', 'root'),
+                            password=self.db_config.get('password', ''),
+                            database=self.db_config.get('database_name', 'degrow_workflow'),
+                            charset=self.db_config.get('charset', 'utf8mb4'),
+                            autocommit=self.db_config.get('autocommit', True)
+                        )
+                        logger.info(f"Created MySQL connection pool ({self.pool_size} connections)")
+            return self._pool.get_connection()
+            
+        except mysql.connector.errors.PoolError as e:
+            logger.warning(f"Connection pool exhausted, opening a direct connection: {e}")
+            return self._connect_mysql()
+    
     def _connect_sqlite(self) -> sqlite3.Connection:
         """Connect to SQLite database (fallback)"""
         try:
@@ -235,6 +307,40 @@ def get_database_connection(config_file: str = "config.json") -> DatabaseConnect
     return DatabaseConnection(config)
 
 
+def get_pooled_database_connection(config_file: str = "config.json") -> DatabaseConnection:
+    """
+    Get a database connection instance backed by a connection pool
+    
+    The pool size is read from database.pool_size in the configuration
+    (default 5). Pooling only applies to MySQL; SQLite connections are
+    cheap to open and are not pooled.
+    
+    Args:
+        config_file: Path to configuration file
+        
+    Returns:
+        DatabaseConnection instance
+    """
+    config = DatabaseConfig(config_file)
+    pool_size = int(config.get_database_config().get('pool_size', 5))
+    return DatabaseConnection(config, pool_size=pool_size)
+
+
+def begin_transaction(connection):
+    """
+    Start an explicit transaction on a connection
+    
+    MySQL connections are opened with autocommit enabled, so statements that
+    must commit or roll back together need an explicit transaction. SQLite
+    starts one implicitly on the first write.
+    
+    Args:
+        connection: Open MySQL or SQLite connection
+    """
+    if hasattr(connection, 'start_transaction'):
+        connection.start_transaction()
+
+
 def create_mysql_database(config_file: str = "config.json") -> bool:
     """
     Create MySQL database if it doesn't exist
@@ -17,26 +17,33 @@ import subprocess
 from datetime import datetime
 from typing import Optional, Callable
 from user_manager import UserManager, create_default_admin_user
-from db_config import get_database_connection
-from svg_banner_renderer import create_banner_from_svg
-from background_renderer import BackgroundRenderer
+from startup_profiler import startup_profiler
+from background_tasks import run_in_background
+
+# Pause showing "Login successful!" before the main window opens
+LOGIN_SUCCESS_DELAY_MS = 300
 
 
 class LoginWindow:
     """Login window for user authentication"""
     
-    def __init__(self, parent=None, on_success: Callable = None):
+    def __init__(self, parent=None, on_success: Callable = None,
+                 user_manager: Optional[UserManager] = None):
         """
         Initialize login window
         
         Args:
             parent: Parent window
             on_success: Callback function when login is successful
+            user_manager: Shared UserManager; a new one is created if None
         """
         self.parent = parent
         self.on_success = on_success
-        self.user_manager = UserManager()
+        # A shared UserManager has already had its tables and default admin set up
+        self.owns_user_manager = user_manager is None
+        self.user_manager = user_manager or UserManager()
         self.background_photo = None  # Store background reference
+        self.authenticating = False
         
         # Create login window - Full screen like the mockup
         self.login_window = tk.Toplevel(parent) if parent else tk.Tk()
@@ -69,6 +76,7 @@ class LoginWindow:
         except Exception as gen_err:
             print(f"Error generating combined background: {gen_err}")
 
+        from background_renderer import BackgroundRenderer
         bg_renderer = BackgroundRenderer(r"C:\Lumen\Workflow Manager\combined.png")
         bg_renderer.apply_background_to_window(self.login_window, target_width, target_height)
         # Center window at capped size
@@ -101,13 +109,16 @@ class LoginWindow:
         self.update_db_status_indicator()
         
         # Create default admin if no users exist
-        create_default_admin_user(self.user_manager)
+        if self.owns_user_manager:
+            create_default_admin_user(self.user_manager)
         
         # Focus on username entry
         self.username_entry.focus()
         
         # Bind Enter key to login
         self.login_window.bind('<Return>', lambda e: self.login())
+        
+        startup_profiler.mark("login window ready")
     
     def create_gradient_background(self, canvas):
         """Create a gradient background on the canvas"""
@@ -200,6 +211,7 @@ class LoginWindow:
             screen_width = self.login_window.winfo_screenwidth()
             screen_height = self.login_window.winfo_screenheight()
             # Use the pre-composited background
+            from background_renderer import BackgroundRenderer
             self._bg_renderer = BackgroundRenderer("combined.png")
             self._bg_label = self._bg_renderer.apply_background_to_window(self.login_window, screen_width, screen_height)
         except Exception as e:
@@ -272,6 +284,9 @@ class LoginWindow:
                                      fg='red',
                                      bg='#1a1a1a')
         self.status_label.place(relx=0.5, rely=0.62, anchor='n')
+
+        # Progress indicator shown while credentials are verified
+        self.login_progress = ttk.Progressbar(self.login_window, mode='indeterminate')
     
     def create_resolution_box(self):
         """Create a small box in the lower-right showing detected resolution."""
@@ -313,16 +328,15 @@ class LoginWindow:
         status_text = "SQL: Not connected"
         status_color = 'red'
         try:
-            db = get_database_connection()
-            conn = db.connect()
+            conn = self.user_manager.db_conn.connect()
             if conn:
                 status_text = "SQL: Connected"
                 status_color = '#00aa00'
-            # Close if possible
-            try:
-                db.close()
-            except Exception:
-                pass
+                # Close (returns pooled connections to the pool)
+                try:
+                    conn.close()
+                except Exception:
+                    pass
         except Exception:
             pass
         self.db_status_label.config(text=status_text, fg=status_color)
@@ -342,6 +356,9 @@ class LoginWindow:
     
     def login(self):
         """Handle login attempt"""
+        if self.authenticating:
+            return
+        
         username = self.username_var.get().strip()
         password = self.password_var.get()
         
@@ -349,33 +366,45 @@ class LoginWindow:
             self.status_label.config(text="Please enter both username and password", fg="red")
             return
         
-        # Clear status
-        self.status_label.config(text="")
-        
-        # Disable login button during authentication
+        # Disable login button and show progress while the password is verified
+        self.authenticating = True
         self.login_button.config(state="disabled", bg='#666666')
-        self.login_window.update()
-        
-        try:
-            # Authenticate user
-            user = self.user_manager.authenticate_user(username, password)
+        self.status_label.config(text="Signing in...", fg="#cccccc")
+        self.login_progress.place(relx=0.5, rely=0.66, anchor='n', width=200)
+        self.login_progress.start(10)
+        
+        # Password hashing (PBKDF2) runs in a worker so the window stays responsive
+        run_in_background(self.login_window,
+                          self.user_manager.authenticate_user,
+                          self.on_authenticated, self.on_authentication_error,
+                          username, password)
+    
+    def _end_authentication(self):
+        """Hide the progress indicator after an authentication attempt"""
+        self.authenticating = False
+        self.login_progress.stop()
+        self.login_progress.place_forget()
+    
+    def on_authenticated(self, user):
+        """Handle the authentication result (runs on the Tk thread)"""
+        self._end_authentication()
+        if user:
+            # Login successful
+            self.status_label.config(text="Login successful!", fg="green")
             
-            if user:
-                # Login successful
-                self.status_label.config(text="Login successful!", fg="green")
-                self.login_window.update()
-                
-                # Wait a moment then close
-                self.login_window.after(1000, self.login_successful)
-            else:
-                # Login failed
-                self.status_label.config(text="Invalid username or password", fg="red")
-                self.login_button.config(state="normal", bg='#0c9ed9')
-                
-        except Exception as e:
-            self.status_label.config(text=f"Login error: {str(e)}", fg="red")
+            # Brief confirmation, then open the main window
+            self.login_window.after(LOGIN_SUCCESS_DELAY_MS, self.login_successful)
+        else:
+            # Login failed
+            self.status_label.config(text="Invalid username or password", fg="red")
             self.login_button.config(state="normal", bg='#0c9ed9')
     
+    def on_authentication_error(self, error: Exception):
+        """Handle an exception raised during authentication"""
+        self._end_authentication()
+        self.status_label.config(text=f"Login error: {str(error)}", fg="red")
+        self.login_button.config(state="normal", bg='#0c9ed9')
+    
     def login_successful(self):
         """Handle successful login"""
         if self.on_success:
@@ -668,14 +697,27 @@ class UserManagementWindow:
                     messagebox.showerror("Error", "Password is required for new users")
                     return
                 
-                if self.user_manager.create_user(username, email, password, role):
-                    messagebox.showinfo("Success", "User created successfully")
-                    dialog.destroy()
-                    self.load_users()
-                else:
-                    messagebox.showerror("Error", "Failed to create user")
+                # Password hashing runs in a worker so the dialog stays responsive
+                save_button.config(state=tk.DISABLED)
+                
+                def on_created(created):
+                    if created:
+                        messagebox.showinfo("Success", "User created successfully")
+                        dialog.destroy()
+                        self.load_users()
+                    else:
+                        save_button.config(state=tk.NORMAL)
+                        messagebox.showerror("Error", "Failed to create user", parent=dialog)
+                
+                def on_error(error):
+                    save_button.config(state=tk.NORMAL)
+                    messagebox.showerror("Error", f"Failed to create user: {error}", parent=dialog)
+                
+                run_in_background(dialog, self.user_manager.create_user, on_created, on_error,
+                                  username, email, password, role)
         
-        ttk.Button(button_frame, text="Save", command=save_user).pack(side=tk.LEFT, padx=(0, 10))
+        save_button = ttk.Button(button_frame, text="Save", command=save_user)
+        save_button.pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
     
     def deactivate_user(self):
@@ -697,27 +739,29 @@ class UserManagementWindow:
                 messagebox.showerror("Error", "Failed to deactivate user")
 
 
-def show_login_window(parent=None, on_success: Callable = None) -> Optional[UserManager]:
+def show_login_window(parent=None, on_success: Callable = None,
+                      user_manager: Optional[UserManager] = None) -> Optional[UserManager]:
     """
     Show login window and return UserManager on success
     
     Args:
         parent: Parent window
         on_success: Callback function when login is successful
+        user_manager: Shared UserManager to authenticate against
         
     Returns:
         UserManager instance if login successful, None otherwise
     """
-    user_manager = None
+    authenticated_manager = None
     
     def on_login_success(manager):
-        nonlocal user_manager
-        user_manager = manager
+        nonlocal authenticated_manager
+        authenticated_manager = manager
     
-    login_window = LoginWindow(parent, on_login_success)
+    login_window = LoginWindow(parent, on_login_success, user_manager)
     login_window.login_window.wait_window()
     
-    return user_manager
+    return authenticated_manager
 
 
 if __name__ == "__main__":
@@ -6,29 +6,68 @@ Degrow Workflow Manager - Main Application
 This is the main entry point for the Degrow Workflow Manager application.
 It handles user authentication and launches the appropriate interface.
 
+Usage:
+    python main.py [--console] [--profile-startup [--profile-cprofile]
+                   [--profile-memory] [--profile-dir DIR]]
+
 Author: Workflow Manager System
 Version: 1.0.0
 """
 
+import argparse
 import sys
 import os
+import time
+
+# Taken before the application modules are imported so that
+# --profile-startup can attribute their import time
+IMPORT_START = time.perf_counter()
+
 import tkinter as tk
 from tkinter import messagebox
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from question_sheet_gui import QuestionSheetGUI
+from question_sheet_gui import QuestionSheetGUI, load_clli_workbook, load_milestone_tree
 from question_sheet_console import QuestionSheetConsole
-from user_manager import UserManager, create_default_admin_user
+from app_context import AppContext
 from login_gui import show_login_window
+from startup_profiler import startup_profiler
+
+IMPORT_END = time.perf_counter()
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Degrow Workflow Manager")
+    parser.add_argument('--console', action='store_true',
+                        help="Run the console interface instead of the GUI")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Record startup phase timings and write a report file")
+    parser.add_argument('--profile-cprofile', action='store_true',
+                        help="With --profile-startup, also run startup under cProfile")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="With --profile-startup, also track allocations with tracemalloc")
+    parser.add_argument('--profile-dir', default='.',
+                        help="Directory for startup profile reports (default: current directory)")
+    return parser.parse_args(argv)
 
 
 def main():
     """Main application entry point"""
     try:
+        args = parse_arguments()
+        
+        if args.profile_startup:
+            startup_profiler.start(args.profile_dir,
+                                   use_cprofile=args.profile_cprofile,
+                                   use_tracemalloc=args.profile_memory,
+                                   t0=IMPORT_START)
+            startup_profiler.record("imports", IMPORT_START, IMPORT_END)
+        
         # Check if running in console mode
-        if len(sys.argv) > 1 and sys.argv[1] == '--console':
+        if args.console:
             run_console_mode()
         else:
             run_gui_mode()
@@ -44,19 +83,32 @@ def main():
 def run_gui_mode():
     """Run the GUI application"""
     try:
-        # Initialize user manager and create default admin if needed
-        user_manager = UserManager()
-        create_default_admin_user(user_manager)
+        # Shared config, connection pool and user manager (runs the user schema once)
+        with startup_profiler.phase("user schema"):
+            context = AppContext()
+        with startup_profiler.phase("default admin check"):
+            context.ensure_default_admin()
         
-        # Show login window
-        user_manager = show_login_window()
+        # Load main-window data in the background while the user logs in
+        context.prefetch('milestones', load_milestone_tree, context.db_conn)
+        context.prefetch('clli_data', load_clli_workbook)
+        
+        # Show login window (includes the time the user spends typing)
+        with startup_profiler.phase("login (interactive)"):
+            user_manager = show_login_window(user_manager=context.user_manager)
         if not user_manager:
             print("Login cancelled. Exiting application.")
+            startup_profiler.finish()
             return
         
         # Launch main GUI application
-        app = QuestionSheetGUI(user_manager=user_manager)
+        with startup_profiler.phase("main window init"):
+            app = QuestionSheetGUI(user_manager=user_manager, app_context=context)
         app.run()
+        context.close()
+        
+        # In case the window was closed before the deferred startup work ran
+        startup_profiler.finish()
         
     except Exception as e:
         messagebox.showerror("Error", f"Failed to start application: {e}")
@@ -67,8 +119,9 @@ def run_console_mode():
     """Run the console application"""
     try:
         # Initialize user manager
-        user_manager = UserManager()
-        create_default_admin_user(user_manager)
+        context = AppContext()
+        context.ensure_default_admin()
+        user_manager = context.user_manager
         
         # For console mode, we'll use a simple authentication
         print("Degrow Workflow Manager - Console Mode")
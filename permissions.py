@@ -0,0 +1,186 @@
+"""
+Permission Resolver
+===================
+
+Compiles a user's role and fine-grained privileges (the user_privileges
+table maintained by UserAdministration) into an immutable PermissionSet
+once, at login. Permission checks are then a frozenset membership test and
+never touch the database.
+
+Roles are part of the same set as ``role:<name>`` entries for the user's
+role and every role below it, so role checks and privilege checks are both
+O(1). Privileges with an ``expires_date`` make the set expire at the
+earliest such date; the next check after that recompiles it. Grants and
+revokes through UserAdministration invalidate the affected user explicitly.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, Optional
+
+# Role ranks across the login (users) and administration (admin_users) roles
+ROLE_RANKS = {
+    'guest': 0,
+    'user': 1,
+    'supervisor': 2,
+    'manager': 3,
+    'admin': 4,
+    'super_admin': 5,
+}
+
+
+def role_permissions(role: str) -> FrozenSet[str]:
+    """The role:<name> entries implied by a role (itself and all lower roles)"""
+    rank = ROLE_RANKS.get(role, 0)
+    return frozenset(f"role:{name}" for name, name_rank in ROLE_RANKS.items() if name_rank <= rank)
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    """Dates come back as datetime from MySQL and as text from SQLite"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+@dataclass(frozen=True)
+class PermissionSet:
+    """Compiled permissions of one user"""
+    username: str
+    role: str
+    permissions: FrozenSet[str]
+    admin_user_id: Optional[int] = None
+    valid_until: Optional[datetime] = None  # Earliest privilege expiry
+
+    def is_expired(self, now: datetime = None) -> bool:
+        """Whether a granted privilege has expired since the set was compiled"""
+        return self.valid_until is not None and (now or datetime.now()) >= self.valid_until
+
+    def can(self, privilege: str) -> bool:
+        """Check a privilege or role:<name> entry"""
+        return privilege in self.permissions
+
+
+class PermissionResolver:
+    """Caches compiled PermissionSets per user"""
+
+    def __init__(self, db_conn=None):
+        """
+        Initialize the resolver
+
+        Args:
+            db_conn: DatabaseConnection used to load privileges
+        """
+        self.db_conn = db_conn
+        self._sets: Dict[str, PermissionSet] = {}
+        self._lock = threading.Lock()
+
+    def load(self, user, cursor=None) -> PermissionSet:
+        """
+        Compile and cache the permissions of a user
+
+        Args:
+            user: Object with username and role (User or AdminUser)
+            cursor: Optional open cursor, so the load can share the caller's
+                connection (e.g. the login transaction)
+
+        Returns:
+            The compiled PermissionSet
+        """
+        permissions = set(role_permissions(user.role))
+        admin_user_id = None
+        valid_until = None
+        now = datetime.now()
+
+        try:
+            rows = self._query_privileges(user.username, cursor)
+        except Exception as e:
+            # No privileges table yet: role permissions only
+            print(f"Could not load privileges for {user.username}: {e}")
+            rows = []
+
+        for admin_id, privilege_name, privilege_value, expires_date in rows:
+            admin_user_id = admin_id
+            if privilege_name is None or not privilege_value:
+                continue
+            expires = _as_datetime(expires_date)
+            if expires is not None:
+                if expires <= now:
+                    continue
+                valid_until = expires if valid_until is None else min(valid_until, expires)
+            permissions.add(privilege_name)
+
+        permission_set = PermissionSet(user.username, user.role, frozenset(permissions),
+                                       admin_user_id, valid_until)
+        with self._lock:
+            self._sets[user.username.lower()] = permission_set
+        return permission_set
+
+    def _query_privileges(self, username: str, cursor=None):
+        """Fetch (admin_user_id, name, value, expires_date) rows for a username"""
+        own_connection = cursor is None
+        conn = None
+        if own_connection:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+        try:
+            is_mysql = 'mysql' in str(type(cursor)).lower()
+            placeholder = '%s' if is_mysql else '?'
+            cursor.execute(f"""
+                SELECT au.id, up.privilege_name, up.privilege_value, up.expires_date
+                FROM admin_users au
+                LEFT JOIN user_privileges up ON up.user_id = au.id
+                WHERE au.username = {placeholder}
+            """, (username,))
+            return cursor.fetchall()
+        finally:
+            if own_connection:
+                cursor.close()
+                conn.close()
+
+    def get(self, user) -> PermissionSet:
+        """The user's compiled permissions, recompiled if missing or expired"""
+        permission_set = self._sets.get(user.username.lower())
+        if permission_set is None or permission_set.is_expired():
+            permission_set = self.load(user)
+        return permission_set
+
+    def can(self, user, privilege: str) -> bool:
+        """
+        Check whether a user holds a privilege
+
+        Args:
+            user: Object with username and role
+            privilege: Privilege name, or role:<name> for a role check
+
+        Returns:
+            True if the privilege is granted
+        """
+        if user is None:
+            return False
+        return self.get(user).can(privilege)
+
+    def invalidate(self, username: str = None):
+        """Drop the cached permissions of one user, or of everyone"""
+        with self._lock:
+            if username is None:
+                self._sets.clear()
+            else:
+                self._sets.pop(username.lower(), None)
+
+    def invalidate_admin_user(self, admin_user_id: Optional[int]):
+        """Drop cached permissions by admin_users ID (None drops everyone)"""
+        with self._lock:
+            if admin_user_id is None:
+                self._sets.clear()
+                return
+            for key in [key for key, permission_set in self._sets.items()
+                        if permission_set.admin_user_id == admin_user_id]:
+                del self._sets[key]
+
+
+# Shared resolver used by UserManager and UserAdministration
+permission_resolver = PermissionResolver()
@@ -0,0 +1,191 @@
+"""
+Microsoft Project XML Importer
+==============================
+
+Streaming reader for Microsoft Project XML exports and bulk loader for the
+workflow_entries table. Tasks are read with ``iterparse`` and finished
+elements are detached from the tree as soon as they have been processed, so
+memory stays flat regardless of file size. Both the Microsoft Project
+namespace (http://schemas.microsoft.com/project) and plain, un-namespaced
+exports are understood.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+# Namespace used by Microsoft Project XML exports
+MSP_NAMESPACE = 'http://schemas.microsoft.com/project'
+
+# Element names treated as tasks (namespace stripped)
+TASK_TAGS = ('Task', 'task')
+
+# Task child elements copied into the task dict
+TASK_FIELDS = {
+    'Name': 'name',
+    'Start': 'start_date',
+    'Finish': 'finish_date',
+    'Duration': 'duration',
+}
+
+# Rows per executemany call when importing
+IMPORT_CHUNK_SIZE = 1000
+
+# Tasks between progress callbacks while parsing
+PROGRESS_INTERVAL = 500
+
+
+def _local_name(tag: str) -> str:
+    """Strip the namespace from an element tag"""
+    return tag.rsplit('}', 1)[-1] if tag.startswith('{') else tag
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    """Return the text of the first direct child with the given local name"""
+    for child in element:
+        if _local_name(child.tag) == name:
+            return child.text or ""
+    return None
+
+
+def task_from_element(task_element) -> Optional[Dict[str, str]]:
+    """Extract task data from a Task element.
+
+    Args:
+        task_element: Task element, with or without the MSP namespace
+
+    Returns:
+        Dict of task fields, or None if the element carries no data
+    """
+    task_data = {}
+
+    for child in task_element:
+        name = _local_name(child.tag)
+        if name in TASK_FIELDS:
+            task_data[TASK_FIELDS[name]] = child.text or ""
+        elif name == 'ExtendedAttribute':
+            # Custom fields exported with a field name
+            field_name = _child_text(child, 'FieldName')
+            field_value = _child_text(child, 'Value')
+            if field_name and field_value:
+                task_data[field_name.lower()] = field_value
+
+    return task_data if task_data else None
+
+
+def iter_project_tasks(file_path: str,
+                       progress_callback: Optional[Callable[[int, int, int], None]] = None
+                       ) -> Iterator[Dict[str, str]]:
+    """Stream tasks from a Microsoft Project XML file.
+
+    Args:
+        file_path: Path to the XML export
+        progress_callback: Called as (tasks_read, bytes_read, total_bytes)
+            every PROGRESS_INTERVAL tasks and once at the end
+
+    Yields:
+        One dict per task, as produced by task_from_element
+    """
+    total_bytes = os.path.getsize(file_path)
+    task_count = 0
+
+    with open(file_path, 'rb') as xml_file:
+        stack = []
+        task_depth = 0
+
+        for event, element in ET.iterparse(xml_file, events=('start', 'end')):
+            if event == 'start':
+                stack.append(element)
+                if _local_name(element.tag) in TASK_TAGS:
+                    task_depth += 1
+                continue
+
+            stack.pop()
+
+            if _local_name(element.tag) in TASK_TAGS:
+                task_depth -= 1
+                task_data = task_from_element(element)
+                if task_data:
+                    task_count += 1
+                    yield task_data
+                    if progress_callback and task_count % PROGRESS_INTERVAL == 0:
+                        progress_callback(task_count, xml_file.tell(), total_bytes)
+
+            # Outside a task nothing refers back to finished elements, so
+            # detach them to keep memory flat
+            if task_depth == 0 and stack:
+                stack[-1].remove(element)
+
+    if progress_callback:
+        progress_callback(task_count, total_bytes, total_bytes)
+
+
+def import_tasks(conn, tasks: Iterable[Dict[str, str]], chunk_size: int = IMPORT_CHUNK_SIZE,
+                 progress_callback: Optional[Callable[[int], None]] = None) -> int:
+    """Insert tasks into workflow_entries in a single transaction.
+
+    Args:
+        conn: Open MySQL or SQLite connection
+        tasks: Task dicts (any iterable, including iter_project_tasks)
+        chunk_size: Rows per executemany call
+        progress_callback: Called with the number of rows written after each chunk
+
+    Returns:
+        Number of tasks imported
+    """
+    is_mysql = hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
+    placeholder = '%s' if is_mysql else '?'
+    insert_query = f"""
+        INSERT INTO workflow_entries
+        (state, clli, host_wire_centre, lata, equipment_type, current_milestone, milestone_subtask,
+         status, milestone_date, created_date, last_update)
+        VALUES ({', '.join([placeholder] * 11)})
+    """
+
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    imported_count = 0
+    chunk = []
+    cursor = conn.cursor()
+
+    try:
+        for task in tasks:
+            chunk.append((
+                task.get('state', 'Imported'),
+                task.get('clli', ''),
+                task.get('host_wire_centre', ''),
+                task.get('lata', ''),
+                task.get('equipment_type', ''),
+                task.get('name', 'Imported Task'),
+                task.get('milestone_subtask', ''),
+                'Imported',
+                task.get('start_date', ''),
+                now,
+                now
+            ))
+
+            if len(chunk) >= chunk_size:
+                cursor.executemany(insert_query, chunk)
+                imported_count += len(chunk)
+                chunk = []
+                if progress_callback:
+                    progress_callback(imported_count)
+
+        if chunk:
+            cursor.executemany(insert_query, chunk)
+            imported_count += len(chunk)
+            if progress_callback:
+                progress_callback(imported_count)
+
+        conn.commit()
+
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return imported_count
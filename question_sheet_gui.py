@@ -11,22 +11,118 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 from datetime import datetime, date, timedelta
 from dataclasses import dataclass, asdict
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, TYPE_CHECKING
 import os
-import pandas as pd
 import re
-import xml.etree.ElementTree as ET
 from tkinter import filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.dates as mdates
 from datetime import datetime, timedelta
 from milestone_editor import open_milestone_editor
 from database_manager import open_database_manager
 from db_config import get_database_connection, create_mysql_database
 from user_manager import UserManager
-from login_gui import show_login_window, UserManagementWindow
+from treeview_sync import TreeRow, sync_treeview
+from project_importer import iter_project_tasks, import_tasks, task_from_element
+from startup_profiler import startup_profiler
+
+# pandas, matplotlib and the image libraries are imported where they are
+# first needed so they do not slow down reaching the login/main window
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Date columns editable inline in the subtasks tree (also date_entries columns)
+DATE_COLUMNS = ('planned_start', 'actual_start', 'planned_end', 'actual_end')
+
+# Stored in subtask_dates for a date cleared on one subtask; NULL means the
+# subtask has no date of its own and shows the CLLI-wide one
+CLEARED_SUBTASK_DATE = ''
+
+# Delay before buffered inline date edits are written to the database
+DATE_FLUSH_DELAY_MS = 1500
+
+# Maximum number of imported tasks listed in the import preview
+IMPORT_PREVIEW_LIMIT = 1000
+
+# CLLI reference workbook
+CLLI_WORKBOOK_PATH = r"C:\Lumen\Workflow Manager\Dummy Switch Data TXO Testing 20251017.xlsx"
+
+
+def load_clli_workbook() -> "pd.DataFrame":
+    """Load the CLLI reference data from the Excel workbook.
+
+    Safe to call from a worker thread (no Tk access), so the workbook can be
+    prefetched while the login window is shown.
+    """
+    import pandas as pd
+    try:
+        if os.path.exists(CLLI_WORKBOOK_PATH):
+            # Read Excel file with headers from row 1 (default)
+            df = pd.read_excel(CLLI_WORKBOOK_PATH)  # Default header=0 means row 1
+            print(f"Loaded {len(df)} rows from Excel file (headers from row 1)")
+            print(f"Excel columns: {list(df.columns)}")
+            print(f"First few rows:")
+            print(df.head())
+            return df
+        else:
+            print(f"Excel file not found: {CLLI_WORKBOOK_PATH}")
+            return pd.DataFrame()
+    except Exception as e:
+        print(f"Error loading Excel file: {e}")
+        import traceback
+        traceback.print_exc()
+        return pd.DataFrame()
+
+
+def load_milestone_tree(db_conn):
+    """Load all milestones and their subtasks with two queries.
+
+    Safe to call from a worker thread (no Tk access).
+
+    Args:
+        db_conn: DatabaseConnection to read from
+
+    Returns:
+        Tuple (milestones, subtasks_by_milestone) using the same dict layout
+        as QuestionSheetGUI._load_milestones_from_db/_load_subtasks_from_db
+    """
+    conn = db_conn.connect()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT id, name, description, order_index, created_date, last_updated
+            FROM milestones
+            ORDER BY order_index, name
+        """)
+        milestones = [{
+            'id': row[0],
+            'name': row[1],
+            'description': row[2],
+            'order_index': row[3],
+            'created_date': row[4],
+            'last_updated': row[5]
+        } for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT milestone_id, id, name, description, criticality, order_index,
+                   created_date, last_updated
+            FROM subtasks
+            ORDER BY milestone_id, order_index, name
+        """)
+        subtasks_by_milestone = {milestone['id']: [] for milestone in milestones}
+        for row in cursor.fetchall():
+            subtasks_by_milestone.setdefault(row[0], []).append({
+                'id': row[1],
+                'name': row[2],
+                'description': row[3],
+                'criticality': row[4],
+                'order_index': row[5],
+                'created_date': row[6],
+                'last_updated': row[7]
+            })
+        return milestones, subtasks_by_milestone
+    finally:
+        cursor.close()
+        conn.close()
+
 
 @dataclass
 class QuestionSheetEntry:
@@ -43,15 +139,18 @@ class QuestionSheetEntry:
     last_update: datetime
 
 class QuestionSheetGUI:
-    def __init__(self, config_file: str = "config.json", user_manager: UserManager = None):
+    def __init__(self, config_file: str = "config.json", user_manager: UserManager = None,
+                 app_context=None):
         # Initialize debug log first
         self.debug_log = []
         self.add_debug_entry("QuestionSheetGUI initialization started")
         
         # Initialize user management
+        self.app_context = app_context
         self.user_manager = user_manager
         if not self.user_manager:
             # Show login window if no user manager provided
+            from login_gui import show_login_window
             self.user_manager = show_login_window()
             if not self.user_manager:
                 print("Login cancelled. Exiting application.")
@@ -59,8 +158,12 @@ class QuestionSheetGUI:
         
         self.add_debug_entry(f"User authenticated: {self.user_manager.get_current_user().username}")
         
-        # Initialize database connection
-        self.db_conn = get_database_connection(config_file)
+        # Initialize database connection (shared pool when started from main.py)
+        with startup_profiler.phase("main window: config"):
+            if app_context is not None:
+                self.db_conn = app_context.db_conn
+            else:
+                self.db_conn = get_database_connection(config_file)
         self.add_debug_entry("Database connection initialized")
         
         # For backward compatibility, keep db_path for legacy code
@@ -92,23 +195,23 @@ class QuestionSheetGUI:
         self.add_debug_entry(f"Initialized {len(self.milestone_dates)} milestone dates")
         
         # Initialize databases
-        self.add_debug_entry("Initializing main database")
-        self._initialize_database()
-        self.add_debug_entry("Main database initialized successfully")
-        
-        self.add_debug_entry("Initializing milestone database")
-        self._initialize_milestone_database()
-        self.add_debug_entry("Milestone database initialized successfully")
-        
-        # Create date entries table
-        self.add_debug_entry("Creating date entries table")
-        self._create_date_entries_table()
-        self.add_debug_entry("Date entries table created successfully")
+        with startup_profiler.phase("main window: schema"):
+            self.add_debug_entry("Initializing main database")
+            self._initialize_database()
+            self.add_debug_entry("Main database initialized successfully")
+            
+            self.add_debug_entry("Initializing milestone database")
+            self._initialize_milestone_database()
+            self.add_debug_entry("Milestone database initialized successfully")
+            
+            # Create date entries table
+            self.add_debug_entry("Creating date entries table")
+            self._create_date_entries_table()
+            self.add_debug_entry("Date entries table created successfully")
         
-        # Load Excel data for CLLI lookup
-        self.add_debug_entry("Loading CLLI data from Excel file")
-        self.clli_data = self._load_clli_data()
-        self.add_debug_entry(f"CLLI data loaded: {len(self.clli_data) if self.clli_data is not None else 0} rows")
+        # Excel data for CLLI lookup is loaded on first use (see clli_data)
+        self._clli_data = None
+        self._prefetched_subtasks = {}
         
         self.clli_suggestions = []
         self.add_debug_entry("CLLI suggestions list initialized")
@@ -124,12 +227,18 @@ class QuestionSheetGUI:
         self.original_value = None
         self.edit_entry = None
         
+        # Write-behind buffer for inline date edits:
+        # (clli, milestone_id, subtask_id, column) -> (new value, value before first edit)
+        self.pending_date_edits = {}
+        self._date_flush_job = None
+        
         # Create main window
         self.add_debug_entry("Creating main window")
         self.root = tk.Tk()
         self.root.title("Degrow Workflow Manager")
         self.root.geometry("1920x1080")
         self.root.resizable(True, True)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.add_debug_entry("Main window created and configured")
         
         # Create menu bar
@@ -152,10 +261,14 @@ class QuestionSheetGUI:
         self.style.map("White.TCombobox", fieldbackground=[('readonly', 'white'), ('active', 'white')])
         
         # Create GUI elements
-        self.create_widgets()
+        with startup_profiler.phase("main window: widget build"):
+            self.create_widgets()
         
         # Center window on screen
         self.center_window()
+        
+        # Startup profile covers the deferred work scheduled after first paint
+        self._after_first_paint(startup_profiler.finish)
     
     def create_menu_bar(self):
         """Create application menu bar"""
@@ -197,6 +310,7 @@ class QuestionSheetGUI:
             return
         
         try:
+            from login_gui import UserManagementWindow
             UserManagementWindow(self.root, self.user_manager)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open user management: {e}")
@@ -553,6 +667,25 @@ Features:
                 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             ''')
             
+            # Per-subtask schedules; the primary key doubles as the
+            # (clli, milestone_id, subtask_id) index used by the bulk loader
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS subtask_dates (
+                    clli VARCHAR(20) NOT NULL,
+                    milestone_id INT NOT NULL,
+                    subtask_id INT NOT NULL,
+                    planned_start VARCHAR(20),
+                    actual_start VARCHAR(20),
+                    planned_end VARCHAR(20),
+                    actual_end VARCHAR(20),
+                    created_date DATETIME NOT NULL,
+                    last_updated DATETIME NOT NULL,
+                    PRIMARY KEY (clli, milestone_id, subtask_id),
+                    INDEX idx_subtask_dates_subtask (milestone_id, subtask_id),
+                    FOREIGN KEY (subtask_id) REFERENCES subtasks (id) ON DELETE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            ''')
+            
             conn.commit()
             cursor.close()
             conn.close()
@@ -597,26 +730,142 @@ Features:
             print(f"Error loading dates for CLLI {clli}: {e}")
             return {}
     
-    def _load_clli_data(self) -> pd.DataFrame:
-        """Load CLLI data from Excel file"""
+    def _load_subtask_dates_for_clli(self, clli) -> Dict[tuple, Dict[str, str]]:
+        """Load all per-subtask dates for a CLLI in one query.
+        
+        Args:
+            clli: CLLI code
+            
+        Returns:
+            Dict mapping (milestone_id, subtask_id) to a dict of date columns;
+            None for dates not set per subtask, CLEARED_SUBTASK_DATE for
+            dates cleared on the subtask
+        """
         try:
-            excel_path = r"C:\Lumen\Workflow Manager\Dummy Switch Data TXO Testing 20251017.xlsx"
-            if os.path.exists(excel_path):
-                # Read Excel file with headers from row 1 (default)
-                df = pd.read_excel(excel_path)  # Default header=0 means row 1
-                print(f"Loaded {len(df)} rows from Excel file (headers from row 1)")
-                print(f"Excel columns: {list(df.columns)}")
-                print(f"First few rows:")
-                print(df.head())
-                return df
-            else:
-                print(f"Excel file not found: {excel_path}")
-                return pd.DataFrame()
+            if not clli:
+                return {}
+            
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            placeholder = self._placeholder_for(conn)
+            
+            cursor.execute(f"""
+                SELECT milestone_id, subtask_id, {', '.join(DATE_COLUMNS)}
+                FROM subtask_dates 
+                WHERE clli = {placeholder}
+            """, (clli,))
+            
+            dates = {}
+            for row in cursor.fetchall():
+                dates[(row[0], row[1])] = dict(zip(DATE_COLUMNS, row[2:]))
+            
+            cursor.close()
+            conn.close()
+            return dates
+            
         except Exception as e:
-            print(f"Error loading Excel file: {e}")
-            import traceback
-            traceback.print_exc()
-            return pd.DataFrame()
+            print(f"Error loading subtask dates for CLLI {clli}: {e}")
+            return {}
+    
+    def save_subtask_dates(self, dates: Dict[tuple, Dict[str, Optional[str]]]) -> bool:
+        """Bulk write per-subtask dates.
+        
+        Args:
+            dates: Dict mapping (clli, milestone_id, subtask_id) to the date
+                columns to set; columns not given are left untouched and
+                empty values clear the date on that subtask only
+            
+        Returns:
+            True if all rows were written
+        """
+        if not dates:
+            return True
+        
+        conn = None
+        try:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            self._write_date_rows(cursor, 'subtask_dates', ('clli', 'milestone_id', 'subtask_id'),
+                                  dates, self._is_mysql_connection(conn), cleared=CLEARED_SUBTASK_DATE)
+            conn.commit()
+            cursor.close()
+            return True
+            
+        except Exception as e:
+            print(f"Error saving subtask dates: {e}")
+            return False
+        finally:
+            if conn:
+                conn.close()
+    
+    def _write_date_rows(self, cursor, table, key_columns, rows, is_mysql, cleared=None):
+        """Upsert date rows into date_entries or subtask_dates.
+        
+        Rows are grouped by the set of date columns being written so each
+        group goes out as a single executemany upsert (ON DUPLICATE KEY UPDATE
+        on MySQL, ON CONFLICT on SQLite).
+        
+        Args:
+            cursor: Cursor of the connection holding the transaction
+            table: Target table
+            key_columns: Primary key columns of the table
+            rows: Dict mapping key tuples to {date column: value}
+            is_mysql: Whether the connection is MySQL
+            cleared: Value stored for an empty date
+        """
+        placeholder = '%s' if is_mysql else '?'
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        batches = {}
+        for key, columns in rows.items():
+            names = tuple(c for c in DATE_COLUMNS if c in columns)
+            batches.setdefault(names, []).append(
+                (*key, *[columns[c] or cleared for c in names], now, now))
+        
+        for names, params in batches.items():
+            insert_columns = ', '.join(tuple(key_columns) + names + ('created_date', 'last_updated'))
+            values_sql = ', '.join([placeholder] * (len(key_columns) + len(names) + 2))
+            if is_mysql:
+                updates = ', '.join(f"{c} = VALUES({c})" for c in names + ('last_updated',))
+                upsert_query = f"""
+                    INSERT INTO {table} ({insert_columns})
+                    VALUES ({values_sql})
+                    ON DUPLICATE KEY UPDATE {updates}
+                """
+            else:
+                updates = ', '.join(f"{c} = excluded.{c}" for c in names + ('last_updated',))
+                upsert_query = f"""
+                    INSERT INTO {table} ({insert_columns})
+                    VALUES ({values_sql})
+                    ON CONFLICT({', '.join(key_columns)}) DO UPDATE SET {updates}
+                """
+            cursor.executemany(upsert_query, params)
+    
+    def _is_mysql_connection(self, conn) -> bool:
+        """Check whether a connection is a MySQL connection"""
+        return hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
+    
+    def _placeholder_for(self, conn) -> str:
+        """Get the parameter placeholder for a connection"""
+        return '%s' if self._is_mysql_connection(conn) else '?'
+    
+    @property
+    def clli_data(self) -> "pd.DataFrame":
+        """CLLI reference data, loaded from the Excel workbook on first use"""
+        if self._clli_data is None:
+            # Use the workbook prefetched while the login window was open
+            if self.app_context is not None:
+                self._clli_data = self.app_context.take_prefetched('clli_data')
+            if self._clli_data is None:
+                self.add_debug_entry("Loading CLLI data from Excel file")
+                with startup_profiler.phase("Excel load"):
+                    self._clli_data = self._load_clli_data()
+            self.add_debug_entry(f"CLLI data loaded: {len(self._clli_data)} rows")
+        return self._clli_data
+    
+    def _load_clli_data(self) -> "pd.DataFrame":
+        """Load CLLI data from Excel file"""
+        return load_clli_workbook()
     
     def _search_clli(self, query: str) -> List[str]:
         """Search for CLLI codes matching the query in Host CLLI column"""
@@ -847,10 +1096,12 @@ Features:
         """Create GUI widgets"""
         self.add_debug_entry("Starting widget creation")
         
-        # Create logo section at the top
-        self.add_debug_entry("Creating logo section")
-        self.create_logo_section()
-        self.add_debug_entry("Logo section created")
+        # Runs ahead of the deferred work below
+        self._after_first_paint(lambda: startup_profiler.mark("main window first paint"))
+        
+        # Logo section at the top is rendered (SVG/PIL) once the window is up
+        self.add_debug_entry("Deferring logo section until first paint")
+        self._after_first_paint(self.create_logo_section)
         
         # Create toggle buttons section
         self.create_toggle_buttons()
@@ -892,8 +1143,9 @@ Features:
         self.gantt_frame.columnconfigure(0, weight=1)
         self.gantt_frame.rowconfigure(0, weight=1)
         
-        # Create Gantt chart
-        self.create_gantt_chart(self.gantt_frame)
+        # Gantt chart (matplotlib) is built the first time the column is shown
+        self.gantt_built = False
+        self._after_first_paint(self._ensure_gantt_chart)
         
         
         
@@ -1077,8 +1329,8 @@ Features:
         # Load recent entries
         self.load_recent_entries()
         
-        # Populate CLLI dropdown
-        self.populate_clli_dropdown()
+        # Populate CLLI dropdown once the window is up (loads the Excel workbook)
+        self._after_first_paint(self.populate_clli_dropdown)
 
         # Create bottom status bar and start updates
         try:
@@ -1087,6 +1339,14 @@ Features:
         except Exception as e:
             print(f"Error initializing status bar: {e}")
     
+    def _after_first_paint(self, callback):
+        """Run a callback once the window has been drawn.
+        
+        The nested after() is only scheduled while Tk processes the idle
+        queue, so the callback runs after the pending redraws.
+        """
+        self.root.after_idle(lambda: self.root.after(0, callback))
+    
     def center_window(self):
         """Center the window on screen"""
         self.root.update_idletasks()
@@ -1369,6 +1629,7 @@ Features:
     
     def autopopulate_from_clli(self, clli_code):
         """Autopopulate Host Wire Centre and LATA from CLLI code"""
+        import pandas as pd
         try:
             self.add_debug_entry(f"Starting autopopulate from CLLI: {clli_code}")
             print(f"Attempting to autopopulate from CLLI: {clli_code}")
@@ -1602,6 +1863,14 @@ Features:
                                    command=self.open_milestone_editor)
             editor_btn.grid(row=0, column=3)
             
+            # Dirty indicator for buffered date edits
+            self.date_edits_label = ttk.Label(button_frame, text="", foreground='darkorange')
+            self.date_edits_label.grid(row=0, column=2, sticky=tk.E, padx=(0, 10))
+            
+            # Flush buffered date edits on explicit save or when the window loses focus
+            self.root.bind('<Control-s>', self.flush_date_edits)
+            self.root.bind('<FocusOut>', self.on_root_focus_out, add='+')
+            
             # Populate subtasks for each milestone
             self.populate_subtasks()
             
@@ -1617,24 +1886,32 @@ Features:
     def populate_subtasks(self):
         """Populate subtasks for each milestone from database"""
         try:
-            # Clear existing items
-            for item in self.subtasks_tree.get_children():
-                self.subtasks_tree.delete(item)
+            # Make sure buffered date edits are visible in the reloaded dates
+            if self.pending_date_edits:
+                self.flush_date_edits()
             
             # Load milestones from database
             milestones = self._load_milestones_from_db()
             
             if not milestones:
                 # If no milestones in database, show empty state
-                empty_node = self.subtasks_tree.insert('', 'end', text="No milestones defined", 
-                                                     values=('', '', '', '', '', '', '', ''))
+                sync_treeview(self.subtasks_tree, [
+                    TreeRow('empty', text="No milestones defined", values=('', '', '', '', '', '', '', ''))
+                ])
                 return
             
+            # Load dates for the current CLLI once: per-subtask schedules,
+            # falling back to the CLLI-wide date_entries row
+            current_clli = self.clli_var.get().strip()
+            clli_dates = self._load_dates_for_clli(current_clli)
+            subtask_dates = self._load_subtask_dates_for_clli(current_clli)
+            
             # Get all milestones and their subtasks from database
+            rows = []
             for milestone in milestones:
                 # Create milestone node
-                milestone_node = self.subtasks_tree.insert('', 'end', text=milestone['name'], 
-                                                          values=('', '', '', '', '', '', '', ''))
+                milestone_row = TreeRow(f"ms:{milestone['id']}", text=milestone['name'],
+                                        values=('', '', '', '', '', '', '', ''), open=True)
                 
                 # Get subtasks for this milestone from database
                 subtasks = self._load_subtasks_from_db(milestone['id'])
@@ -1644,22 +1921,27 @@ Features:
                     status = self.get_subtask_status(milestone['name'], subtask['name'])
                     tag = self.get_status_tag(status)
                     
-                    # Get dates from date_entries table for current CLLI
-                    current_clli = self.clli_var.get().strip()
-                    dates = self._load_dates_for_clli(current_clli)
+                    # Per column: subtask_dates rows only hold the dates edited per
+                    # subtask (NULL elsewhere), including dates cleared on the subtask
+                    dates = {**clli_dates, **{column: value for column, value in
+                                              subtask_dates.get((milestone['id'], subtask['id']), {}).items()
+                                              if value is not None}}
                     
-                    # Insert subtask with dates
-                    self.subtasks_tree.insert(milestone_node, 'end', 
-                                            values=(subtask['name'], status, subtask['criticality'], 
-                                                   dates.get('planned_start', ''), 
-                                                   dates.get('actual_start', ''), 
-                                                   '',  # duration - not stored in date_entries
-                                                   dates.get('planned_end', ''), 
-                                                   dates.get('actual_end', '')),
-                                            tags=(tag,))
+                    # Add subtask with dates
+                    milestone_row.children.append(TreeRow(
+                        f"st:{milestone['id']}:{subtask['id']}",
+                        values=(subtask['name'], status, subtask['criticality'], 
+                               dates.get('planned_start', ''), 
+                               dates.get('actual_start', ''), 
+                               '',  # duration - not stored
+                               dates.get('planned_end', ''), 
+                               dates.get('actual_end', '')),
+                        tags=(tag,)))
                 
-                # Expand the milestone
-                self.subtasks_tree.item(milestone_node, open=True)
+                rows.append(milestone_row)
+            
+            # Only touch the rows that actually changed
+            sync_treeview(self.subtasks_tree, rows)
             
             # Adjust milestone column width after populating
             self.adjust_milestone_column_width()
@@ -1672,6 +1954,13 @@ Features:
     
     def _load_milestones_from_db(self):
         """Load milestones from database"""
+        # The first call uses the milestone tree prefetched during login
+        if self.app_context is not None:
+            prefetched = self.app_context.take_prefetched('milestones')
+            if prefetched is not None:
+                milestones, self._prefetched_subtasks = prefetched
+                return milestones
+        
         try:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
@@ -1703,6 +1992,9 @@ Features:
     
     def _load_subtasks_from_db(self, milestone_id):
         """Load subtasks for a specific milestone from database"""
+        if milestone_id in self._prefetched_subtasks:
+            return self._prefetched_subtasks.pop(milestone_id)
+        
         try:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
@@ -1742,18 +2034,15 @@ Features:
                 self.populate_subtasks()
                 return
             
-            # Clear existing items
-            for item in self.subtasks_tree.get_children():
-                self.subtasks_tree.delete(item)
-            
             # Get milestones in workflow order
             milestones = list(reversed(self.stages))
             
             # Add each milestone with CLLI-specific subtasks
+            rows = []
             for milestone in milestones:
-                # Insert milestone as parent with CLLI context
+                # Milestone as parent with CLLI context
                 milestone_text = f"{milestone} (CLLI: {clli_code})"
-                milestone_id = self.subtasks_tree.insert('', 'end', text=milestone_text, values=('', ''))
+                milestone_row = TreeRow(f"clli:{milestone}", text=milestone_text, values=('', ''), open=True)
                 
                 # Add CLLI-specific subtasks for this milestone
                 for subtask in self.subtasks:
@@ -1763,11 +2052,14 @@ Features:
                     # Get criticality level for this subtask
                     criticality = self.criticality_levels.get(subtask, "Should be Complete")
                     
-                    self.subtasks_tree.insert(milestone_id, 'end', text='', 
-                                           values=(subtask, status, criticality, '', '', '', '', ''), tags=tag)
+                    milestone_row.children.append(TreeRow(
+                        f"clli:{milestone}:{subtask}",
+                        values=(subtask, status, criticality, '', '', '', '', ''), tags=(tag,)))
                 
-                # Expand the milestone
-                self.subtasks_tree.item(milestone_id, open=True)
+                rows.append(milestone_row)
+            
+            # Only touch the rows that actually changed
+            sync_treeview(self.subtasks_tree, rows)
                 
         except Exception as e:
             print(f"Error updating subtasks for CLLI: {e}")
@@ -1881,8 +2173,9 @@ Features:
                     values[self.editing_column] = new_value
                     self.subtasks_tree.item(self.editing_item, values=values)
                     
-                    # Update database
-                    self.update_subtask_date(self.editing_item, self.editing_column_name, new_value)
+                    # Queue database update
+                    self.update_subtask_date(self.editing_item, self.editing_column_name, new_value,
+                                             self.original_value)
                     
                     # Clean up
                     self.edit_entry.destroy()
@@ -1949,8 +2242,8 @@ Features:
                     values[column_index] = new_value
                     self.subtasks_tree.item(item, values=values)
                     
-                    # Update database
-                    self.update_subtask_date(item, column_name, new_value)
+                    # Queue database update
+                    self.update_subtask_date(item, column_name, new_value, self.original_value)
                     
                     # Clean up
                     self.edit_entry.destroy()
@@ -1999,8 +2292,21 @@ Features:
         except ValueError:
             return False
     
-    def update_subtask_date(self, item, column_name, new_value):
-        """Update subtask date in date_entries table using CLLI as primary key"""
+    def update_subtask_date(self, item, column_name, new_value, original_value=None):
+        """Queue a subtask date edit for the current CLLI.
+        
+        Edits are buffered in memory and written in one upsert batch by
+        flush_date_edits, so keyboarding through a column of dates does not
+        hit the database per cell. Milestone subtasks are stored per task in
+        subtask_dates; rows without a subtask id fall back to the CLLI-wide
+        date_entries row.
+        
+        Args:
+            item: Treeview item that was edited
+            column_name: Date column being edited
+            new_value: New date value ('' clears the date)
+            original_value: Value shown before the edit, used for conflict detection
+        """
         try:
             # Get the current CLLI from the form
             current_clli = self.clli_var.get().strip()
@@ -2008,66 +2314,170 @@ Features:
                 messagebox.showerror("Error", "No CLLI selected. Please select a CLLI first.")
                 return
             
-            # Connect to database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            if column_name not in DATE_COLUMNS:
+                print(f"Ignoring edit of non-date column {column_name}")
+                return
             
-            # Check if record exists for this CLLI
-            cursor.execute("SELECT clli FROM date_entries WHERE clli = ?", (current_clli,))
-            existing_record = cursor.fetchone()
+            # Subtask items are keyed st:<milestone_id>:<subtask_id>
+            milestone_id = subtask_id = None
+            parts = str(item).split(':')
+            if len(parts) == 3 and parts[0] == 'st':
+                milestone_id, subtask_id = int(parts[1]), int(parts[2])
             
-            if existing_record:
-                # Update existing record
-                update_query = f"""
-                    UPDATE date_entries 
-                    SET {column_name} = ?, last_updated = ?
-                    WHERE clli = ?
-                """
-                cursor.execute(update_query, (
-                    new_value if new_value else None,
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    current_clli
-                ))
+            key = (current_clli, milestone_id, subtask_id, column_name)
+            if key in self.pending_date_edits:
+                # Keep the value seen before the first buffered edit as the baseline
+                original_value = self.pending_date_edits[key][1]
+            self.pending_date_edits[key] = (new_value or None, original_value)
+            
+            self._update_date_edits_indicator()
+            self._schedule_date_flush()
+            
+        except Exception as e:
+            print(f"Error queueing subtask date: {e}")
+            messagebox.showerror("Error", f"Error updating date: {e}")
+    
+    def _schedule_date_flush(self):
+        """Schedule a write-behind flush of buffered date edits"""
+        if self._date_flush_job is None:
+            self._date_flush_job = self.root.after(DATE_FLUSH_DELAY_MS, self.flush_date_edits)
+    
+    def _update_date_edits_indicator(self, message=None):
+        """Show the number of unsaved date edits next to the subtasks tree"""
+        try:
+            if message is None and self.pending_date_edits:
+                count = len(self.pending_date_edits)
+                message = f"\u25cf {count} unsaved date edit{'s' if count != 1 else ''}"
+            self.date_edits_label.configure(text=message or "")
+        except Exception:
+            pass
+    
+    def on_root_focus_out(self, event):
+        """Flush buffered date edits when the main window loses focus"""
+        if event.widget is self.root and self.pending_date_edits:
+            self.flush_date_edits()
+    
+    def flush_date_edits(self, event=None) -> bool:
+        """Write all buffered date edits in one transaction.
+        
+        Edits are merged per row and upserted in batches via _write_date_rows.
+        A stored value that no longer matches what the user saw before
+        editing is reported as a conflict; the user's edit still wins.
+        
+        Returns:
+            True if nothing was pending or the flush succeeded
+        """
+        if self._date_flush_job is not None:
+            try:
+                self.root.after_cancel(self._date_flush_job)
+            except Exception:
+                pass
+            self._date_flush_job = None
+        
+        if not self.pending_date_edits:
+            return True
+        
+        pending = self.pending_date_edits
+        self.pending_date_edits = {}
+        
+        # Merge edits per row: per-subtask rows and CLLI-wide rows
+        subtask_rows = {}
+        clli_rows = {}
+        for (clli, milestone_id, subtask_id, column_name), (value, _) in pending.items():
+            if subtask_id is not None:
+                subtask_rows.setdefault((clli, milestone_id, subtask_id), {})[column_name] = value
             else:
-                # Insert new record
-                insert_query = """
-                    INSERT INTO date_entries (clli, planned_start, actual_start, planned_end, actual_end, created_date, last_updated)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """
-                # Initialize all date fields as None
-                planned_start = None
-                actual_start = None
-                planned_end = None
-                actual_end = None
-                
-                # Set the specific field being updated
-                if column_name == 'planned_start':
-                    planned_start = new_value if new_value else None
-                elif column_name == 'actual_start':
-                    actual_start = new_value if new_value else None
-                elif column_name == 'planned_end':
-                    planned_end = new_value if new_value else None
-                elif column_name == 'actual_end':
-                    actual_end = new_value if new_value else None
-                
-                cursor.execute(insert_query, (
-                    current_clli,
-                    planned_start,
-                    actual_start,
-                    planned_end,
-                    actual_end,
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                ))
+                clli_rows.setdefault((clli,), {})[column_name] = value
+        
+        conn = None
+        conflicts = []
+        try:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            is_mysql = self._is_mysql_connection(conn)
+            placeholder = '%s' if is_mysql else '?'
+            
+            # Read the stored values for all touched CLLIs, one query per table
+            cllis = sorted({key[0] for key in pending})
+            in_sql = ', '.join([placeholder] * len(cllis))
+            stored = {}
+            if subtask_rows:
+                cursor.execute(f"""
+                    SELECT clli, milestone_id, subtask_id, {', '.join(DATE_COLUMNS)}
+                    FROM subtask_dates
+                    WHERE clli IN ({in_sql})
+                """, cllis)
+                for row in cursor.fetchall():
+                    stored[(row[0], row[1], row[2])] = dict(zip(DATE_COLUMNS, row[3:]))
+            if clli_rows:
+                cursor.execute(f"""
+                    SELECT clli, {', '.join(DATE_COLUMNS)}
+                    FROM date_entries
+                    WHERE clli IN ({in_sql})
+                """, cllis)
+                for row in cursor.fetchall():
+                    stored[(row[0], None, None)] = dict(zip(DATE_COLUMNS, row[1:]))
+            
+            for (clli, milestone_id, subtask_id, column_name), (value, original_value) in pending.items():
+                if original_value is None:
+                    continue
+                current = stored.get((clli, milestone_id, subtask_id))
+                if subtask_id is not None and (current or {}).get(column_name) is None:
+                    # No per-subtask date yet: the user saw the CLLI-wide value
+                    continue
+                current_value = (current or {}).get(column_name) or ''
+                if current_value != (original_value or '') and current_value != (value or ''):
+                    conflicts.append(f"{clli} {column_name}: expected '{original_value}', "
+                                     f"found '{current_value}', saved '{value or ''}'")
+            
+            self._write_date_rows(cursor, 'subtask_dates', ('clli', 'milestone_id', 'subtask_id'),
+                                  subtask_rows, is_mysql, cleared=CLEARED_SUBTASK_DATE)
+            self._write_date_rows(cursor, 'date_entries', ('clli',), clli_rows, is_mysql)
             
             conn.commit()
-            conn.close()
+            cursor.close()
             
-            print(f"Updated {column_name} for CLLI {current_clli} to {new_value}")
+            print(f"Saved {len(pending)} date edit(s) for {len(cllis)} CLLI(s)")
+            self.add_debug_entry(f"Saved {len(pending)} buffered date edit(s)")
             
         except Exception as e:
-            print(f"Error updating subtask date: {e}")
-            messagebox.showerror("Error", f"Error updating date: {e}")
+            # Put the edits back, without clobbering anything edited since
+            for key, edit in pending.items():
+                self.pending_date_edits.setdefault(key, edit)
+            print(f"Error saving subtask dates: {e}")
+            self._update_date_edits_indicator()
+            messagebox.showerror("Error", f"Error saving dates: {e}")
+            return False
+        finally:
+            if conn:
+                conn.close()
+        
+        self._update_date_edits_indicator()
+        
+        if conflicts:
+            self.add_debug_entry(f"Date edit conflicts: {'; '.join(conflicts)}")
+            messagebox.showwarning("Date Conflicts",
+                                   "These dates were changed by someone else since you loaded them "
+                                   "and have been overwritten with your edits:\n\n" +
+                                   "\n".join(conflicts))
+        return True
+    
+    def on_close(self):
+        """Flush buffered edits and close the main window"""
+        while not self.flush_date_edits():
+            count = len(self.pending_date_edits)
+            answer = messagebox.askyesnocancel(
+                "Unsaved Dates",
+                f"{count} date edit{'s' if count != 1 else ''} could not be saved.\n\n"
+                "Yes: try saving again\n"
+                "No: discard the edits and close\n"
+                "Cancel: keep the window open")
+            if answer is None:
+                return
+            if not answer:
+                self.pending_date_edits = {}
+                break
+        self.root.destroy()
     
     def create_tooltip(self):
         """Create tooltip for editable columns"""
@@ -2365,25 +2775,14 @@ Features:
     def _import_xml_project(self, file_path: str):
         """Import XML-based Microsoft Project file"""
         try:
-            # Parse XML file
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            # Find tasks in the XML structure
-            tasks = []
+            def report_progress(task_count, bytes_read, total_bytes):
+                percent = int(bytes_read * 100 / total_bytes) if total_bytes else 100
+                self.status_var.set(f"Reading project file... {task_count} tasks ({percent}%)")
+                self.root.update_idletasks()
             
-            # Look for common Microsoft Project XML structures
-            for task in root.findall('.//Task'):
-                task_data = self._extract_task_data(task)
-                if task_data:
-                    tasks.append(task_data)
-            
-            # If no tasks found, try alternative structure
-            if not tasks:
-                for task in root.findall('.//task'):
-                    task_data = self._extract_task_data(task)
-                    if task_data:
-                        tasks.append(task_data)
+            # Stream tasks from the file (handles the MSP namespace and lowercase tags)
+            tasks = list(iter_project_tasks(file_path, report_progress))
+            self.status_var.set(f"Read {len(tasks)} tasks from project file")
             
             if tasks:
                 self._process_imported_tasks(tasks, "XML Project")
@@ -2409,37 +2808,7 @@ Features:
     def _extract_task_data(self, task_element):
         """Extract task data from XML element"""
         try:
-            task_data = {}
-            
-            # Extract common task fields
-            name_elem = task_element.find('Name')
-            if name_elem is not None:
-                task_data['name'] = name_elem.text or ""
-            
-            start_elem = task_element.find('Start')
-            if start_elem is not None:
-                task_data['start_date'] = start_elem.text or ""
-            
-            finish_elem = task_element.find('Finish')
-            if finish_elem is not None:
-                task_data['finish_date'] = finish_elem.text or ""
-            
-            duration_elem = task_element.find('Duration')
-            if duration_elem is not None:
-                task_data['duration'] = duration_elem.text or ""
-            
-            # Extract custom fields if available
-            for field in task_element.findall('ExtendedAttribute'):
-                name_elem = field.find('FieldName')
-                value_elem = field.find('Value')
-                if name_elem is not None and value_elem is not None:
-                    field_name = name_elem.text
-                    field_value = value_elem.text
-                    if field_name and field_value:
-                        task_data[field_name.lower()] = field_value
-            
-            return task_data if task_data else None
-            
+            return task_from_element(task_element)
         except Exception as e:
             print(f"Error extracting task data: {e}")
             return None
@@ -2480,8 +2849,8 @@ Features:
             tree.pack(side="left", fill="both", expand=True)
             scrollbar.pack(side="right", fill="y")
             
-            # Insert tasks
-            for i, task in enumerate(tasks):
+            # Insert tasks (preview only; all tasks are imported)
+            for task in tasks[:IMPORT_PREVIEW_LIMIT]:
                 tree.insert('', 'end', values=(
                     task.get('name', ''),
                     task.get('start_date', ''),
@@ -2505,7 +2874,10 @@ Features:
             close_btn.pack(side="left")
             
             # Show task count
-            count_label = ttk.Label(self.main_frame, text=f"Total Tasks: {len(tasks)}")
+            count_text = f"Total Tasks: {len(tasks)}"
+            if len(tasks) > IMPORT_PREVIEW_LIMIT:
+                count_text += f" (showing first {IMPORT_PREVIEW_LIMIT})"
+            count_label = ttk.Label(self.main_frame, text=count_text)
             count_label.pack(pady=(5, 0))
             
         except Exception as e:
@@ -2513,46 +2885,40 @@ Features:
     
     def _import_tasks_to_database(self, tasks: List[Dict], parent_window):
         """Import tasks to database as workflow entries"""
+        conn = None
         try:
-            conn = sqlite3.connect(self.db_path.replace('.accdb', '.db'))
-            cursor = conn.cursor()
-            
-            imported_count = 0
+            def report_progress(imported_count):
+                self.status_var.set(f"Importing tasks... {imported_count}/{len(tasks)}")
+                self.root.update_idletasks()
             
-            for task in tasks:
-                # Create workflow entry from task data
-                cursor.execute("""
-                    INSERT INTO workflow_entries 
-                    (state, clli, city, lata, equipment_type, current_milestone, milestone_subtask, 
-                     status, milestone_date, created_date, last_update)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    task.get('state', 'Imported'),
-                    task.get('clli', ''),
-                    task.get('host_wire_centre', ''),
-                    task.get('lata', ''),
-                    task.get('equipment_type', ''),
-                    task.get('name', 'Imported Task'),
-                    task.get('milestone_subtask', ''),
-                    'Imported',
-                    task.get('start_date', ''),
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                ))
-                imported_count += 1
-            
-            conn.commit()
-            conn.close()
+            # Chunked executemany in a single transaction
+            conn = self.db_conn.connect()
+            imported_count = import_tasks(conn, tasks, progress_callback=report_progress)
+            self.status_var.set(f"Imported {imported_count} tasks")
             
             messagebox.showinfo("Success", f"Successfully imported {imported_count} tasks to database!")
             parent_window.destroy()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to import tasks to database: {e}")
+        finally:
+            if conn:
+                conn.close()
+    
+    def _ensure_gantt_chart(self):
+        """Build the Gantt chart the first time its column is visible"""
+        if self.gantt_built or not self.gantt_visible:
+            return
+        self.gantt_built = True
+        self.add_debug_entry("Creating Gantt chart")
+        self.create_gantt_chart(self.gantt_frame)
     
     def create_gantt_chart(self, parent_frame):
         """Create Gantt chart visualization"""
         try:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from matplotlib.figure import Figure
+            
             # Create matplotlib figure
             self.gantt_fig = Figure(figsize=(8, 6), dpi=100)
             self.gantt_ax = self.gantt_fig.add_subplot(111)
@@ -2913,6 +3279,7 @@ Features:
             if hasattr(self, 'gantt_frame'):
                 if self.gantt_visible:
                     self.gantt_frame.grid()
+                    self._ensure_gantt_chart()
                 else:
                     self.gantt_frame.grid_remove()
             
@@ -3312,6 +3679,9 @@ Features:
         self.add_debug_entry("Entry data validated successfully")
         
         try:
+            # Write any buffered date edits first
+            self.flush_date_edits()
+            
             # Use the new workflow_entries table
             self.add_debug_entry("Connecting to database")
             conn = sqlite3.connect(self.db_path.replace('.accdb', '.db'))
@@ -3456,6 +3826,12 @@ Features:
     def run(self):
         """Start the GUI application"""
         self.root.mainloop()
+        
+        # Exit button quits the loop without destroying the window
+        try:
+            self.flush_date_edits()
+        except Exception as e:
+            print(f"Error saving pending date edits on exit: {e}")
 
 def main():
     """Main function"""
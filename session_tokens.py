@@ -0,0 +1,314 @@
+"""
+Session Tokens
+==============
+
+HMAC-signed session tokens and coalesced session activity tracking for
+UserManager.
+
+A token carries the session ID, the user ID and an expiry time, signed with
+HMAC-SHA256, so it is validated in-process without a database lookup. The
+user_sessions row remains the record of the session.
+
+Session activity is tracked in memory: ``touch()`` only records the time,
+and a background thread writes the latest ``last_activity`` of every touched
+session in one batched UPDATE every ``flush_interval`` seconds. The same
+thread periodically expires idle sessions with one bulk UPDATE, and sessions
+idle or ended in this process stop validating immediately.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import atexit
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set
+
+# Defaults, overridable through the "sessions" configuration section
+DEFAULT_TOKEN_TTL_HOURS = 12
+DEFAULT_IDLE_TIMEOUT_MINUTES = 30
+DEFAULT_ACTIVITY_FLUSH_SECONDS = 60
+DEFAULT_SWEEP_INTERVAL_SECONDS = 300
+
+# Sessions per batched UPDATE statement
+FLUSH_CHUNK_SIZE = 500
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+@dataclass(frozen=True)
+class SessionClaims:
+    """Contents of a verified session token"""
+    session_id: str
+    user_id: int
+    expires_at: int  # Unix time
+
+    @property
+    def is_expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class SessionTokenSigner:
+    """Issues and verifies signed session tokens"""
+
+    def __init__(self, secret: Optional[str] = None,
+                 ttl_hours: float = DEFAULT_TOKEN_TTL_HOURS):
+        """
+        Initialize the signer
+
+        Args:
+            secret: Signing key shared by every process that validates the
+                tokens; a random per-process key is used if empty
+            ttl_hours: Token lifetime
+        """
+        self._key = secret.encode('utf-8') if secret else secrets.token_bytes(32)
+        self.ttl_seconds = int(ttl_hours * 3600)
+
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._key, payload.encode('utf-8'), hashlib.sha256).digest())
+
+    def issue(self, session_id: str, user_id: int) -> str:
+        """Create a token for a session"""
+        payload = _b64encode(f"{session_id}:{user_id}:{int(time.time()) + self.ttl_seconds}".encode('utf-8'))
+        return f"{payload}.{self._sign(payload)}"
+
+    def verify(self, token: Optional[str]) -> Optional[SessionClaims]:
+        """
+        Check a token's signature and expiry
+
+        Args:
+            token: Token from issue()
+
+        Returns:
+            The token's claims, or None if it is malformed, forged or expired
+        """
+        if not token or '.' not in token:
+            return None
+        payload, signature = token.rsplit('.', 1)
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+        try:
+            session_id, user_id, expires_at = _b64decode(payload).decode('utf-8').split(':')
+            claims = SessionClaims(session_id, int(user_id), int(expires_at))
+        except (ValueError, UnicodeDecodeError):
+            return None
+        return None if claims.is_expired else claims
+
+
+class SessionActivityTracker:
+    """Coalesces last_activity updates and expires idle sessions"""
+
+    def __init__(self, db_conn, flush_interval: float = DEFAULT_ACTIVITY_FLUSH_SECONDS,
+                 idle_timeout_minutes: float = DEFAULT_IDLE_TIMEOUT_MINUTES,
+                 sweep_interval: float = DEFAULT_SWEEP_INTERVAL_SECONDS):
+        """
+        Initialize the tracker
+
+        Args:
+            db_conn: DatabaseConnection used for the updates
+            flush_interval: Seconds between batched last_activity writes
+            idle_timeout_minutes: Inactivity after which a session expires
+            sweep_interval: Seconds between idle-session sweeps
+        """
+        self.db_conn = db_conn
+        self.flush_interval = flush_interval
+        self.idle_timeout = timedelta(minutes=idle_timeout_minutes)
+        self.sweep_interval = sweep_interval
+
+        self._last_activity: Dict[str, datetime] = {}  # Sessions tracked here
+        self._dirty: Set[str] = set()  # Touched since the last flush
+        self._ended: Set[str] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def register(self, session_id: str):
+        """Start tracking a new session"""
+        with self._lock:
+            self._last_activity[session_id] = datetime.now()
+            self._ended.discard(session_id)
+        self._ensure_started()
+
+    def touch(self, session_id: Optional[str]):
+        """Record activity on a session (written on the next flush)"""
+        if not session_id:
+            return
+        with self._lock:
+            if session_id in self._ended:
+                return
+            self._last_activity[session_id] = datetime.now()
+            self._dirty.add(session_id)
+        self._ensure_started()
+
+    def end(self, session_id: Optional[str]):
+        """Stop tracking a session; it no longer validates in this process"""
+        if not session_id:
+            return
+        with self._lock:
+            self._last_activity.pop(session_id, None)
+            self._dirty.discard(session_id)
+            self._ended.add(session_id)
+
+    def is_active(self, session_id: str) -> bool:
+        """Whether a session has not been ended or gone idle in this process"""
+        with self._lock:
+            if session_id in self._ended:
+                return False
+            last_activity = self._last_activity.get(session_id)
+        return last_activity is None or datetime.now() - last_activity < self.idle_timeout
+
+    def flush(self) -> int:
+        """
+        Write the latest last_activity of every touched session
+
+        Returns:
+            Number of sessions written
+        """
+        with self._lock:
+            pending = {session_id: self._last_activity[session_id]
+                       for session_id in self._dirty if session_id in self._last_activity}
+            self._dirty.clear()
+        if not pending:
+            return 0
+
+        conn = cursor = None
+        try:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            is_mysql = hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
+            placeholder = '%s' if is_mysql else '?'
+
+            items = list(pending.items())
+            for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+                chunk = items[start:start + FLUSH_CHUNK_SIZE]
+                params = []
+                for session_id, last_activity in chunk:
+                    # SQLite stores the timestamps as strings
+                    params.extend((session_id, last_activity if is_mysql
+                                   else last_activity.strftime('%Y-%m-%d %H:%M:%S')))
+                params.extend(session_id for session_id, _ in chunk)
+                cursor.execute(f"""
+                    UPDATE user_sessions
+                    SET last_activity = CASE session_id
+                        {' '.join([f'WHEN {placeholder} THEN {placeholder}'] * len(chunk))}
+                    END
+                    WHERE session_id IN ({', '.join([placeholder] * len(chunk))}) AND is_active = TRUE
+                """, params)
+
+            conn.commit()
+            return len(pending)
+
+        except Exception as e:
+            print(f"Error flushing session activity: {e}")
+            self._rollback(conn)
+            # Keep the touches for the next flush
+            with self._lock:
+                self._dirty.update(pending)
+            return 0
+        finally:
+            self._close(conn, cursor)
+
+    def sweep(self) -> int:
+        """
+        Expire every session idle longer than the idle timeout
+
+        Returns:
+            Number of sessions expired in the database
+        """
+        # Pending touches first, so active sessions are not swept
+        self.flush()
+        cutoff = datetime.now() - self.idle_timeout
+
+        with self._lock:
+            for session_id in [session_id for session_id, last_activity in self._last_activity.items()
+                               if last_activity < cutoff]:
+                del self._last_activity[session_id]
+                self._ended.add(session_id)
+
+        conn = cursor = None
+        try:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            is_mysql = hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
+            placeholder = '%s' if is_mysql else '?'
+
+            cursor.execute(f"""
+                UPDATE user_sessions
+                SET is_active = FALSE
+                WHERE is_active = TRUE AND last_activity < {placeholder}
+            """, (cutoff if is_mysql else cutoff.strftime('%Y-%m-%d %H:%M:%S'),))
+            expired = cursor.rowcount
+
+            conn.commit()
+            return expired
+
+        except Exception as e:
+            print(f"Error expiring idle sessions: {e}")
+            self._rollback(conn)
+            return 0
+        finally:
+            self._close(conn, cursor)
+
+    @staticmethod
+    def _rollback(conn):
+        """Roll back a failed write, if the connection was opened"""
+        if conn is not None:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _close(conn, cursor):
+        """Return the connection (flush and sweep run on a timer, so never leak it)"""
+        if cursor is not None:
+            cursor.close()
+        if conn is not None:
+            conn.close()
+
+    def close(self, timeout: float = 5.0):
+        """Write the pending activity and stop the background thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        else:
+            self.flush()
+
+    def _ensure_started(self):
+        """Start the background thread on first use"""
+        if self._thread is not None or self._closed:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="session-activity",
+                                                daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        """Background thread: flush activity and sweep idle sessions"""
+        next_sweep = time.monotonic() + self.sweep_interval
+        while not self._wake.wait(min(self.flush_interval, self.sweep_interval)):
+            if time.monotonic() >= next_sweep:
+                self.sweep()
+                next_sweep = time.monotonic() + self.sweep_interval
+            else:
+                self.flush()
+        self.flush()
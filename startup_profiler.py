@@ -0,0 +1,147 @@
+"""
+Startup Profiler
+================
+
+Lightweight instrumentation for application startup. Modules record named
+phases (imports, config, schema, Excel load, widget build, ...) and marks
+(login window ready, first paint) against a shared profiler; when profiling
+is enabled via ``main.py --profile-startup`` the timings, and optionally a
+cProfile summary and tracemalloc allocation snapshot, are written to a
+report file. When profiling is disabled every call is a cheap no-op.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import io
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+
+class StartupProfiler:
+    """Collects startup phase timings and writes a report"""
+
+    def __init__(self):
+        self.enabled = False
+        self.t0 = time.perf_counter()
+        self.phases: List[Tuple[str, float, float]] = []  # (name, start offset, duration)
+        self.marks: List[Tuple[str, float]] = []          # (name, offset)
+        self.report_dir = "."
+        self.use_tracemalloc = False
+        self._cprofile = None
+        self._finished = False
+
+    def start(self, report_dir: str = ".", use_cprofile: bool = False,
+              use_tracemalloc: bool = False, t0: Optional[float] = None):
+        """Enable profiling.
+
+        Args:
+            report_dir: Directory the report is written to
+            use_cprofile: Run the startup under cProfile
+            use_tracemalloc: Track memory allocations with tracemalloc
+            t0: perf_counter() value to measure from (defaults to now)
+        """
+        self.enabled = True
+        self.report_dir = report_dir
+        if t0 is not None:
+            self.t0 = t0
+
+        if use_tracemalloc:
+            import tracemalloc
+            tracemalloc.start()
+            self.use_tracemalloc = True
+
+        if use_cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of code as a named phase"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def record(self, name: str, start: float, end: float):
+        """Record a phase measured by the caller (perf_counter() values)"""
+        if self.enabled:
+            self.phases.append((name, start - self.t0, end - start))
+
+    def mark(self, name: str):
+        """Record a point in time, e.g. 'first paint'"""
+        if self.enabled:
+            self.marks.append((name, time.perf_counter() - self.t0))
+
+    def finish(self) -> Optional[str]:
+        """Stop profiling and write the report.
+
+        Safe to call more than once; only the first call writes a report.
+
+        Returns:
+            Path of the report file, or None if profiling is not enabled
+        """
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+
+        if self._cprofile:
+            self._cprofile.disable()
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        os.makedirs(self.report_dir, exist_ok=True)
+        report_path = os.path.join(self.report_dir, f"startup_profile_{timestamp}.txt")
+
+        lines = [
+            "Startup Profile",
+            "=" * 60,
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "",
+            f"{'Phase':<36}{'Start (ms)':>12}{'Duration (ms)':>14}",
+            "-" * 62,
+        ]
+        for name, offset, duration in self.phases:
+            lines.append(f"{name:<36}{offset * 1000:>12.1f}{duration * 1000:>14.1f}")
+
+        if self.marks:
+            lines += ["", f"{'Mark':<36}{'At (ms)':>12}", "-" * 48]
+            for name, offset in self.marks:
+                lines.append(f"{name:<36}{offset * 1000:>12.1f}")
+
+        if self.use_tracemalloc:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            lines += ["", "Memory (tracemalloc)", "-" * 60,
+                      f"Current: {current / 1024 / 1024:.1f} MB   Peak: {peak / 1024 / 1024:.1f} MB",
+                      "", "Top allocations by file:"]
+            for stat in snapshot.statistics('filename')[:15]:
+                lines.append(f"  {stat}")
+
+        if self._cprofile:
+            import pstats
+            stats_path = os.path.join(self.report_dir, f"startup_profile_{timestamp}.prof")
+            self._cprofile.dump_stats(stats_path)
+            stream = io.StringIO()
+            pstats.Stats(self._cprofile, stream=stream).sort_stats('cumulative').print_stats(30)
+            lines += ["", f"cProfile (top 30 by cumulative time, full stats in {stats_path})",
+                      "-" * 60, stream.getvalue()]
+
+        with open(report_path, 'w', encoding='utf-8') as report_file:
+            report_file.write("\n".join(lines) + "\n")
+
+        print(f"Startup profile written to {report_path}")
+        return report_path
+
+
+# Shared profiler used across the application
+startup_profiler = StartupProfiler()
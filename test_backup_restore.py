@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Backup Round-Trip Test Script
+=============================
+
+This script checks that native backups restore the data they were taken
+from. It builds a small SQLite database, takes a full and an incremental
+backup, restores the chain into a fresh database and compares the two.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from db_config import DatabaseConfig, DatabaseConnection
+from backup_engine import BackupEngine, BackupRestorer
+
+
+def _database(work_dir: str, name: str) -> DatabaseConnection:
+    """SQLite DatabaseConnection backed by a config file in work_dir"""
+    config_file = os.path.join(work_dir, f"{name}.json")
+    with open(config_file, 'w') as f:
+        json.dump({
+            'database': {'type': 'sqlite', 'database_name': os.path.join(work_dir, f"{name}.db")},
+            'backup': {'location': os.path.join(work_dir, 'backups')},
+        }, f)
+    return DatabaseConnection(DatabaseConfig(config_file))
+
+
+def _rows(conn, table: str) -> list:
+    return conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+
+
+def test_update_without_watermark():
+    """A session deactivated without touching last_activity survives an incremental"""
+    print("Testing update that changes no watermark column...")
+    work_dir = tempfile.mkdtemp(prefix='backup_test_')
+    try:
+        source = _database(work_dir, 'source')
+        conn = source.connect()
+        conn.executescript("""
+            CREATE TABLE user_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL UNIQUE,
+                user_id INTEGER NOT NULL,
+                login_time TEXT DEFAULT CURRENT_TIMESTAMP,
+                last_activity TEXT DEFAULT CURRENT_TIMESTAMP,
+                ip_address TEXT,
+                is_active BOOLEAN DEFAULT 1
+            );
+            CREATE TABLE milestones (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                created_date DATETIME NOT NULL,
+                last_updated DATETIME NOT NULL
+            );
+            INSERT INTO user_sessions (session_id, user_id, last_activity)
+                VALUES ('old', 1, '2020-01-01 00:00:00'), ('new', 2, '2020-01-02 00:00:00');
+            INSERT INTO milestones (name, created_date, last_updated)
+                VALUES ('Survey', '2020-01-01 00:00:00', '2020-01-01 00:00:00'),
+                       ('Removal', '2020-01-01 00:00:00', '2020-01-01 00:00:00');
+        """)
+        conn.commit()
+
+        engine = BackupEngine.from_config(source)
+        full = engine.create_backup()
+        assert full['type'] == 'full', full['type']
+
+        # Logout and sweep deactivate sessions without touching last_activity
+        conn.execute("UPDATE user_sessions SET is_active = 0 WHERE session_id = 'old'")
+        conn.execute("DELETE FROM milestones WHERE name = 'Removal'")
+        conn.execute("""
+            INSERT INTO milestones (name, created_date, last_updated)
+            VALUES ('Cutover', datetime('now'), datetime('now'))
+        """)
+        conn.commit()
+
+        incremental = engine.create_backup(incremental=True)
+        assert incremental['type'] == 'incremental', incremental['type']
+        assert incremental['tables']['milestones']['mode'] == 'incremental'
+
+        target = _database(work_dir, 'target')
+        BackupRestorer(target).restore(incremental['path'])
+        restored = target.connect()
+        try:
+            for table in ('user_sessions', 'milestones'):
+                assert _rows(restored, table) == _rows(conn, table), \
+                    f"{table}: {_rows(restored, table)} != {_rows(conn, table)}"
+        finally:
+            restored.close()
+            conn.close()
+
+        print("✓ Restored chain matches the source")
+    except AssertionError as e:
+        print(f"✗ Restored data differs: {e}")
+        raise
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """Run all tests"""
+    print("Backup Round-Trip Test for Degrow Workflow Manager")
+    print("=" * 50)
+
+    tests = [
+        ("Update Without Watermark", test_update_without_watermark),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        print(f"\n{test_name}:")
+        try:
+            test_func()
+            passed += 1
+        except Exception as e:
+            print(f"  {test_name} failed: {e}")
+
+    print("\n" + "=" * 50)
+    print(f"Test Results: {passed}/{total} tests passed")
+    return passed == total
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
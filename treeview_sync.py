@@ -0,0 +1,111 @@
+"""
+Treeview Synchronisation Module
+===============================
+
+Keyed model for ttk.Treeview widgets. Instead of deleting every item and
+re-inserting the whole tree on each refresh, callers describe the desired
+rows with stable keys and ``sync_treeview`` applies only the difference:
+new rows are inserted, vanished rows deleted, reordered rows moved and rows
+whose text, values or tags changed are updated in place. Items that survive
+a refresh keep their expansion state and selection.
+
+Author: Workflow Manager System
+Version: 1.0.0
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+
+@dataclass
+class TreeRow:
+    """Desired state of a single Treeview item.
+
+    Attributes:
+        key: Stable item identifier, used as the Treeview iid
+        text: Text shown in the tree column (#0)
+        values: Values for the data columns
+        tags: Tags applied to the item
+        children: Child rows, in display order
+        open: Expansion state applied when the item is first inserted;
+            existing items keep whatever the user has chosen
+    """
+    key: str
+    text: str = ''
+    values: Sequence = ()
+    tags: Sequence[str] = ()
+    children: List['TreeRow'] = field(default_factory=list)
+    open: bool = False
+
+
+def _normalise(values) -> tuple:
+    """Normalise values/tags the way Tk hands them back (strings, '' for empty)"""
+    if values in ('', None):
+        return ()
+    if isinstance(values, str):
+        return (values,)
+    return tuple('' if v is None else str(v) for v in values)
+
+
+def _collect_keys(rows: List[TreeRow], keys: set):
+    """Collect every key in a row hierarchy"""
+    for row in rows:
+        keys.add(row.key)
+        _collect_keys(row.children, keys)
+
+
+def sync_treeview(tree, rows: List[TreeRow], parent: str = '') -> Dict[str, int]:
+    """Bring the children of ``parent`` in line with ``rows``.
+
+    Args:
+        tree: ttk.Treeview to update
+        rows: Desired rows (and their children) in display order
+        parent: Parent item whose children are synchronised ('' for root)
+
+    Returns:
+        Dict with the number of items inserted, updated, moved and deleted
+    """
+    stats = {'inserted': 0, 'updated': 0, 'moved': 0, 'deleted': 0}
+
+    wanted = set()
+    _collect_keys(rows, wanted)
+
+    # Drop items that are no longer wanted. Deleting a parent removes its
+    # whole subtree, so only walk into children of surviving items.
+    pending = list(tree.get_children(parent))
+    while pending:
+        item = pending.pop()
+        if item in wanted:
+            pending.extend(tree.get_children(item))
+        else:
+            tree.delete(item)
+            stats['deleted'] += 1
+
+    _apply_rows(tree, rows, parent, stats)
+    return stats
+
+
+def _apply_rows(tree, rows: List[TreeRow], parent: str, stats: Dict[str, int]):
+    """Insert, move or update ``rows`` under ``parent``"""
+    for index, row in enumerate(rows):
+        values = _normalise(row.values)
+        tags = _normalise(row.tags)
+
+        if tree.exists(row.key):
+            current = tree.item(row.key)
+            if (current['text'] != row.text or
+                    _normalise(current['values']) != values or
+                    _normalise(current['tags']) != tags):
+                tree.item(row.key, text=row.text, values=values, tags=tags)
+                stats['updated'] += 1
+
+            if tree.parent(row.key) != parent or tree.index(row.key) != index:
+                tree.move(row.key, parent, index)
+                stats['moved'] += 1
+        else:
+            tree.insert(parent, index, iid=row.key, text=row.text,
+                        values=values, tags=tags, open=row.open)
+            stats['inserted'] += 1
+
+        _apply_rows(tree, row.children, row.key, stats)
+
@@ -14,14 +14,21 @@ Version: 2.0.0
 Date: 2025-10-31
 """
 
+import gzip
 import hashlib
+import json
+import os
 import secrets
 import re
+import time
+import zlib
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Callable, Optional, Dict, List, Tuple, Any
 import logging
 from enum import Enum
-from db_config import get_database_connection, DatabaseConnection
+from concurrent.futures import ProcessPoolExecutor
+from db_config import get_database_connection, DatabaseConnection, begin_transaction
+from permissions import permission_resolver
 
 # Configure logging
 logging.basicConfig(
@@ -34,6 +41,85 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# PBKDF2 iterations for administrative password hashes
+PASSWORD_HASH_ITERATIONS = 200000
+
+# Seconds a user statistics snapshot is reused
+STATS_CACHE_TTL = 30
+
+# Rows per executemany call / IN (...) lookup during bulk import
+BULK_IMPORT_CHUNK_SIZE = 500
+
+# Bound parameters per statement supported by every SQLite build
+SQLITE_MAX_VARIABLES = 999
+
+
+def hash_password(password: str, salt: str = None) -> Tuple[str, str]:
+    """
+    Hash password using PBKDF2-HMAC-SHA256
+    
+    Module-level so it can be sent to worker processes for bulk hashing.
+    
+    Args:
+        password: Plain text password
+        salt: Salt (generated if None)
+        
+    Returns:
+        Tuple of (hashed_password, salt)
+    """
+    if salt is None:
+        salt = secrets.token_hex(32)
+    
+    password_hash = hashlib.pbkdf2_hmac(
+        'sha256',
+        password.encode('utf-8'),
+        salt.encode('utf-8'),
+        PASSWORD_HASH_ITERATIONS
+    )
+    return password_hash.hex(), salt
+
+
+# admin_users columns in AdminUser constructor order
+ADMIN_USER_COLUMNS = """id, username, email, role, privilege_level, status,
+                       company, position, department, manager_id, created_date, last_login,
+                       suspension_date, suspension_reason, suspension_end_date, created_by,
+                       phone_number, employee_id"""
+
+
+# admin_users columns covered by the full-text search index
+USER_SEARCH_COLUMNS = ('username', 'email', 'company', 'department', 'position', 'employee_id')
+
+# Relative column weights for ranking search results on SQLite (bm25)
+USER_SEARCH_WEIGHTS = (10.0, 5.0, 2.0, 1.0, 1.0, 3.0)
+
+# MySQL's InnoDB full-text index ignores words shorter than this by default
+MYSQL_FULLTEXT_MIN_TOKEN = 3
+
+
+def _search_terms(query: str) -> List[str]:
+    """Split a search query into the words a full-text index matches on"""
+    return re.findall(r'\w+', query.lower())
+
+
+def _audit_json(values: Optional[Dict]) -> Optional[str]:
+    """Serialise audit values compactly (None when there is nothing to store)"""
+    if not values:
+        return None
+    return json.dumps(values, separators=(',', ':'), default=str)
+
+
+def _insert_audit(cursor, placeholder: str, user_id: int, action_type: str, description: str,
+                  performed_by: int = None, old_values: Dict = None,
+                  new_values: Dict = None, ip_address: str = None):
+    """Insert one audit row on an open cursor"""
+    # Compact JSON on both backends (MySQL JSON column, SQLite TEXT)
+    cursor.execute(f"""
+        INSERT INTO user_audit_log 
+        (user_id, action_type, action_description, performed_by, ip_address, old_values, new_values)
+        VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
+    """, (user_id, action_type, description, performed_by, ip_address,
+          _audit_json(old_values), _audit_json(new_values)))
+
 
 class UserRole(Enum):
     """User role enumeration"""
@@ -117,6 +203,105 @@ class AdminUser:
         }
 
 
+class UnitOfWork:
+    """
+    One connection and one transaction for an administrative action
+    
+    The user read, the writes and the audit rows of an action share the
+    connection and are committed together, or rolled back together if
+    anything raises inside the ``with`` block.
+    
+    Usage:
+        with admin.unit_of_work() as uow:
+            user = uow.fetch_user(user_id, for_update=True)
+            uow.cursor.execute(...)
+            uow.audit(user_id, 'USER_UPDATED', "...")
+    """
+    
+    def __init__(self, db_conn: DatabaseConnection):
+        self.db_conn = db_conn
+        self.conn = None
+        self.cursor = None
+        self.is_mysql = False
+        self.placeholder = '?'
+        self.now = "datetime('now')"
+    
+    def __enter__(self) -> 'UnitOfWork':
+        self.conn = self.db_conn.connect()
+        try:
+            self.cursor = self.conn.cursor()
+            self.is_mysql = hasattr(self.conn, 'server_version') or 'mysql' in str(type(self.conn)).lower()
+            self.placeholder = '%s' if self.is_mysql else '?'
+            self.now = 'NOW()' if self.is_mysql else "datetime('now')"
+            begin_transaction(self.conn)
+        except Exception:
+            self.conn.close()
+            raise
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        try:
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+        finally:
+            try:
+                self.cursor.close()
+            finally:
+                self.conn.close()
+        return False
+    
+    def fetch_user(self, user_id: int, for_update: bool = False) -> Optional[AdminUser]:
+        """
+        Read a user inside the transaction
+        
+        Args:
+            user_id: User ID
+            for_update: Lock the row until commit (MySQL; SQLite locks on first write)
+            
+        Returns:
+            AdminUser or None if not found
+        """
+        lock = " FOR UPDATE" if for_update and self.is_mysql else ""
+        self.cursor.execute(f"""
+            SELECT {ADMIN_USER_COLUMNS}
+            FROM admin_users WHERE id = {self.placeholder}{lock}
+        """, (user_id,))
+        result = self.cursor.fetchone()
+        return AdminUser(*result) if result else None
+    
+    def audit(self, user_id: int, action_type: str, description: str,
+              performed_by: int = None, old_values: Dict = None,
+              new_values: Dict = None, ip_address: str = None):
+        """Add an audit row to the transaction"""
+        _insert_audit(self.cursor, self.placeholder, user_id, action_type, description,
+                      performed_by, old_values, new_values, ip_address)
+
+
+def load_audit_archive_files(archive_dir: str) -> List[Dict]:
+    """
+    Read the JSONL audit archives written by archive_audit_log
+    
+    Args:
+        archive_dir: Directory holding the user_audit_*.jsonl.gz files
+        
+    Returns:
+        Archived entries in timestamp order, each ID once (a chunk whose
+        delete failed to commit can appear in two files)
+    """
+    entries = {}
+    for name in sorted(os.listdir(archive_dir)):
+        if not (name.startswith('user_audit_') and name.endswith('.jsonl.gz')):
+            continue
+        with gzip.open(os.path.join(archive_dir, name), 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries.setdefault(entry['id'], entry)
+    return sorted(entries.values(), key=lambda entry: (entry['timestamp'] or '', entry['id']))
+
+
 class UserAdministration:
     """
     Comprehensive User Administration System
@@ -140,6 +325,17 @@ class UserAdministration:
         self.config_file = config_file
         self.db_conn = get_database_connection(config_file)
         self.admin_user = None  # The admin using this module
+        if permission_resolver.db_conn is None:
+            permission_resolver.db_conn = self.db_conn
+        
+        # Callbacks told about user mutations, e.g. to invalidate caches
+        self._change_listeners: List[Callable[[str, Optional[int]], None]] = []
+        
+        # (monotonic time, stats) from the last get_user_statistics query
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        
+        # Whether search_users can use the full-text index (set by the schema setup)
+        self.fulltext_search = False
         
         # Password requirements
         self.min_password_length = 8
@@ -275,6 +471,21 @@ class UserAdministration:
                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
                 """)
                 
+                # Archived audit entries (zlib-compressed JSON payload)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS user_audit_archive (
+                        id INT PRIMARY KEY,
+                        user_id INT NOT NULL,
+                        action_type VARCHAR(50) NOT NULL,
+                        timestamp DATETIME,
+                        payload LONGBLOB NOT NULL,
+                        archived_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        
+                        INDEX idx_audit_archive_user (user_id, timestamp),
+                        INDEX idx_audit_archive_timestamp (timestamp)
+                    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """)
+                
                 # User sessions table
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS admin_user_sessions (
@@ -344,6 +555,61 @@ class UserAdministration:
                         new_values TEXT
                     )
                 """)
+                
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS user_privileges (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user_id INTEGER NOT NULL,
+                        privilege_name TEXT NOT NULL,
+                        privilege_value INTEGER DEFAULT 1,
+                        granted_by INTEGER,
+                        granted_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                        expires_date TEXT,
+                        UNIQUE (user_id, privilege_name),
+                        FOREIGN KEY (user_id) REFERENCES admin_users (id) ON DELETE CASCADE
+                    )
+                """)
+                
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS password_history (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        user_id INTEGER NOT NULL,
+                        password_hash TEXT NOT NULL,
+                        salt TEXT NOT NULL,
+                        changed_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (user_id) REFERENCES admin_users (id) ON DELETE CASCADE
+                    )
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_user_password_history
+                    ON password_history (user_id, changed_date)
+                """)
+                
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS user_audit_archive (
+                        id INTEGER PRIMARY KEY,
+                        user_id INTEGER NOT NULL,
+                        action_type TEXT NOT NULL,
+                        timestamp TEXT,
+                        payload BLOB NOT NULL,
+                        archived_date TEXT DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_audit_archive_user
+                    ON user_audit_archive (user_id, timestamp)
+                """)
+            
+            # Composite indexes for keyset-paginated audit browsing
+            self._ensure_index(cursor, is_mysql, 'user_audit_log',
+                               'idx_audit_timestamp_id', 'timestamp, id')
+            self._ensure_index(cursor, is_mysql, 'user_audit_log',
+                               'idx_audit_user_timestamp_id', 'user_id, timestamp, id')
+            self._ensure_index(cursor, is_mysql, 'user_audit_log',
+                               'idx_audit_action_timestamp_id', 'action_type, timestamp, id')
+            
+            # Full-text index for search_users
+            self.fulltext_search = self._ensure_search_index(cursor, is_mysql)
             
             conn.commit()
             cursor.close()
@@ -355,19 +621,111 @@ class UserAdministration:
             logger.error(f"Error initializing admin schema: {e}")
             raise
     
+    def add_change_listener(self, listener: Callable[[str, Optional[int]], None]):
+        """
+        Register a callback for user mutations
+        
+        The callback receives (action, user_id) after a user is created,
+        updated, suspended, activated, deactivated or deleted, or has their
+        password or privileges changed. user_id is None for bulk changes.
+        It may be called from a worker thread.
+        """
+        self._change_listeners.append(listener)
+    
+    def remove_change_listener(self, listener: Callable[[str, Optional[int]], None]):
+        """Unregister a callback added with add_change_listener"""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+    
+    def _notify_change(self, action: str, user_id: Optional[int]):
+        """Tell the change listeners about a user mutation"""
+        self._stats_cache = None
+        # Role, status and privilege changes all affect compiled permissions
+        permission_resolver.invalidate_admin_user(user_id)
+        for listener in list(self._change_listeners):
+            try:
+                listener(action, user_id)
+            except Exception as e:
+                logger.error(f"Error in user change listener: {e}")
+    
+    def _ensure_index(self, cursor, is_mysql: bool, table: str, index_name: str, columns: str):
+        """Create an index on an existing table if it is missing"""
+        if is_mysql:
+            cursor.execute("""
+                SELECT COUNT(*) FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+            """, (table, index_name))
+            if cursor.fetchone()[0] == 0:
+                cursor.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+        else:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})")
+    
+    def _ensure_search_index(self, cursor, is_mysql: bool) -> bool:
+        """
+        Create the full-text index used by search_users
+        
+        MySQL gets a FULLTEXT index on admin_users; SQLite gets an FTS5 table
+        kept in sync with admin_users by triggers.
+        
+        Returns:
+            True if the index is available
+        """
+        columns = ', '.join(USER_SEARCH_COLUMNS)
+        try:
+            if is_mysql:
+                cursor.execute("""
+                    SELECT COUNT(*) FROM information_schema.statistics
+                    WHERE table_schema = DATABASE() AND table_name = 'admin_users'
+                      AND index_name = 'ft_admin_users_search'
+                """)
+                if cursor.fetchone()[0] == 0:
+                    cursor.execute(f"CREATE FULLTEXT INDEX ft_admin_users_search ON admin_users ({columns})")
+                return True
+            
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'admin_users_fts'")
+            exists = cursor.fetchone() is not None
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS admin_users_fts USING fts5(
+                    {columns}, content='admin_users', content_rowid='id'
+                )
+            """)
+            new_values = ', '.join(f"new.{column}" for column in USER_SEARCH_COLUMNS)
+            old_values = ', '.join(f"old.{column}" for column in USER_SEARCH_COLUMNS)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS admin_users_fts_insert AFTER INSERT ON admin_users BEGIN
+                    INSERT INTO admin_users_fts (rowid, {columns}) VALUES (new.id, {new_values});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS admin_users_fts_delete AFTER DELETE ON admin_users BEGIN
+                    INSERT INTO admin_users_fts (admin_users_fts, rowid, {columns})
+                    VALUES ('delete', old.id, {old_values});
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS admin_users_fts_update
+                AFTER UPDATE OF {columns} ON admin_users BEGIN
+                    INSERT INTO admin_users_fts (admin_users_fts, rowid, {columns})
+                    VALUES ('delete', old.id, {old_values});
+                    INSERT INTO admin_users_fts (rowid, {columns}) VALUES (new.id, {new_values});
+                END
+            """)
+            if not exists:
+                # Index the users created before the search index existed
+                cursor.execute("INSERT INTO admin_users_fts (admin_users_fts) VALUES ('rebuild')")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Full-text user search unavailable, using LIKE matching: {e}")
+            return False
+    
     def _is_mysql(self, conn) -> bool:
         """Check if connection is MySQL"""
         return hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
     
-    def _get_placeholder(self) -> str:
-        """Get the correct SQL placeholder for the database type"""
-        try:
-            conn = self.db_conn.connect()
-            is_mysql = self._is_mysql(conn)
-            conn.close()
-            return '%s' if is_mysql else '?'
-        except:
-            return '?'
+    def unit_of_work(self) -> UnitOfWork:
+        """Start a single-connection, single-transaction unit of work"""
+        return UnitOfWork(self.db_conn)
     
     def _hash_password(self, password: str, salt: str = None) -> Tuple[str, str]:
         """
@@ -380,17 +738,8 @@ class UserAdministration:
         Returns:
             Tuple of (hashed_password, salt)
         """
-        if salt is None:
-            salt = secrets.token_hex(32)
-        
-        # Use PBKDF2 with 200,000 iterations for enhanced security
-        password_hash = hashlib.pbkdf2_hmac(
-            'sha256',
-            password.encode('utf-8'),
-            salt.encode('utf-8'),
-            200000
-        )
-        return password_hash.hex(), salt
+        # PBKDF2 with 200,000 iterations for enhanced security
+        return hash_password(password, salt)
     
     def _validate_password(self, password: str) -> Tuple[bool, str]:
         """
@@ -443,26 +792,9 @@ class UserAdministration:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
             
-            is_mysql = self._is_mysql(conn)
-            placeholder = self._get_placeholder()
-            
-            if is_mysql:
-                import json
-                cursor.execute(f"""
-                    INSERT INTO user_audit_log 
-                    (user_id, action_type, action_description, performed_by, ip_address, old_values, new_values)
-                    VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-                """, (user_id, action_type, description, performed_by, ip_address,
-                      json.dumps(old_values) if old_values else None,
-                      json.dumps(new_values) if new_values else None))
-            else:
-                cursor.execute(f"""
-                    INSERT INTO user_audit_log 
-                    (user_id, action_type, action_description, performed_by, ip_address, old_values, new_values)
-                    VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-                """, (user_id, action_type, description, performed_by, ip_address,
-                      str(old_values) if old_values else None,
-                      str(new_values) if new_values else None))
+            placeholder = '%s' if self._is_mysql(conn) else '?'
+            _insert_audit(cursor, placeholder, user_id, action_type, description,
+                          performed_by, old_values, new_values, ip_address)
             
             conn.commit()
             cursor.close()
@@ -515,68 +847,285 @@ class UserAdministration:
                 logger.error(f"Password validation failed: {error_msg}")
                 return None
             
-            # Check if user already exists
-            if self.get_user_by_username(username):
-                logger.error(f"Username '{username}' already exists")
-                return None
+            # Hash before the transaction so no row is held while hashing
+            password_hash, salt = self._hash_password(password)
             
-            if self.get_user_by_email(email):
-                logger.error(f"Email '{email}' already exists")
-                return None
+            with self.unit_of_work() as uow:
+                placeholder = uow.placeholder
+                
+                # Check if user already exists
+                uow.cursor.execute(f"""
+                    SELECT username, email FROM admin_users
+                    WHERE username = {placeholder} OR email = {placeholder}
+                """, (username, email))
+                for existing_username, existing_email in uow.cursor.fetchall():
+                    if existing_username == username:
+                        logger.error(f"Username '{username}' already exists")
+                    else:
+                        logger.error(f"Email '{email}' already exists")
+                    return None
+                
+                status = 'active' if auto_activate else 'pending_activation'
+                
+                uow.cursor.execute(f"""
+                    INSERT INTO admin_users 
+                    (username, email, password_hash, salt, role, privilege_level, status,
+                     company, position, department, employee_id, phone_number, manager_id, created_by)
+                    VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder},
+                            {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder},
+                            {placeholder}, {placeholder}, {placeholder}, {placeholder})
+                """, (username, email, password_hash, salt, role, privilege_level, status,
+                      company, position, department, employee_id, phone_number, manager_id, created_by))
+                
+                user_id = uow.cursor.lastrowid
+                
+                # Store password in history
+                uow.cursor.execute(f"""
+                    INSERT INTO password_history (user_id, password_hash, salt)
+                    VALUES ({placeholder}, {placeholder}, {placeholder})
+                """, (user_id, password_hash, salt))
+                
+                uow.audit(
+                    user_id=user_id,
+                    action_type='USER_CREATED',
+                    description=f"User '{username}' created with role '{role}'",
+                    performed_by=created_by,
+                    new_values={
+                        'username': username,
+                        'email': email,
+                        'role': role,
+                        'company': company,
+                        'position': position
+                    }
+                )
+            
+            self._notify_change('created', user_id)
+            logger.info(f"User '{username}' (ID: {user_id}) created successfully")
+            return user_id
             
-            # Hash password
-            password_hash, salt = self._hash_password(password)
+        except Exception as e:
+            logger.error(f"Error creating user: {e}")
+            return None
+    
+    def _validate_import_row(self, row: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Normalise and validate one bulk import row
+        
+        Args:
+            row: Raw row (CSV or JSON record)
+            
+        Returns:
+            Tuple of (normalised_row, error_message); normalised_row is None
+            when the row is invalid
+        """
+        def text(name):
+            value = row.get(name)
+            value = str(value).strip() if value is not None else ''
+            return value or None
+        
+        username = text('username') or ''
+        email = text('email') or ''
+        password = row.get('password') or ''
+        role = text('role') or 'user'
+        privilege_level = text('privilege_level') or 'limited'
+        
+        if len(username) < 3:
+            return None, "Username must be at least 3 characters"
+        if not self._validate_email(email):
+            return None, "Invalid email format"
+        is_valid, error_msg = self._validate_password(password)
+        if not is_valid:
+            return None, error_msg
+        if role not in [r.value for r in UserRole]:
+            return None, f"Unknown role '{role}'"
+        if privilege_level not in [p.value for p in PrivilegeLevel]:
+            return None, f"Unknown privilege level '{privilege_level}'"
+        
+        # Privileges: list (JSON) or ';'/','-separated string (CSV)
+        privileges = row.get('privileges') or []
+        if isinstance(privileges, str):
+            privileges = re.split(r'[;,]', privileges)
+        privileges = sorted({str(p).strip() for p in privileges if str(p).strip()})
+        
+        return {
+            'username': username,
+            'email': email,
+            'password': password,
+            'role': role,
+            'privilege_level': privilege_level,
+            'company': text('company'),
+            'position': text('position'),
+            'department': text('department'),
+            'employee_id': text('employee_id'),
+            'phone_number': text('phone_number'),
+            'privileges': privileges,
+        }, ""
+    
+    def bulk_import_users(self, rows: List[Dict[str, Any]], created_by: int = None,
+                          auto_activate: bool = False, max_workers: int = None,
+                          dry_run: bool = False) -> List[Dict[str, Any]]:
+        """
+        Create many users at once
+        
+        All rows are validated up front (format, password rules, duplicates
+        within the batch and against existing users). Password hashes for the
+        valid rows are computed in a process pool across all cores, then the
+        users, password history, privileges and audit entries are inserted
+        with executemany in a single transaction.
+        
+        Args:
+            rows: User records with the create_user fields plus an optional
+                'privileges' list (or ';'-separated string)
+            created_by: Admin user ID performing the import
+            auto_activate: Whether to activate the users immediately
+            max_workers: Hashing processes (defaults to the CPU count)
+            dry_run: Validate only, do not hash or insert
             
-            # Create user
+        Returns:
+            One result per input row: {'row', 'username', 'status', 'user_id',
+            'message'} where status is 'created', 'valid' (dry run),
+            'invalid' or 'failed'
+        """
+        results = []
+        valid = []
+        
+        # Existing usernames, emails and employee IDs, compared case-insensitively
+        try:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
-            
-            placeholder = self._get_placeholder()
+            cursor.execute("SELECT username, email, employee_id FROM admin_users")
+            existing = cursor.fetchall()
+            cursor.close()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error loading existing users for bulk import: {e}")
+            return [{'row': index, 'username': row.get('username'), 'status': 'failed',
+                     'user_id': None, 'message': str(e)}
+                    for index, row in enumerate(rows, start=1)]
+        
+        seen_usernames = {r[0].lower() for r in existing if r[0]}
+        seen_emails = {r[1].lower() for r in existing if r[1]}
+        seen_employee_ids = {r[2] for r in existing if r[2]}
+        
+        for index, raw_row in enumerate(rows, start=1):
+            row, error_msg = self._validate_import_row(raw_row)
+            result = {'row': index, 'username': raw_row.get('username'),
+                      'status': 'invalid', 'user_id': None, 'message': error_msg}
+            results.append(result)
+            if row is None:
+                continue
+            
+            if row['username'].lower() in seen_usernames:
+                result['message'] = f"Username '{row['username']}' already exists"
+            elif row['email'].lower() in seen_emails:
+                result['message'] = f"Email '{row['email']}' already exists"
+            elif row['employee_id'] and row['employee_id'] in seen_employee_ids:
+                result['message'] = f"Employee ID '{row['employee_id']}' already exists"
+            else:
+                seen_usernames.add(row['username'].lower())
+                seen_emails.add(row['email'].lower())
+                if row['employee_id']:
+                    seen_employee_ids.add(row['employee_id'])
+                result['status'] = 'valid'
+                valid.append((result, row))
+        
+        if dry_run or not valid:
+            return results
+        
+        # Hash passwords across all cores
+        passwords = [row['password'] for _, row in valid]
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(passwords) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            hashes = list(pool.map(hash_password, passwords, chunksize=chunksize))
+        
+        conn = None
+        try:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            placeholder = '%s' if self._is_mysql(conn) else '?'
             status = 'active' if auto_activate else 'pending_activation'
             
-            cursor.execute(f"""
-                INSERT INTO admin_users 
-                (username, email, password_hash, salt, role, privilege_level, status,
-                 company, position, department, employee_id, phone_number, manager_id, created_by)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder},
-                        {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder},
-                        {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            """, (username, email, password_hash, salt, role, privilege_level, status,
-                  company, position, department, employee_id, phone_number, manager_id, created_by))
-            
-            user_id = cursor.lastrowid
-            
-            # Store password in history
-            cursor.execute(f"""
-                INSERT INTO password_history (user_id, password_hash, salt)
-                VALUES ({placeholder}, {placeholder}, {placeholder})
-            """, (user_id, password_hash, salt))
+            begin_transaction(conn)
+            
+            user_rows = [
+                (row['username'], row['email'], password_hash, salt, row['role'],
+                 row['privilege_level'], status, row['company'], row['position'],
+                 row['department'], row['employee_id'], row['phone_number'], created_by)
+                for (_, row), (password_hash, salt) in zip(valid, hashes)
+            ]
+            for start in range(0, len(user_rows), BULK_IMPORT_CHUNK_SIZE):
+                cursor.executemany(f"""
+                    INSERT INTO admin_users 
+                    (username, email, password_hash, salt, role, privilege_level, status,
+                     company, position, department, employee_id, phone_number, created_by)
+                    VALUES ({', '.join([placeholder] * 13)})
+                """, user_rows[start:start + BULK_IMPORT_CHUNK_SIZE])
+            
+            # executemany does not report per-row IDs, so look them up by username
+            user_ids = {}
+            usernames = [row['username'] for _, row in valid]
+            for start in range(0, len(usernames), BULK_IMPORT_CHUNK_SIZE):
+                chunk = usernames[start:start + BULK_IMPORT_CHUNK_SIZE]
+                cursor.execute(f"""
+                    SELECT id, username FROM admin_users
+                    WHERE username IN ({', '.join([placeholder] * len(chunk))})
+                """, chunk)
+                user_ids.update({username: user_id for user_id, username in cursor.fetchall()})
+            
+            history_rows = []
+            privilege_rows = []
+            audit_rows = []
+            for ((result, row), (password_hash, salt)) in zip(valid, hashes):
+                user_id = user_ids[row['username']]
+                history_rows.append((user_id, password_hash, salt))
+                privilege_rows.extend((user_id, name, 1, created_by) for name in row['privileges'])
+                audit_rows.append((
+                    user_id, 'USER_CREATED',
+                    f"User '{row['username']}' created with role '{row['role']}' (bulk import)",
+                    created_by,
+                    json.dumps({'username': row['username'], 'email': row['email'],
+                                'role': row['role'], 'company': row['company'],
+                                'position': row['position']})
+                ))
+            
+            statements = [
+                (f"""INSERT INTO password_history (user_id, password_hash, salt)
+                     VALUES ({placeholder}, {placeholder}, {placeholder})""", history_rows),
+                (f"""INSERT INTO user_privileges (user_id, privilege_name, privilege_value, granted_by)
+                     VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder})""", privilege_rows),
+                (f"""INSERT INTO user_audit_log (user_id, action_type, action_description, performed_by, new_values)
+                     VALUES ({', '.join([placeholder] * 5)})""", audit_rows),
+            ]
+            for query, statement_rows in statements:
+                for start in range(0, len(statement_rows), BULK_IMPORT_CHUNK_SIZE):
+                    cursor.executemany(query, statement_rows[start:start + BULK_IMPORT_CHUNK_SIZE])
             
             conn.commit()
             cursor.close()
-            conn.close()
             
-            # Log audit
-            self._log_audit(
-                user_id=user_id,
-                action_type='USER_CREATED',
-                description=f"User '{username}' created with role '{role}'",
-                performed_by=created_by,
-                new_values={
-                    'username': username,
-                    'email': email,
-                    'role': role,
-                    'company': company,
-                    'position': position
-                }
-            )
+            for result, row in valid:
+                result['status'] = 'created'
+                result['user_id'] = user_ids[row['username']]
             
-            logger.info(f"User '{username}' (ID: {user_id}) created successfully")
-            return user_id
+            self._notify_change('created', None)
+            logger.info(f"Bulk import created {len(valid)} users (by admin {created_by})")
             
         except Exception as e:
-            logger.error(f"Error creating user: {e}")
-            return None
+            logger.error(f"Error during bulk user import: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            for result, _ in valid:
+                result['status'] = 'failed'
+                result['message'] = f"Import rolled back: {e}"
+        finally:
+            if conn:
+                conn.close()
+        
+        return results
     
     def get_user_by_id(self, user_id: int) -> Optional[AdminUser]:
         """Get user by ID"""
@@ -584,12 +1133,9 @@ class UserAdministration:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
             
-            placeholder = self._get_placeholder()
+            placeholder = '%s' if self._is_mysql(conn) else '?'
             cursor.execute(f"""
-                SELECT id, username, email, role, privilege_level, status,
-                       company, position, department, manager_id, created_date, last_login,
-                       suspension_date, suspension_reason, suspension_end_date, created_by,
-                       phone_number, employee_id
+                SELECT {ADMIN_USER_COLUMNS}
                 FROM admin_users WHERE id = {placeholder}
             """, (user_id,))
             
@@ -611,12 +1157,9 @@ class UserAdministration:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
             
-            placeholder = self._get_placeholder()
+            placeholder = '%s' if self._is_mysql(conn) else '?'
             cursor.execute(f"""
-                SELECT id, username, email, role, privilege_level, status,
-                       company, position, department, manager_id, created_date, last_login,
-                       suspension_date, suspension_reason, suspension_end_date, created_by,
-                       phone_number, employee_id
+                SELECT {ADMIN_USER_COLUMNS}
                 FROM admin_users WHERE username = {placeholder}
             """, (username,))
             
@@ -638,12 +1181,9 @@ class UserAdministration:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
             
-            placeholder = self._get_placeholder()
+            placeholder = '%s' if self._is_mysql(conn) else '?'
             cursor.execute(f"""
-                SELECT id, username, email, role, privilege_level, status,
-                       company, position, department, manager_id, created_date, last_login,
-                       suspension_date, suspension_reason, suspension_end_date, created_by,
-                       phone_number, employee_id
+                SELECT {ADMIN_USER_COLUMNS}
                 FROM admin_users WHERE email = {placeholder}
             """, (email,))
             
@@ -677,15 +1217,12 @@ class UserAdministration:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
             
-            query = """
-                SELECT id, username, email, role, privilege_level, status,
-                       company, position, department, manager_id, created_date, last_login,
-                       suspension_date, suspension_reason, suspension_end_date, created_by,
-                       phone_number, employee_id
+            query = f"""
+                SELECT {ADMIN_USER_COLUMNS}
                 FROM admin_users WHERE 1=1
             """
             params = []
-            placeholder = self._get_placeholder()
+            placeholder = '%s' if self._is_mysql(conn) else '?'
             
             if status_filter:
                 query += f" AND status = {placeholder}"
@@ -729,72 +1266,59 @@ class UserAdministration:
         Returns:
             True if successful, False otherwise
         """
+        # Build update query
+        valid_fields = ['username', 'email', 'role', 'privilege_level', 'status',
+                      'company', 'position', 'department', 'phone_number',
+                      'employee_id', 'manager_id', 'notes']
+        
+        if not any(field in valid_fields for field in kwargs):
+            logger.warning("No valid fields to update")
+            return False
+        
         try:
-            # Get current user data for audit
-            old_user = self.get_user_by_id(user_id)
-            if not old_user:
-                logger.error(f"User {user_id} not found")
-                return False
-            
-            # Build update query
-            valid_fields = ['username', 'email', 'role', 'privilege_level', 'status',
-                          'company', 'position', 'department', 'phone_number',
-                          'employee_id', 'manager_id', 'notes']
-            
-            update_fields = []
-            params = []
-            placeholder = self._get_placeholder()
-            
-            for field, value in kwargs.items():
-                if field in valid_fields:
-                    update_fields.append(f"{field} = {placeholder}")
-                    params.append(value)
-            
-            if not update_fields:
-                logger.warning("No valid fields to update")
-                return False
-            
-            # Add modified_by and modified_date
-            is_mysql = True
-            try:
-                conn = self.db_conn.connect()
-                is_mysql = self._is_mysql(conn)
-            except:
-                pass
-            
-            if is_mysql:
-                update_fields.append(f"modified_by = {placeholder}")
-                update_fields.append("modified_date = NOW()")
-            else:
+            with self.unit_of_work() as uow:
+                # Get current user data for audit
+                old_user = uow.fetch_user(user_id, for_update=True)
+                if not old_user:
+                    logger.error(f"User {user_id} not found")
+                    return False
+                
+                # Only fields whose value actually changes are written and audited
+                old_values = {}
+                new_values = {}
+                for field, value in kwargs.items():
+                    old_value = getattr(old_user, field, None)
+                    # Empty form fields ('') match NULL columns
+                    if field in valid_fields and (old_value if old_value != '' else None) != (value if value != '' else None):
+                        old_values[field] = old_value
+                        new_values[field] = value
+                
+                if not new_values:
+                    logger.info(f"User {user_id} unchanged, nothing to update")
+                    return True
+                
+                placeholder = uow.placeholder
+                update_fields = [f"{field} = {placeholder}" for field in new_values]
                 update_fields.append(f"modified_by = {placeholder}")
-                update_fields.append("modified_date = datetime('now')")
-            
-            params.append(modified_by)
-            params.append(user_id)
-            
-            # Execute update
-            cursor = conn.cursor()
-            query = f"""
-                UPDATE admin_users 
-                SET {', '.join(update_fields)}
-                WHERE id = {placeholder}
-            """
-            
-            cursor.execute(query, tuple(params))
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            # Log audit
-            self._log_audit(
-                user_id=user_id,
-                action_type='USER_UPDATED',
-                description=f"User '{old_user.username}' updated",
-                performed_by=modified_by,
-                old_values=old_user.to_dict(),
-                new_values=kwargs
-            )
-            
+                update_fields.append(f"modified_date = {uow.now}")
+                params = list(new_values.values()) + [modified_by, user_id]
+                
+                uow.cursor.execute(f"""
+                    UPDATE admin_users 
+                    SET {', '.join(update_fields)}
+                    WHERE id = {placeholder}
+                """, tuple(params))
+                
+                uow.audit(
+                    user_id=user_id,
+                    action_type='USER_UPDATED',
+                    description=f"User '{old_user.username}' updated: {', '.join(new_values)}",
+                    performed_by=modified_by,
+                    old_values=old_values,
+                    new_values=new_values
+                )
+            
+            self._notify_change('updated', user_id)
             logger.info(f"User {user_id} updated successfully")
             return True
             
@@ -822,51 +1346,37 @@ class UserAdministration:
                 logger.error(f"Password validation failed: {error_msg}")
                 return False
             
-            # Hash new password
+            # Hash before the transaction so no row is held while hashing
             password_hash, salt = self._hash_password(new_password)
             
-            conn = self.db_conn.connect()
-            cursor = conn.cursor()
-            
-            placeholder = self._get_placeholder()
-            is_mysql = self._is_mysql(conn)
-            
-            # Update password
-            if is_mysql:
-                cursor.execute(f"""
+            with self.unit_of_work() as uow:
+                placeholder = uow.placeholder
+                
+                uow.cursor.execute(f"""
                     UPDATE admin_users 
                     SET password_hash = {placeholder}, salt = {placeholder}, 
-                        last_password_change = NOW(),
-                        modified_by = {placeholder}, modified_date = NOW()
+                        last_password_change = {uow.now},
+                        modified_by = {placeholder}, modified_date = {uow.now}
                     WHERE id = {placeholder}
                 """, (password_hash, salt, changed_by, user_id))
-            else:
-                cursor.execute(f"""
-                    UPDATE admin_users 
-                    SET password_hash = {placeholder}, salt = {placeholder},
-                        last_password_change = datetime('now'),
-                        modified_by = {placeholder}, modified_date = datetime('now')
-                    WHERE id = {placeholder}
-                """, (password_hash, salt, changed_by, user_id))
-            
-            # Store in password history
-            cursor.execute(f"""
-                INSERT INTO password_history (user_id, password_hash, salt)
-                VALUES ({placeholder}, {placeholder}, {placeholder})
-            """, (user_id, password_hash, salt))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            # Log audit
-            self._log_audit(
-                user_id=user_id,
-                action_type='PASSWORD_CHANGED',
-                description=f"Password changed for user {user_id}",
-                performed_by=changed_by
-            )
-            
+                if uow.cursor.rowcount == 0:
+                    logger.error(f"User {user_id} not found")
+                    return False
+                
+                # Store in password history
+                uow.cursor.execute(f"""
+                    INSERT INTO password_history (user_id, password_hash, salt)
+                    VALUES ({placeholder}, {placeholder}, {placeholder})
+                """, (user_id, password_hash, salt))
+                
+                uow.audit(
+                    user_id=user_id,
+                    action_type='PASSWORD_CHANGED',
+                    description=f"Password changed for user {user_id}",
+                    performed_by=changed_by
+                )
+            
+            self._notify_change('password_changed', user_id)
             logger.info(f"Password changed for user {user_id}")
             return True
             
@@ -890,50 +1400,33 @@ class UserAdministration:
             True if successful, False otherwise
         """
         try:
-            conn = self.db_conn.connect()
-            cursor = conn.cursor()
-            
-            placeholder = self._get_placeholder()
-            is_mysql = self._is_mysql(conn)
-            
-            if is_mysql:
-                cursor.execute(f"""
-                    UPDATE admin_users 
-                    SET status = 'suspended',
-                        suspension_date = NOW(),
-                        suspension_reason = {placeholder},
-                        suspension_end_date = {placeholder},
-                        suspended_by = {placeholder},
-                        modified_by = {placeholder},
-                        modified_date = NOW()
-                    WHERE id = {placeholder}
-                """, (reason, suspension_end_date, suspended_by, suspended_by, user_id))
-            else:
-                cursor.execute(f"""
+            with self.unit_of_work() as uow:
+                placeholder = uow.placeholder
+                
+                uow.cursor.execute(f"""
                     UPDATE admin_users 
                     SET status = 'suspended',
-                        suspension_date = datetime('now'),
+                        suspension_date = {uow.now},
                         suspension_reason = {placeholder},
                         suspension_end_date = {placeholder},
                         suspended_by = {placeholder},
                         modified_by = {placeholder},
-                        modified_date = datetime('now')
+                        modified_date = {uow.now}
                     WHERE id = {placeholder}
                 """, (reason, suspension_end_date, suspended_by, suspended_by, user_id))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            # Log audit
-            self._log_audit(
-                user_id=user_id,
-                action_type='USER_SUSPENDED',
-                description=f"User suspended: {reason}",
-                performed_by=suspended_by,
-                new_values={'reason': reason, 'end_date': str(suspension_end_date)}
-            )
-            
+                if uow.cursor.rowcount == 0:
+                    logger.error(f"User {user_id} not found")
+                    return False
+                
+                uow.audit(
+                    user_id=user_id,
+                    action_type='USER_SUSPENDED',
+                    description=f"User suspended: {reason}",
+                    performed_by=suspended_by,
+                    new_values={'reason': reason, 'end_date': str(suspension_end_date)}
+                )
+            
+            self._notify_change('suspended', user_id)
             logger.info(f"User {user_id} suspended by {suspended_by}")
             return True
             
@@ -953,26 +1446,10 @@ class UserAdministration:
             True if successful, False otherwise
         """
         try:
-            conn = self.db_conn.connect()
-            cursor = conn.cursor()
-            
-            placeholder = self._get_placeholder()
-            is_mysql = self._is_mysql(conn)
-            
-            if is_mysql:
-                cursor.execute(f"""
-                    UPDATE admin_users 
-                    SET status = 'active',
-                        suspension_date = NULL,
-                        suspension_reason = NULL,
-                        suspension_end_date = NULL,
-                        suspended_by = NULL,
-                        modified_by = {placeholder},
-                        modified_date = NOW()
-                    WHERE id = {placeholder}
-                """, (activated_by, user_id))
-            else:
-                cursor.execute(f"""
+            with self.unit_of_work() as uow:
+                placeholder = uow.placeholder
+                
+                uow.cursor.execute(f"""
                     UPDATE admin_users 
                     SET status = 'active',
                         suspension_date = NULL,
@@ -980,22 +1457,21 @@ class UserAdministration:
                         suspension_end_date = NULL,
                         suspended_by = NULL,
                         modified_by = {placeholder},
-                        modified_date = datetime('now')
+                        modified_date = {uow.now}
                     WHERE id = {placeholder}
                 """, (activated_by, user_id))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            # Log audit
-            self._log_audit(
-                user_id=user_id,
-                action_type='USER_ACTIVATED',
-                description=f"User activated",
-                performed_by=activated_by
-            )
-            
+                if uow.cursor.rowcount == 0:
+                    logger.error(f"User {user_id} not found")
+                    return False
+                
+                uow.audit(
+                    user_id=user_id,
+                    action_type='USER_ACTIVATED',
+                    description=f"User activated",
+                    performed_by=activated_by
+                )
+            
+            self._notify_change('activated', user_id)
             logger.info(f"User {user_id} activated by {activated_by}")
             return True
             
@@ -1015,48 +1491,35 @@ class UserAdministration:
             True if successful, False otherwise
         """
         try:
-            conn = self.db_conn.connect()
-            cursor = conn.cursor()
-            
-            placeholder = self._get_placeholder()
-            is_mysql = self._is_mysql(conn)
-            
-            if is_mysql:
-                cursor.execute(f"""
-                    UPDATE admin_users 
-                    SET status = 'deactivated',
-                        modified_by = {placeholder},
-                        modified_date = NOW()
-                    WHERE id = {placeholder}
-                """, (deactivated_by, user_id))
-            else:
-                cursor.execute(f"""
+            with self.unit_of_work() as uow:
+                placeholder = uow.placeholder
+                
+                uow.cursor.execute(f"""
                     UPDATE admin_users 
                     SET status = 'deactivated',
                         modified_by = {placeholder},
-                        modified_date = datetime('now')
+                        modified_date = {uow.now}
                     WHERE id = {placeholder}
                 """, (deactivated_by, user_id))
-            
-            # Deactivate all sessions
-            cursor.execute(f"""
-                UPDATE admin_user_sessions 
-                SET is_active = FALSE 
-                WHERE user_id = {placeholder}
-            """, (user_id,))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            # Log audit
-            self._log_audit(
-                user_id=user_id,
-                action_type='USER_DEACTIVATED',
-                description=f"User permanently deactivated",
-                performed_by=deactivated_by
-            )
-            
+                if uow.cursor.rowcount == 0:
+                    logger.error(f"User {user_id} not found")
+                    return False
+                
+                # Deactivate all sessions
+                uow.cursor.execute(f"""
+                    UPDATE admin_user_sessions 
+                    SET is_active = FALSE 
+                    WHERE user_id = {placeholder}
+                """, (user_id,))
+                
+                uow.audit(
+                    user_id=user_id,
+                    action_type='USER_DEACTIVATED',
+                    description=f"User permanently deactivated",
+                    performed_by=deactivated_by
+                )
+            
+            self._notify_change('deactivated', user_id)
             logger.info(f"User {user_id} deactivated by {deactivated_by}")
             return True
             
@@ -1076,38 +1539,131 @@ class UserAdministration:
             True if successful, False otherwise
         """
         try:
-            # Get user data for audit
-            user = self.get_user_by_id(user_id)
-            if not user:
-                return False
+            with self.unit_of_work() as uow:
+                # Get user data for audit
+                user = uow.fetch_user(user_id, for_update=True)
+                if not user:
+                    return False
+                
+                # Audit before deletion, committed together with it
+                uow.audit(
+                    user_id=user_id,
+                    action_type='USER_DELETED',
+                    description=f"User '{user.username}' deleted",
+                    performed_by=deleted_by,
+                    old_values=user.to_dict()
+                )
+                
+                uow.cursor.execute(f"""
+                    DELETE FROM admin_users WHERE id = {uow.placeholder}
+                """, (user_id,))
             
-            # Log audit before deletion
-            self._log_audit(
-                user_id=user_id,
-                action_type='USER_DELETED',
-                description=f"User '{user.username}' deleted",
-                performed_by=deleted_by,
-                old_values=user.to_dict()
-            )
+            self._notify_change('deleted', user_id)
+            logger.warning(f"User {user_id} deleted by {deleted_by}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error deleting user: {e}")
+            return False
+    
+    def search_users(self, query: str, limit: int = 50, offset: int = 0,
+                     status_filter: str = None, role_filter: str = None) -> List[AdminUser]:
+        """
+        Search users through the full-text index
+        
+        Every word of the query must prefix-match a word in the username,
+        email, company, department, position or employee ID. An exact
+        username, email or employee ID match comes first, then results are
+        ranked by relevance, username matches before other columns.
+        
+        Args:
+            query: Search text
+            limit: Maximum number of users to return
+            offset: Number of ranked results to skip (paging)
+            status_filter: Only users with this status
+            role_filter: Only users with this role
             
+        Returns:
+            List of AdminUser objects, best match first
+        """
+        terms = _search_terms(query)
+        if not terms:
+            return []
+        
+        try:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
+            is_mysql = self._is_mysql(conn)
+            placeholder = '%s' if is_mysql else '?'
+            columns = ', '.join(USER_SEARCH_COLUMNS)
+            exact = query.strip().lower()
+            
+            def like_condition(term: str, prefix: str = '') -> str:
+                """Substring match of one word in any searched column"""
+                params.extend([f"%{term}%"] * len(USER_SEARCH_COLUMNS))
+                return "(" + " OR ".join(f"LOWER({prefix}{column}) LIKE {placeholder}"
+                                         for column in USER_SEARCH_COLUMNS) + ")"
+            
+            def filter_conditions(prefix: str = '') -> List[str]:
+                """Status and role filters, applied before the limit"""
+                conditions = []
+                for column, value in (('status', status_filter), ('role', role_filter)):
+                    if value:
+                        conditions.append(f"{prefix}{column} = {placeholder}")
+                        params.append(value)
+                return conditions
             
-            placeholder = self._get_placeholder()
-            cursor.execute(f"""
-                DELETE FROM admin_users WHERE id = {placeholder}
-            """, (user_id,))
-            
-            conn.commit()
+            params = []
+            if not self.fulltext_search or (
+                    is_mysql and all(len(term) < MYSQL_FULLTEXT_MIN_TOKEN for term in terms)):
+                # No index (or only words too short for it): match substrings
+                conditions = [like_condition(term) for term in terms] + filter_conditions()
+                cursor.execute(f"""
+                    SELECT {ADMIN_USER_COLUMNS}
+                    FROM admin_users
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY username
+                    LIMIT {placeholder} OFFSET {placeholder}
+                """, params + [limit, offset])
+            elif is_mysql:
+                match = ' '.join(f"+{term}*" for term in terms if len(term) >= MYSQL_FULLTEXT_MIN_TOKEN)
+                params.append(match)
+                # Words too short for the index must still match, as substrings
+                conditions = [f"MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)"]
+                conditions += [like_condition(term) for term in terms
+                               if len(term) < MYSQL_FULLTEXT_MIN_TOKEN]
+                conditions += filter_conditions()
+                cursor.execute(f"""
+                    SELECT {ADMIN_USER_COLUMNS}
+                    FROM admin_users
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY (LOWER(username) = %s OR LOWER(email) = %s OR LOWER(employee_id) = %s) DESC,
+                             MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE) DESC, username
+                    LIMIT %s OFFSET %s
+                """, params + [exact, exact, exact, match, limit, offset])
+            else:
+                match = ' '.join(f'"{term}"*' for term in terms)
+                weights = ', '.join(str(weight) for weight in USER_SEARCH_WEIGHTS)
+                params.append(match)
+                conditions = ["admin_users_fts MATCH ?"] + filter_conditions('au.')
+                cursor.execute(f"""
+                    SELECT {', '.join(f'au.{column.strip()}' for column in ADMIN_USER_COLUMNS.split(','))}
+                    FROM admin_users_fts
+                    JOIN admin_users au ON au.id = admin_users_fts.rowid
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY (LOWER(au.username) = ? OR LOWER(au.email) = ? OR LOWER(au.employee_id) = ?) DESC,
+                             bm25(admin_users_fts, {weights}), au.username
+                    LIMIT ? OFFSET ?
+                """, params + [exact, exact, exact, limit, offset])
+            
+            users = [AdminUser(*row) for row in cursor.fetchall()]
             cursor.close()
             conn.close()
-            
-            logger.warning(f"User {user_id} deleted by {deleted_by}")
-            return True
+            return users
             
         except Exception as e:
-            logger.error(f"Error deleting user: {e}")
-            return False
+            logger.error(f"Error searching users: {e}")
+            return []
     
     def get_users_by_company(self, company: str) -> List[AdminUser]:
         """Get all users in a specific company"""
@@ -1121,13 +1677,27 @@ class UserAdministration:
         """Get all suspended users"""
         return self.get_users_by_status('suspended')
     
-    def get_audit_log(self, user_id: int = None, limit: int = 100) -> List[Dict]:
+    def get_audit_log(self, user_id: int = None, limit: int = 100,
+                      before_id: int = None, before_timestamp: Any = None,
+                      action_type: str = None, performed_by: int = None,
+                      start_date: Any = None, end_date: Any = None) -> List[Dict]:
         """
-        Get audit log entries
+        Get audit log entries, newest first
+        
+        Pages are fetched with a keyset cursor: pass the 'timestamp' and 'id'
+        of the last entry of the previous page as before_timestamp/before_id
+        to get the next (older) page. Each page is an index range scan on
+        (timestamp, id), so paging stays fast however deep the history is.
         
         Args:
             user_id: Filter by user ID (None for all)
             limit: Maximum number of entries
+            before_id: Only entries older than this entry (keyset cursor)
+            before_timestamp: Timestamp of the before_id entry
+            action_type: Filter by action type
+            performed_by: Filter by the admin who performed the action
+            start_date: Only entries at or after this date/datetime
+            end_date: Only entries on or before this date (whole day included)
             
         Returns:
             List of audit log entries
@@ -1136,33 +1706,61 @@ class UserAdministration:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
             
-            placeholder = self._get_placeholder()
+            is_mysql = self._is_mysql(conn)
+            placeholder = '%s' if is_mysql else '?'
+            
+            conditions = []
+            params = []
             
             if user_id:
-                query = f"""
-                    SELECT al.id, al.user_id, u.username, al.action_type, 
-                           al.action_description, al.performed_by, p.username as performed_by_name,
-                           al.ip_address, al.timestamp
-                    FROM user_audit_log al
-                    JOIN admin_users u ON al.user_id = u.id
-                    LEFT JOIN admin_users p ON al.performed_by = p.id
-                    WHERE al.user_id = {placeholder}
-                    ORDER BY al.timestamp DESC
-                    LIMIT {placeholder}
-                """
-                cursor.execute(query, (user_id, limit))
-            else:
-                query = f"""
-                    SELECT al.id, al.user_id, u.username, al.action_type,
-                           al.action_description, al.performed_by, p.username as performed_by_name,
-                           al.ip_address, al.timestamp
-                    FROM user_audit_log al
-                    JOIN admin_users u ON al.user_id = u.id
-                    LEFT JOIN admin_users p ON al.performed_by = p.id
-                    ORDER BY al.timestamp DESC
-                    LIMIT {placeholder}
-                """
-                cursor.execute(query, (limit,))
+                conditions.append(f"al.user_id = {placeholder}")
+                params.append(user_id)
+            if action_type:
+                conditions.append(f"al.action_type = {placeholder}")
+                params.append(action_type)
+            if performed_by:
+                conditions.append(f"al.performed_by = {placeholder}")
+                params.append(performed_by)
+            if start_date:
+                conditions.append(f"al.timestamp >= {placeholder}")
+                params.append(self._audit_time_value(start_date, is_mysql))
+            if end_date:
+                if isinstance(end_date, str):
+                    end_date = datetime.strptime(end_date[:10], '%Y-%m-%d')
+                if not isinstance(end_date, datetime):
+                    end_date = datetime(end_date.year, end_date.month, end_date.day)
+                if end_date.time() == datetime.min.time():
+                    end_date += timedelta(days=1)
+                    conditions.append(f"al.timestamp < {placeholder}")
+                else:
+                    conditions.append(f"al.timestamp <= {placeholder}")
+                params.append(self._audit_time_value(end_date, is_mysql))
+            
+            # Keyset cursor
+            if before_timestamp is not None and before_id is not None:
+                conditions.append(f"(al.timestamp < {placeholder} OR "
+                                  f"(al.timestamp = {placeholder} AND al.id < {placeholder}))")
+                before_value = self._audit_time_value(before_timestamp, is_mysql)
+                params.extend([before_value, before_value, before_id])
+            elif before_id is not None:
+                conditions.append(f"al.id < {placeholder}")
+                params.append(before_id)
+            
+            where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            
+            query = f"""
+                SELECT al.id, al.user_id, u.username, al.action_type,
+                       al.action_description, al.performed_by, p.username as performed_by_name,
+                       al.ip_address, al.timestamp
+                FROM user_audit_log al
+                JOIN admin_users u ON al.user_id = u.id
+                LEFT JOIN admin_users p ON al.performed_by = p.id
+                {where_clause}
+                ORDER BY al.timestamp DESC, al.id DESC
+                LIMIT {placeholder}
+            """
+            params.append(limit)
+            cursor.execute(query, params)
             
             logs = []
             for row in cursor.fetchall():
@@ -1187,75 +1785,264 @@ class UserAdministration:
             logger.error(f"Error getting audit log: {e}")
             return []
     
-    def get_user_statistics(self) -> Dict[str, Any]:
+    def _audit_time_value(self, value: Any, is_mysql: bool) -> Any:
+        """Convert a date/datetime/string to the audit timestamp column format"""
+        if isinstance(value, str):
+            return value
+        if not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+        # SQLite stores CURRENT_TIMESTAMP text, which compares as a string
+        return value if is_mysql else value.strftime('%Y-%m-%d %H:%M:%S')
+    
+    def get_audit_action_types(self) -> List[str]:
+        """Get the distinct action types present in the audit log"""
+        try:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT action_type FROM user_audit_log ORDER BY action_type")
+            action_types = [row[0] for row in cursor.fetchall()]
+            cursor.close()
+            conn.close()
+            return action_types
+        except Exception as e:
+            logger.error(f"Error getting audit action types: {e}")
+            return []
+    
+    def archive_audit_log(self, older_than_days: int = None, destination: str = None,
+                          archive_dir: str = None, chunk_size: int = None) -> int:
         """
-        Get comprehensive user statistics
+        Move old audit entries out of the hot user_audit_log table
+        
+        Entries older than the cutoff are moved in chunks (one transaction per
+        chunk) either into user_audit_archive, with the entry stored as a
+        zlib-compressed JSON payload, or into a gzip'd JSONL file. Defaults
+        come from the "audit_retention" configuration section.
         
+        JSONL archiving is at-least-once: a chunk is written to the file
+        before its DELETE commits, so a failed commit leaves the entries in
+        the table and they are archived again by the next run. Read the
+        files back with load_audit_archive_files, which drops duplicate IDs.
+        
+        Args:
+            older_than_days: Archive entries older than this many days
+            destination: 'table' or 'jsonl'
+            archive_dir: Directory for JSONL archives
+            chunk_size: Entries moved per transaction
+            
         Returns:
-            Dictionary with various statistics
+            Number of entries archived
         """
+        retention = self.db_conn.config.config.get('audit_retention', {})
+        older_than_days = older_than_days or int(retention.get('max_age_days', 365))
+        destination = destination or retention.get('archive', 'table')
+        archive_dir = archive_dir or retention.get('archive_dir', './audit_archive')
+        chunk_size = chunk_size or int(retention.get('chunk_size', 5000))
+        
+        if destination not in ('table', 'jsonl'):
+            logger.error(f"Unknown audit archive destination '{destination}'")
+            return 0
+        
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        archived = 0
+        archive_file = None
+        conn = None
+        
         try:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
+            is_mysql = self._is_mysql(conn)
+            placeholder = '%s' if is_mysql else '?'
+            cutoff_value = self._audit_time_value(cutoff, is_mysql)
             
-            stats = {}
+            if destination == 'jsonl':
+                os.makedirs(archive_dir, exist_ok=True)
+                archive_path = os.path.join(
+                    archive_dir, f"user_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz")
+                archive_file = gzip.open(archive_path, 'at', encoding='utf-8')
             
-            # Total users
-            cursor.execute("SELECT COUNT(*) FROM admin_users")
-            stats['total_users'] = cursor.fetchone()[0]
+            while True:
+                begin_transaction(conn)
+                cursor.execute(f"""
+                    SELECT id, user_id, action_type, action_description, performed_by,
+                           ip_address, timestamp, old_values, new_values
+                    FROM user_audit_log
+                    WHERE timestamp < {placeholder}
+                    ORDER BY timestamp, id
+                    LIMIT {placeholder}
+                """, (cutoff_value, chunk_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    conn.rollback()
+                    break
+                
+                entries = [{
+                    'id': row[0],
+                    'user_id': row[1],
+                    'action_type': row[2],
+                    'description': row[3],
+                    'performed_by': row[4],
+                    'ip_address': row[5],
+                    'timestamp': str(row[6]) if row[6] is not None else None,
+                    'old_values': row[7],
+                    'new_values': row[8],
+                } for row in rows]
+                
+                if archive_file:
+                    for entry in entries:
+                        archive_file.write(json.dumps(entry, separators=(',', ':'), default=str) + "\n")
+                    archive_file.flush()
+                else:
+                    cursor.executemany(f"""
+                        INSERT INTO user_audit_archive (id, user_id, action_type, timestamp, payload)
+                        VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
+                    """, [(entry['id'], entry['user_id'], entry['action_type'], row[6],
+                           zlib.compress(json.dumps(entry, separators=(',', ':'), default=str).encode('utf-8')))
+                          for entry, row in zip(entries, rows)])
+                
+                ids = [entry['id'] for entry in entries]
+                for start in range(0, len(ids), SQLITE_MAX_VARIABLES):
+                    batch = ids[start:start + SQLITE_MAX_VARIABLES]
+                    cursor.execute(f"""
+                        DELETE FROM user_audit_log
+                        WHERE id IN ({', '.join([placeholder] * len(batch))})
+                    """, batch)
+                conn.commit()
+                archived += len(rows)
+                
+                if len(rows) < chunk_size:
+                    break
             
-            # Users by status
-            cursor.execute("""
-                SELECT status, COUNT(*) 
-                FROM admin_users 
-                GROUP BY status
-            """)
-            stats['by_status'] = {row[0]: row[1] for row in cursor.fetchall()}
+            cursor.close()
             
-            # Users by role
-            cursor.execute("""
-                SELECT role, COUNT(*) 
-                FROM admin_users 
-                GROUP BY role
-            """)
-            stats['by_role'] = {row[0]: row[1] for row in cursor.fetchall()}
+            if archived:
+                logger.info(f"Archived {archived} audit entries older than {older_than_days} days "
+                            f"to {'user_audit_archive' if destination == 'table' else archive_path}")
             
-            # Users by company
-            cursor.execute("""
-                SELECT company, COUNT(*) 
-                FROM admin_users 
-                WHERE company IS NOT NULL
-                GROUP BY company
-            """)
-            stats['by_company'] = {row[0]: row[1] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error archiving audit log: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+        finally:
+            if archive_file:
+                archive_file.close()
+                if not archived:
+                    os.remove(archive_path)
+            if conn:
+                conn.close()
+        
+        return archived
+    
+    def get_archived_audit_entries(self, user_id: int = None, limit: int = 100) -> List[Dict]:
+        """
+        Read entries back from the user_audit_archive table, newest first
+        
+        Args:
+            user_id: Filter by user ID (None for all)
+            limit: Maximum number of entries
             
-            # Recently created users (last 30 days)
-            is_mysql = self._is_mysql(conn)
-            if is_mysql:
-                cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM admin_users 
-                    WHERE created_date >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                """)
+        Returns:
+            List of archived audit entries
+        """
+        try:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            placeholder = '%s' if self._is_mysql(conn) else '?'
+            
+            if user_id:
+                cursor.execute(f"""
+                    SELECT payload FROM user_audit_archive
+                    WHERE user_id = {placeholder}
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT {placeholder}
+                """, (user_id, limit))
+            else:
+                cursor.execute(f"""
+                    SELECT payload FROM user_audit_archive
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT {placeholder}
+                """, (limit,))
+            
+            entries = [json.loads(zlib.decompress(row[0]).decode('utf-8'))
+                       for row in cursor.fetchall()]
+            
+            cursor.close()
+            conn.close()
+            return entries
+            
+        except Exception as e:
+            logger.error(f"Error reading audit archive: {e}")
+            return []
+    
+    def get_user_statistics(self, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get comprehensive user statistics
+        
+        All user counts come from one grouped query over admin_users; the
+        active session count is a second, separate query. The result is
+        cached for STATS_CACHE_TTL seconds and dropped on any user mutation.
+        
+        Args:
+            force_refresh: Ignore the cached snapshot
+            
+        Returns:
+            Dictionary with various statistics
+        """
+        cached = self._stats_cache
+        if not force_refresh and cached and time.monotonic() - cached[0] < STATS_CACHE_TTL:
+            return cached[1]
+        
+        try:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            
+            if self._is_mysql(conn):
+                recent_cutoff = "DATE_SUB(NOW(), INTERVAL 30 DAY)"
             else:
+                recent_cutoff = "datetime('now', '-30 days')"
+            
+            # One pass: counts per (status, role, company) group, rolled up below
+            cursor.execute(f"""
+                SELECT status, role, company, COUNT(*),
+                       SUM(CASE WHEN created_date >= {recent_cutoff} THEN 1 ELSE 0 END)
+                FROM admin_users
+                GROUP BY status, role, company
+            """)
+            
+            stats = {
+                'total_users': 0,
+                'by_status': {},
+                'by_role': {},
+                'by_company': {},
+                'recently_created': 0,
+                'active_sessions': 0,
+            }
+            for status, role, company, count, recent in cursor.fetchall():
+                stats['total_users'] += count
+                stats['recently_created'] += int(recent or 0)
+                stats['by_status'][status] = stats['by_status'].get(status, 0) + count
+                stats['by_role'][role] = stats['by_role'].get(role, 0) + count
+                if company is not None:
+                    stats['by_company'][company] = stats['by_company'].get(company, 0) + count
+            
+            # Active sessions
+            try:
                 cursor.execute("""
                     SELECT COUNT(*) 
-                    FROM admin_users 
-                    WHERE created_date >= datetime('now', '-30 days')
+                    FROM admin_user_sessions 
+                    WHERE is_active = TRUE
                 """)
-            stats['recently_created'] = cursor.fetchone()[0]
-            
-            # Active sessions
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM admin_user_sessions 
-                WHERE is_active = TRUE
-            """)
-            stats['active_sessions'] = cursor.fetchone()[0]
+                stats['active_sessions'] = cursor.fetchone()[0]
+            except Exception as e:
+                logger.warning(f"Could not count active sessions: {e}")
             
             cursor.close()
             conn.close()
             
+            stats['generated_at'] = datetime.now()
+            self._stats_cache = (time.monotonic(), stats)
             return stats
             
         except Exception as e:
@@ -1276,95 +2063,201 @@ class UserAdministration:
         Returns:
             True if successful, False otherwise
         """
+        return self.grant_privileges_bulk([user_id], [privilege_name],
+                                          granted_by, expires_date) is not None
+    
+    def revoke_privilege(self, user_id: int, privilege_name: str,
+                        revoked_by: int = None) -> bool:
+        """
+        Revoke a specific privilege from a user
+        
+        Args:
+            user_id: User ID
+            privilege_name: Name of privilege to revoke
+            revoked_by: Admin user ID revoking the privilege
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.revoke_privileges_bulk([user_id], [privilege_name], revoked_by) is not None
+    
+    def grant_privileges_bulk(self, user_ids: List[int], privilege_names: List[str],
+                              granted_by: int = None,
+                              expires_date: datetime = None) -> Optional[int]:
+        """
+        Grant every privilege to every user in one transaction
+        
+        Uses one multi-row upsert per chunk of (user, privilege) pairs and
+        one batched audit insert, instead of a SELECT plus UPDATE/INSERT and
+        an audit connection per pair.
+        
+        Args:
+            user_ids: Users receiving the privileges
+            privilege_names: Privileges to grant
+            granted_by: Admin user ID granting the privileges
+            expires_date: Optional expiration date for all grants
+            
+        Returns:
+            Number of (user, privilege) pairs granted, or None on error
+        """
+        pairs = [(user_id, name) for user_id in dict.fromkeys(user_ids)
+                 for name in dict.fromkeys(privilege_names)]
+        if not pairs:
+            return 0
+        
+        conn = None
         try:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
+            is_mysql = self._is_mysql(conn)
+            placeholder = '%s' if is_mysql else '?'
+            row_placeholders = f"({placeholder}, {placeholder}, TRUE, {placeholder}, {placeholder})"
             
-            placeholder = self._get_placeholder()
+            if is_mysql:
+                upsert_clause = """
+                    ON DUPLICATE KEY UPDATE privilege_value = TRUE,
+                        granted_by = VALUES(granted_by),
+                        granted_date = CURRENT_TIMESTAMP,
+                        expires_date = VALUES(expires_date)
+                """
+            else:
+                upsert_clause = """
+                    ON CONFLICT (user_id, privilege_name) DO UPDATE SET privilege_value = TRUE,
+                        granted_by = excluded.granted_by,
+                        granted_date = CURRENT_TIMESTAMP,
+                        expires_date = excluded.expires_date
+                """
             
-            # Check if privilege already exists
-            cursor.execute(f"""
-                SELECT id FROM user_privileges 
-                WHERE user_id = {placeholder} AND privilege_name = {placeholder}
-            """, (user_id, privilege_name))
+            # Four parameters per row; older SQLite builds allow 999 per statement
+            chunk_size = BULK_IMPORT_CHUNK_SIZE if is_mysql else SQLITE_MAX_VARIABLES // 4
             
-            if cursor.fetchone():
-                # Update existing privilege
+            begin_transaction(conn)
+            for start in range(0, len(pairs), chunk_size):
+                chunk = pairs[start:start + chunk_size]
+                params = []
+                for user_id, name in chunk:
+                    params.extend((user_id, name, granted_by, expires_date))
                 cursor.execute(f"""
-                    UPDATE user_privileges 
-                    SET privilege_value = TRUE, granted_by = {placeholder},
-                        granted_date = CURRENT_TIMESTAMP, expires_date = {placeholder}
-                    WHERE user_id = {placeholder} AND privilege_name = {placeholder}
-                """, (granted_by, expires_date, user_id, privilege_name))
-            else:
-                # Insert new privilege
-                cursor.execute(f"""
-                    INSERT INTO user_privileges 
+                    INSERT INTO user_privileges
                     (user_id, privilege_name, privilege_value, granted_by, expires_date)
-                    VALUES ({placeholder}, {placeholder}, TRUE, {placeholder}, {placeholder})
-                """, (user_id, privilege_name, granted_by, expires_date))
+                    VALUES {', '.join([row_placeholders] * len(chunk))}
+                    {upsert_clause}
+                """, params)
+            
+            self._insert_audit_rows(cursor, placeholder, [
+                (user_id, 'PRIVILEGE_GRANTED', f"Privilege '{name}' granted", granted_by)
+                for user_id, name in pairs
+            ])
             
             conn.commit()
             cursor.close()
-            conn.close()
             
-            # Log audit
-            self._log_audit(
-                user_id=user_id,
-                action_type='PRIVILEGE_GRANTED',
-                description=f"Privilege '{privilege_name}' granted",
-                performed_by=granted_by
-            )
-            
-            logger.info(f"Privilege '{privilege_name}' granted to user {user_id}")
-            return True
+            self._notify_change('privilege_granted', user_ids[0] if len(user_ids) == 1 else None)
+            logger.info(f"Granted {len(privilege_names)} privilege(s) to {len(user_ids)} user(s)")
+            return len(pairs)
             
         except Exception as e:
-            logger.error(f"Error granting privilege: {e}")
-            return False
+            logger.error(f"Error granting privileges: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            return None
+        finally:
+            if conn:
+                conn.close()
     
-    def revoke_privilege(self, user_id: int, privilege_name: str,
-                        revoked_by: int = None) -> bool:
+    def revoke_privileges_bulk(self, user_ids: List[int], privilege_names: List[str],
+                               revoked_by: int = None) -> Optional[int]:
         """
-        Revoke a specific privilege from a user
+        Revoke every privilege from every user in one transaction
         
         Args:
-            user_id: User ID
-            privilege_name: Name of privilege to revoke
-            revoked_by: Admin user ID revoking the privilege
+            user_ids: Users losing the privileges
+            privilege_names: Privileges to revoke
+            revoked_by: Admin user ID revoking the privileges
             
         Returns:
-            True if successful, False otherwise
+            Number of privilege rows revoked, or None on error
         """
+        user_ids = list(dict.fromkeys(user_ids))
+        privilege_names = list(dict.fromkeys(privilege_names))
+        if not user_ids or not privilege_names:
+            return 0
+        
+        conn = None
         try:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
-            
-            placeholder = self._get_placeholder()
-            cursor.execute(f"""
-                UPDATE user_privileges 
-                SET privilege_value = FALSE 
-                WHERE user_id = {placeholder} AND privilege_name = {placeholder}
-            """, (user_id, privilege_name))
+            is_mysql = self._is_mysql(conn)
+            placeholder = '%s' if is_mysql else '?'
+            name_list = ', '.join([placeholder] * len(privilege_names))
+            chunk_size = BULK_IMPORT_CHUNK_SIZE if is_mysql else \
+                max(1, SQLITE_MAX_VARIABLES - len(privilege_names))
+            
+            begin_transaction(conn)
+            revoked = []
+            for start in range(0, len(user_ids), chunk_size):
+                chunk = user_ids[start:start + chunk_size]
+                where = f"""
+                    WHERE user_id IN ({', '.join([placeholder] * len(chunk))})
+                      AND privilege_name IN ({name_list})
+                      AND privilege_value = TRUE
+                """
+                params = list(chunk) + privilege_names
+                # Only the privileges actually held are revoked and audited
+                cursor.execute(f"""
+                    SELECT user_id, privilege_name FROM user_privileges {where}
+                    {'FOR UPDATE' if is_mysql else ''}
+                """, params)
+                held = cursor.fetchall()
+                if not held:
+                    continue
+                cursor.execute(f"UPDATE user_privileges SET privilege_value = FALSE {where}", params)
+                revoked.extend(held)
+            
+            self._insert_audit_rows(cursor, placeholder, [
+                (user_id, 'PRIVILEGE_REVOKED', f"Privilege '{name}' revoked", revoked_by)
+                for user_id, name in revoked
+            ])
             
             conn.commit()
             cursor.close()
-            conn.close()
             
-            # Log audit
-            self._log_audit(
-                user_id=user_id,
-                action_type='PRIVILEGE_REVOKED',
-                description=f"Privilege '{privilege_name}' revoked",
-                performed_by=revoked_by
-            )
-            
-            logger.info(f"Privilege '{privilege_name}' revoked from user {user_id}")
-            return True
+            if revoked:
+                self._notify_change('privilege_revoked', user_ids[0] if len(user_ids) == 1 else None)
+            logger.info(f"Revoked {len(revoked)} privilege(s) from {len(user_ids)} user(s)")
+            return len(revoked)
             
         except Exception as e:
-            logger.error(f"Error revoking privilege: {e}")
-            return False
+            logger.error(f"Error revoking privileges: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            return None
+        finally:
+            if conn:
+                conn.close()
+    
+    def _insert_audit_rows(self, cursor, placeholder: str, rows: List[Tuple]):
+        """Insert (user_id, action_type, description, performed_by) audit rows in batches"""
+        for start in range(0, len(rows), BULK_IMPORT_CHUNK_SIZE):
+            cursor.executemany(f"""
+                INSERT INTO user_audit_log (user_id, action_type, action_description, performed_by)
+                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder})
+            """, rows[start:start + BULK_IMPORT_CHUNK_SIZE])
+    
+    def can(self, user: AdminUser, privilege_name: str) -> bool:
+        """
+        Check a privilege for a user from the compiled permission set
+        
+        The set is loaded on first use and reused until it expires or a
+        grant/revoke for the user invalidates it.
+        """
+        return permission_resolver.can(user, privilege_name)
     
     def get_user_privileges(self, user_id: int) -> List[Dict[str, Any]]:
         """
@@ -1380,7 +2273,7 @@ class UserAdministration:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
             
-            placeholder = self._get_placeholder()
+            placeholder = '%s' if self._is_mysql(conn) else '?'
             cursor.execute(f"""
                 SELECT privilege_name, privilege_value, granted_date, expires_date
                 FROM user_privileges
@@ -17,14 +17,29 @@ Date: 2025-10-31
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Callable, Optional, List, Tuple
 import logging
 from user_admin import UserAdministration, AdminUser, UserRole, UserStatus, PrivilegeLevel
+from treeview_sync import TreeRow, sync_treeview
+from user_directory import UserDirectory, USER_COLUMNS
+from background_tasks import run_in_background
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Audit log entries fetched per page
+AUDIT_PAGE_SIZE = 200
+
+# Scroll position (fraction of the list) at which the next page is loaded
+AUDIT_PREFETCH_FRACTION = 0.9
+
+# Typing pause before the user search runs, in milliseconds
+USER_SEARCH_DELAY_MS = 250
+
+# Maximum users shown for a search
+USER_SEARCH_LIMIT = 1000
+
 
 class UserAdminGUI:
     """Main User Administration GUI Application"""
@@ -49,6 +64,20 @@ class UserAdminGUI:
         self.admin = UserAdministration()
         self.current_admin_user = None
         
+        # Users are cached in memory and reloaded after any user mutation
+        self.user_directory = UserDirectory(self.admin.get_all_users)
+        self.admin.add_change_listener(self.user_directory.invalidate)
+        self.user_sort = ("Username", False)
+        
+        # Ranked user IDs from the server-side search for user_search_text
+        # and user_search_filters (status, role); search results keep their
+        # rank order until a column is clicked
+        self.user_search_text = ""
+        self.user_search_filters = (None, None)
+        self.user_search_ids: Optional[List[int]] = None
+        self.user_search_ranked = True
+        self._user_search_job = None
+        
         # Authentication required
         if not self.authenticate_admin():
             self.root.destroy()
@@ -275,7 +304,7 @@ class UserAdminGUI:
         
         self.create_button(button_frame, "➕ New User", self.create_new_user, 
                           self.success_color).pack(side=tk.LEFT, padx=2)
-        self.create_button(button_frame, "🔄 Refresh", self.refresh_user_list, 
+        self.create_button(button_frame, "🔄 Refresh", self.reload_user_list, 
                           self.secondary_color).pack(side=tk.LEFT, padx=2)
         
         # User list
@@ -283,7 +312,7 @@ class UserAdminGUI:
         list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         # Create Treeview
-        columns = ("ID", "Username", "Email", "Role", "Status", "Company", "Position", "Created Date")
+        columns = USER_COLUMNS
         self.user_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=20)
         
         # Define column headings and widths
@@ -327,6 +356,10 @@ class UserAdminGUI:
                           self.success_color).pack(side=tk.LEFT, padx=2)
         self.create_button(action_frame, "🗑 Delete User", self.delete_user,
                           self.danger_color).pack(side=tk.LEFT, padx=2)
+        self.create_button(action_frame, "🔑 Grant Privileges", self.grant_privileges,
+                          self.success_color).pack(side=tk.LEFT, padx=2)
+        self.create_button(action_frame, "🚫 Revoke Privileges", self.revoke_privileges,
+                          self.danger_color).pack(side=tk.LEFT, padx=2)
     
     def create_user_details_tab(self):
         """Create user details tab"""
@@ -358,7 +391,7 @@ class UserAdminGUI:
         refresh_btn = self.create_button(
             self.stats_frame,
             "🔄 Refresh Statistics",
-            self.refresh_statistics,
+            lambda: self.refresh_statistics(force=True),
             self.secondary_color
         )
         refresh_btn.pack(pady=10)
@@ -375,15 +408,35 @@ class UserAdminGUI:
         toolbar = tk.Frame(tab, bg="white", pady=10)
         toolbar.pack(fill=tk.X, padx=10)
         
-        tk.Label(toolbar, text="Filter by User ID:", bg="white").pack(side=tk.LEFT, padx=5)
+        tk.Label(toolbar, text="User ID:", bg="white").pack(side=tk.LEFT, padx=5)
         self.audit_user_id_var = tk.StringVar()
-        audit_user_entry = tk.Entry(toolbar, textvariable=self.audit_user_id_var, width=10)
+        audit_user_entry = tk.Entry(toolbar, textvariable=self.audit_user_id_var, width=8)
         audit_user_entry.pack(side=tk.LEFT, padx=5)
         
+        tk.Label(toolbar, text="Action:", bg="white").pack(side=tk.LEFT, padx=5)
+        self.audit_action_var = tk.StringVar()
+        self.audit_action_combo = ttk.Combobox(toolbar, textvariable=self.audit_action_var,
+                                               width=20, postcommand=self._load_audit_action_types)
+        self.audit_action_combo.pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(toolbar, text="Performed By ID:", bg="white").pack(side=tk.LEFT, padx=5)
+        self.audit_performed_by_var = tk.StringVar()
+        tk.Entry(toolbar, textvariable=self.audit_performed_by_var, width=8).pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(toolbar, text="From (YYYY-MM-DD):", bg="white").pack(side=tk.LEFT, padx=5)
+        self.audit_from_var = tk.StringVar()
+        tk.Entry(toolbar, textvariable=self.audit_from_var, width=11).pack(side=tk.LEFT, padx=5)
+        
+        tk.Label(toolbar, text="To:", bg="white").pack(side=tk.LEFT, padx=5)
+        self.audit_to_var = tk.StringVar()
+        tk.Entry(toolbar, textvariable=self.audit_to_var, width=11).pack(side=tk.LEFT, padx=5)
+        
         self.create_button(toolbar, "🔍 Filter", self.refresh_audit_log,
                           self.secondary_color).pack(side=tk.LEFT, padx=5)
-        self.create_button(toolbar, "🔄 Show All", self.refresh_audit_log,
+        self.create_button(toolbar, "🔄 Show All", self.show_all_audit_log,
                           self.secondary_color).pack(side=tk.LEFT, padx=5)
+        self.create_button(toolbar, "🗄 Archive Old", self.archive_audit_log,
+                          self.warning_color).pack(side=tk.RIGHT, padx=5)
         
         # Audit log list
         log_frame = tk.Frame(tab, bg="white")
@@ -401,7 +454,14 @@ class UserAdminGUI:
         
         vsb = ttk.Scrollbar(log_frame, orient="vertical", command=self.audit_tree.yview)
         hsb = ttk.Scrollbar(log_frame, orient="horizontal", command=self.audit_tree.xview)
-        self.audit_tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.audit_vsb = vsb
+        # Older entries are loaded as the list is scrolled towards the end
+        self.audit_tree.configure(yscrollcommand=self._on_audit_scroll, xscrollcommand=hsb.set)
+        self.audit_filters = {}
+        self.audit_has_more = False
+        self.audit_loading = False
+        self.audit_loaded_count = 0
+        self.audit_cursor = None
         
         self.audit_tree.grid(row=0, column=0, sticky=tk.NSEW)
         vsb.grid(row=0, column=1, sticky=tk.NS)
@@ -448,85 +508,109 @@ class UserAdminGUI:
         self.root.update_idletasks()
     
     def refresh_user_list(self):
-        """Refresh the user list"""
+        """Refresh the user list (reloads users if the directory was invalidated)"""
         try:
-            self.update_status("Loading users...")
-            
-            # Clear existing items
-            for item in self.user_tree.get_children():
-                self.user_tree.delete(item)
+            if not self.user_directory.is_loaded:
+                self.update_status("Loading users...")
             
-            # Get all users
-            users = self.admin.get_all_users()
+            entries = self._render_user_list()
             
-            for user in users:
-                self.user_tree.insert("", tk.END, values=(
-                    user.user_id,
-                    user.username,
-                    user.email,
-                    user.role,
-                    user.status,
-                    user.company or "",
-                    user.position or "",
-                    user.created_date.strftime("%Y-%m-%d %H:%M") if user.created_date else ""
-                ))
-            
-            self.update_status(f"Loaded {len(users)} users")
+            self.update_status(f"Loaded {len(self.user_directory.entries())} users"
+                               + (f", showing {len(entries)}" if self._user_filter_active() else ""))
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load users: {e}")
             logger.error(f"Error refreshing user list: {e}")
     
+    def reload_user_list(self):
+        """Fetch users from the database again"""
+        self.user_directory.invalidate()
+        self.refresh_user_list()
+        if self.user_search_text:
+            self._run_user_search()
+    
+    def _user_filter_active(self) -> bool:
+        """Whether a search term or filter is narrowing the user list"""
+        return bool(self.search_var.get().strip() or self.status_filter_var.get() != "All"
+                    or self.role_filter_var.get() != "All")
+    
+    def _render_user_list(self):
+        """Show the filtered, sorted users from the directory"""
+        sort_column, descending = self.user_sort
+        searching = bool(self.user_search_text) and self.user_search_ids is not None
+        if searching and self.user_search_ranked:
+            sort_column = None
+        entries = self.user_directory.query(
+            search=self.search_var.get(),
+            status=self.status_filter_var.get(),
+            role=self.role_filter_var.get(),
+            sort_column=sort_column,
+            descending=descending,
+            user_ids=self.user_search_ids if searching else None
+        )
+        
+        # Only touch the rows that actually changed
+        sync_treeview(self.user_tree, [entry.row for entry in entries])
+        return entries
+    
+    def _user_search_filters(self) -> Tuple[Optional[str], Optional[str]]:
+        """Status and role filters for the server-side search (None for All)"""
+        return tuple(None if value == "All" else value
+                     for value in (self.status_filter_var.get(), self.role_filter_var.get()))
+    
     def filter_users(self):
         """Filter users based on search and filter criteria"""
-        search_term = self.search_var.get().lower()
-        status_filter = self.status_filter_var.get()
-        role_filter = self.role_filter_var.get()
-        
-        # Clear tree
-        for item in self.user_tree.get_children():
-            self.user_tree.delete(item)
+        search = self.search_var.get().strip()
+        filters = self._user_search_filters()
+        if search != self.user_search_text or (search and filters != self.user_search_filters):
+            # Search through the full-text index once typing pauses; the
+            # filters are part of the search so its limit applies after them
+            self.user_search_text = search
+            self.user_search_filters = filters
+            self.user_search_ranked = True
+            if self._user_search_job:
+                self.root.after_cancel(self._user_search_job)
+                self._user_search_job = None
+            if search:
+                self._user_search_job = self.root.after(USER_SEARCH_DELAY_MS, self._run_user_search)
+                return
+            self.user_search_ids = None
         
-        # Get filtered users
         try:
-            users = self.admin.get_all_users()
-            
-            for user in users:
-                # Apply filters
-                if status_filter != "All" and user.status != status_filter:
-                    continue
-                
-                if role_filter != "All" and user.role != role_filter:
-                    continue
-                
-                if search_term:
-                    if (search_term not in user.username.lower() and
-                        search_term not in user.email.lower() and
-                        (not user.company or search_term not in user.company.lower())):
-                        continue
-                
-                self.user_tree.insert("", tk.END, values=(
-                    user.user_id,
-                    user.username,
-                    user.email,
-                    user.role,
-                    user.status,
-                    user.company or "",
-                    user.position or "",
-                    user.created_date.strftime("%Y-%m-%d %H:%M") if user.created_date else ""
-                ))
-            
+            self._render_user_list()
         except Exception as e:
             logger.error(f"Error filtering users: {e}")
     
+    def _run_user_search(self):
+        """Run the server-side search for the current search text"""
+        self._user_search_job = None
+        search = self.user_search_text
+        status, role = filters = self.user_search_filters
+        
+        def on_done(users):
+            # Ignore results for text or filters that have since changed
+            if search != self.user_search_text or filters != self.user_search_filters:
+                return
+            self.user_search_ids = [user.user_id for user in users]
+            try:
+                entries = self._render_user_list()
+                self.update_status(f"{len(entries)} users match '{search}'")
+            except Exception as e:
+                logger.error(f"Error filtering users: {e}")
+        
+        run_in_background(self.root, self.admin.search_users, on_done,
+                          lambda error: logger.error(f"Error searching users: {error}"),
+                          search, USER_SEARCH_LIMIT, 0, status, role)
+    
     def sort_tree(self, col):
-        """Sort tree by column"""
-        # This is a simple implementation
-        items = [(self.user_tree.set(item, col), item) for item in self.user_tree.get_children('')]
-        items.sort()
-        
-        for index, (val, item) in enumerate(items):
-            self.user_tree.move(item, '', index)
+        """Sort tree by column (click again to reverse)"""
+        sort_column, descending = self.user_sort
+        if self.user_search_text and self.user_search_ranked:
+            # The first click on search results leaves rank order
+            self.user_search_ranked = False
+            sort_column = None
+        self.user_sort = (col, not descending if sort_column == col else False)
+        self.filter_users()
     
     def get_selected_user_id(self) -> Optional[int]:
         """Get the ID of the selected user"""
@@ -538,6 +622,92 @@ class UserAdminGUI:
         item = self.user_tree.item(selection[0])
         return int(item['values'][0])
     
+    def get_selected_user_ids(self) -> List[int]:
+        """Get the IDs of all selected users"""
+        selection = self.user_tree.selection()
+        if not selection:
+            messagebox.showwarning("No Selection", "Please select one or more users first")
+            return []
+        
+        return [int(self.user_tree.item(item)['values'][0]) for item in selection]
+    
+    def _ask_privilege_names(self, title: str, user_count: int) -> List[str]:
+        """Ask for a comma-separated list of privilege names"""
+        names = simpledialog.askstring(
+            title,
+            f"Privileges for {user_count} selected user(s) (comma-separated):",
+            parent=self.root
+        )
+        if not names:
+            return []
+        return [name.strip() for name in names.split(',') if name.strip()]
+    
+    def grant_privileges(self):
+        """Grant privileges to all selected users"""
+        user_ids = self.get_selected_user_ids()
+        if not user_ids:
+            return
+        
+        privilege_names = self._ask_privilege_names("Grant Privileges", len(user_ids))
+        if not privilege_names:
+            return
+        
+        expires = simpledialog.askstring(
+            "Privilege Expiry",
+            "Expiry date (YYYY-MM-DD), leave empty for no expiry:",
+            parent=self.root
+        )
+        if expires is None:
+            return
+        expires_date = None
+        if expires.strip():
+            try:
+                expires_date = datetime.strptime(expires.strip(), "%Y-%m-%d")
+            except ValueError:
+                messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
+                return
+        
+        self.update_status(f"Granting {len(privilege_names)} privilege(s) to {len(user_ids)} user(s)...")
+        
+        def on_done(count):
+            if count is None:
+                messagebox.showerror("Error", "Failed to grant privileges")
+                self.update_status("Granting privileges failed")
+            else:
+                self.update_status(f"Granted {count} privilege(s) across {len(user_ids)} user(s)")
+        
+        run_in_background(self.root, self.admin.grant_privileges_bulk, on_done,
+                          lambda error: messagebox.showerror("Error", f"Failed to grant privileges: {error}"),
+                          user_ids, privilege_names, self.current_admin_user.user_id, expires_date)
+    
+    def revoke_privileges(self):
+        """Revoke privileges from all selected users"""
+        user_ids = self.get_selected_user_ids()
+        if not user_ids:
+            return
+        
+        privilege_names = self._ask_privilege_names("Revoke Privileges", len(user_ids))
+        if not privilege_names:
+            return
+        
+        if not messagebox.askyesno(
+                "Confirm Revoke",
+                f"Revoke {', '.join(privilege_names)} from {len(user_ids)} user(s)?"):
+            return
+        
+        self.update_status(f"Revoking {len(privilege_names)} privilege(s) from {len(user_ids)} user(s)...")
+        
+        def on_done(count):
+            if count is None:
+                messagebox.showerror("Error", "Failed to revoke privileges")
+                self.update_status("Revoking privileges failed")
+            else:
+                self.update_status(f"Revoked {count} privilege(s) across {len(user_ids)} user(s)")
+        
+        run_in_background(self.root, self.admin.revoke_privileges_bulk, on_done,
+                          lambda error: messagebox.showerror("Error", f"Failed to revoke privileges: {error}"),
+                          user_ids, privilege_names, self.current_admin_user.user_id)
+    
     def create_new_user(self):
         """Create a new user"""
         dialog = UserCreateDialog(self.root, self.admin, self.current_admin_user.user_id)
@@ -647,14 +817,15 @@ class UserAdminGUI:
             messagebox.showerror("Error", "User not found")
             return
         
-        dialog = PasswordChangeDialog(self.root, user.username)
+        admin_id = self.current_admin_user.user_id
+        dialog = PasswordChangeDialog(
+            self.root, user.username,
+            save_password=lambda password: self.admin.change_password(user_id, password, admin_id)
+        )
         self.root.wait_window(dialog.dialog)
         
         if dialog.result:
-            if self.admin.change_password(user_id, dialog.result, self.current_admin_user.user_id):
-                messagebox.showinfo("Success", "Password changed successfully")
-            else:
-                messagebox.showerror("Error", "Failed to change password")
+            messagebox.showinfo("Success", "Password changed successfully")
     
     def suspend_user(self):
         """Suspend user account"""
@@ -750,7 +921,9 @@ class UserAdminGUI:
         # Select the item under cursor
         item = self.user_tree.identify_row(event.y)
         if item:
-            self.user_tree.selection_set(item)
+            # Keep a multi-selection when right-clicking inside it
+            if item not in self.user_tree.selection():
+                self.user_tree.selection_set(item)
             
             menu = tk.Menu(self.root, tearoff=0)
             menu.add_command(label="View Details", command=self.view_user_details)
@@ -761,19 +934,26 @@ class UserAdminGUI:
             menu.add_command(label="Suspend User", command=self.suspend_user)
             menu.add_command(label="Activate User", command=self.activate_user)
             menu.add_separator()
+            menu.add_command(label="Grant Privileges", command=self.grant_privileges)
+            menu.add_command(label="Revoke Privileges", command=self.revoke_privileges)
+            menu.add_separator()
             menu.add_command(label="Delete User", command=self.delete_user)
             
             menu.post(event.x_root, event.y_root)
     
-    def refresh_statistics(self):
-        """Refresh statistics display"""
+    def refresh_statistics(self, force: bool = False):
+        """Refresh statistics display from the cached statistics snapshot
+        
+        Args:
+            force: Query the database even if the snapshot is still fresh
+        """
         try:
             # Clear existing widgets
             for widget in self.stats_frame.winfo_children():
                 if widget.winfo_class() != 'Button':
                     widget.destroy()
             
-            stats = self.admin.get_user_statistics()
+            stats = self.admin.get_user_statistics(force_refresh=force)
             
             # Create statistics cards
             cards_frame = tk.Frame(self.stats_frame, bg="white")
@@ -860,7 +1040,9 @@ class UserAdminGUI:
                     bg="white"
                 ).grid(row=i, column=1, sticky=tk.W, padx=10, pady=5)
             
-            self.update_status("Statistics updated")
+            generated_at = stats.get('generated_at')
+            self.update_status("Statistics updated"
+                               + (f" (as of {generated_at.strftime('%H:%M:%S')})" if generated_at else ""))
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load statistics: {e}")
@@ -889,42 +1071,125 @@ class UserAdminGUI:
         
         parent.grid_columnconfigure(col, weight=1)
     
+    def _load_audit_action_types(self):
+        """Fill the action filter with the action types present in the log"""
+        self.audit_action_combo['values'] = [""] + self.admin.get_audit_action_types()
+    
+    def _audit_filters_from_toolbar(self) -> dict:
+        """Read the audit filter fields; invalid numbers/dates are ignored"""
+        def int_or_none(value):
+            try:
+                return int(value) if value.strip() else None
+            except ValueError:
+                return None
+        
+        def date_or_none(value):
+            try:
+                return datetime.strptime(value.strip(), '%Y-%m-%d') if value.strip() else None
+            except ValueError:
+                return None
+        
+        return {
+            'user_id': int_or_none(self.audit_user_id_var.get()),
+            'action_type': self.audit_action_var.get().strip() or None,
+            'performed_by': int_or_none(self.audit_performed_by_var.get()),
+            'start_date': date_or_none(self.audit_from_var.get()),
+            'end_date': date_or_none(self.audit_to_var.get()),
+        }
+    
+    def _audit_row(self, log) -> TreeRow:
+        """Build the treeview row for an audit log entry"""
+        return TreeRow(f"audit:{log['id']}", values=(
+            log['id'],
+            log['username'],
+            log['action_type'],
+            log['description'],
+            log['performed_by_name'] or "System",
+            log['ip_address'] or "N/A",
+            log['timestamp']
+        ))
+    
+    def archive_audit_log(self):
+        """Move audit entries past the retention age into the archive"""
+        days = simpledialog.askinteger(
+            "Archive Audit Log",
+            "Archive audit entries older than how many days?",
+            parent=self.root, minvalue=1,
+            initialvalue=self.admin.db_conn.config.config.get('audit_retention', {}).get('max_age_days', 365)
+        )
+        if not days:
+            return
+        
+        self.update_status(f"Archiving audit entries older than {days} days...")
+        
+        def on_done(count):
+            self.update_status(f"Archived {count} audit log entries")
+            self.refresh_audit_log()
+        
+        run_in_background(self.root, self.admin.archive_audit_log, on_done,
+                          lambda error: messagebox.showerror("Error", f"Failed to archive audit log: {error}"),
+                          days)
+    
+    def show_all_audit_log(self):
+        """Clear the audit filters and reload"""
+        for var in (self.audit_user_id_var, self.audit_action_var, self.audit_performed_by_var,
+                    self.audit_from_var, self.audit_to_var):
+            var.set("")
+        self.refresh_audit_log()
+    
     def refresh_audit_log(self):
-        """Refresh audit log"""
+        """Refresh audit log (first page; older entries load on scroll)"""
         try:
-            # Clear existing items
-            for item in self.audit_tree.get_children():
-                self.audit_tree.delete(item)
-            
-            # Get user ID filter if specified
-            user_id = None
-            user_id_str = self.audit_user_id_var.get().strip()
-            if user_id_str:
-                try:
-                    user_id = int(user_id_str)
-                except ValueError:
-                    pass
+            self.audit_filters = self._audit_filters_from_toolbar()
+            logs = self.admin.get_audit_log(limit=AUDIT_PAGE_SIZE, **self.audit_filters)
             
-            # Get audit log
-            logs = self.admin.get_audit_log(user_id=user_id, limit=500)
-            
-            for log in logs:
-                self.audit_tree.insert("", tk.END, values=(
-                    log['id'],
-                    log['username'],
-                    log['action_type'],
-                    log['description'],
-                    log['performed_by_name'] or "System",
-                    log['ip_address'] or "N/A",
-                    log['timestamp']
-                ))
+            # Only touch the rows that actually changed
+            sync_treeview(self.audit_tree, [self._audit_row(log) for log in logs])
             
+            self.audit_cursor = (logs[-1]['timestamp'], logs[-1]['id']) if logs else None
+            self.audit_has_more = len(logs) == AUDIT_PAGE_SIZE
+            self.audit_loaded_count = len(logs)
             self.update_status(f"Loaded {len(logs)} audit log entries")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load audit log: {e}")
             logger.error(f"Error refreshing audit log: {e}")
     
+    def _on_audit_scroll(self, first, last):
+        """Scrollbar update for the audit list; fetch the next page near the end"""
+        self.audit_vsb.set(first, last)
+        if float(last) >= AUDIT_PREFETCH_FRACTION and self.audit_has_more and not self.audit_loading:
+            self.audit_loading = True
+            # Not from inside the scroll callback, which Tk is still processing
+            self.root.after_idle(self.load_more_audit_log)
+    
+    def load_more_audit_log(self):
+        """Append the next (older) page of audit entries"""
+        try:
+            if not self.audit_has_more or not self.audit_cursor:
+                return
+            before_timestamp, before_id = self.audit_cursor
+            logs = self.admin.get_audit_log(limit=AUDIT_PAGE_SIZE, before_id=before_id,
+                                            before_timestamp=before_timestamp,
+                                            **self.audit_filters)
+            for log in logs:
+                row = self._audit_row(log)
+                if not self.audit_tree.exists(row.key):
+                    self.audit_tree.insert('', 'end', iid=row.key, values=row.values)
+            
+            if logs:
+                self.audit_cursor = (logs[-1]['timestamp'], logs[-1]['id'])
+            self.audit_has_more = len(logs) == AUDIT_PAGE_SIZE
+            self.audit_loaded_count += len(logs)
+            self.update_status(f"Loaded {self.audit_loaded_count} audit log entries"
+                               + ("" if self.audit_has_more else " (end of log)"))
+            
+        except Exception as e:
+            self.audit_has_more = False
+            logger.error(f"Error loading more audit log entries: {e}")
+        finally:
+            self.audit_loading = False
+    
     def run(self):
         """Run the GUI application"""
         self.root.mainloop()
@@ -1025,7 +1290,7 @@ class UserCreateDialog:
         button_frame = tk.Frame(form, bg="white")
         button_frame.grid(row=row, column=0, columnspan=2, pady=20)
         
-        tk.Button(
+        self.create_button = tk.Button(
             button_frame,
             text="Create User",
             command=self.create_user,
@@ -1034,7 +1299,8 @@ class UserCreateDialog:
             font=("Arial", 10, "bold"),
             padx=20,
             pady=5
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        self.create_button.pack(side=tk.LEFT, padx=5)
         
         tk.Button(
             button_frame,
@@ -1046,6 +1312,12 @@ class UserCreateDialog:
             padx=20,
             pady=5
         ).pack(side=tk.LEFT, padx=5)
+        row += 1
+        
+        # Progress shown while the password is hashed and the user saved
+        self.progress = ttk.Progressbar(form, mode='indeterminate', length=300)
+        self.progress.grid(row=row, column=0, columnspan=2, pady=5)
+        self.progress.grid_remove()
     
     def create_user(self):
         """Create the user"""
@@ -1063,7 +1335,7 @@ class UserCreateDialog:
                 messagebox.showerror("Error", "Passwords do not match")
                 return
             
-            user_id = self.admin.create_user(
+            user_fields = dict(
                 username=username,
                 email=email,
                 password=password,
@@ -1078,14 +1350,36 @@ class UserCreateDialog:
                 auto_activate=self.auto_activate_var.get()
             )
             
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to create user: {e}")
+            return
+        
+        # Password hashing runs in a worker so the dialog stays responsive
+        self.create_button.config(state=tk.DISABLED)
+        self.progress.grid()
+        self.progress.start(10)
+        
+        def on_done(user_id):
+            self._end_progress()
             if user_id:
                 self.result = username
                 self.dialog.destroy()
             else:
-                messagebox.showerror("Error", "Failed to create user. Check logs for details.")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create user: {e}")
+                messagebox.showerror("Error", "Failed to create user. Check logs for details.",
+                                     parent=self.dialog)
+        
+        def on_error(error):
+            self._end_progress()
+            messagebox.showerror("Error", f"Failed to create user: {error}", parent=self.dialog)
+        
+        run_in_background(self.dialog, lambda: self.admin.create_user(**user_fields),
+                          on_done, on_error)
+    
+    def _end_progress(self):
+        """Hide the progress bar and re-enable the create button"""
+        self.progress.stop()
+        self.progress.grid_remove()
+        self.create_button.config(state=tk.NORMAL)
 
 
 class UserEditDialog:
@@ -1183,7 +1477,7 @@ class UserEditDialog:
         button_frame = tk.Frame(form, bg="white")
         button_frame.grid(row=row, column=0, columnspan=2, pady=20)
         
-        tk.Button(
+        self.save_button = tk.Button(
             button_frame,
             text="Save Changes",
             command=self.save_changes,
@@ -1192,7 +1486,8 @@ class UserEditDialog:
             font=("Arial", 10, "bold"),
             padx=20,
             pady=5
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        self.save_button.pack(side=tk.LEFT, padx=5)
         
         tk.Button(
             button_frame,
@@ -1204,6 +1499,12 @@ class UserEditDialog:
             padx=20,
             pady=5
         ).pack(side=tk.LEFT, padx=5)
+        row += 1
+        
+        # Progress shown while the user is saved
+        self.progress = ttk.Progressbar(form, mode='indeterminate', length=300)
+        self.progress.grid(row=row, column=0, columnspan=2, pady=5)
+        self.progress.grid_remove()
     
     def save_changes(self):
         """Save user changes"""
@@ -1221,25 +1522,57 @@ class UserEditDialog:
                 'phone_number': self.entries['phone_number'].get().strip() or None,
             }
             
-            if self.admin.update_user(self.user.user_id, self.modified_by, **updates):
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to update user: {e}")
+            return
+        
+        # The update runs in a worker so the dialog stays responsive
+        self.save_button.config(state=tk.DISABLED)
+        self.progress.grid()
+        self.progress.start(10)
+        
+        def on_done(updated):
+            self._end_progress()
+            if updated:
                 self.result = True
                 self.dialog.destroy()
             else:
-                messagebox.showerror("Error", "Failed to update user")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update user: {e}")
+                messagebox.showerror("Error", "Failed to update user", parent=self.dialog)
+        
+        def on_error(error):
+            self._end_progress()
+            messagebox.showerror("Error", f"Failed to update user: {error}", parent=self.dialog)
+        
+        run_in_background(self.dialog,
+                          lambda: self.admin.update_user(self.user.user_id, self.modified_by, **updates),
+                          on_done, on_error)
+    
+    def _end_progress(self):
+        """Hide the progress bar and re-enable the save button"""
+        self.progress.stop()
+        self.progress.grid_remove()
+        self.save_button.config(state=tk.NORMAL)
 
 
 class PasswordChangeDialog:
     """Dialog for changing user password"""
     
-    def __init__(self, parent, username: str):
+    def __init__(self, parent, username: str,
+                 save_password: Optional[Callable[[str], bool]] = None):
+        """
+        Args:
+            parent: Parent window
+            username: User whose password is changed
+            save_password: Optional function that stores the new password and
+                returns True on success; it runs in a worker thread while the
+                dialog shows progress, and the dialog closes when it succeeds
+        """
         self.result = None
+        self.save_password = save_password
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(f"Change Password: {username}")
-        self.dialog.geometry("400x200")
+        self.dialog.geometry("400x260")
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
@@ -1264,7 +1597,7 @@ class PasswordChangeDialog:
         button_frame = tk.Frame(form, bg="white")
         button_frame.pack(pady=20)
         
-        tk.Button(
+        self.change_button = tk.Button(
             button_frame,
             text="Change Password",
             command=self.change_password,
@@ -1273,7 +1606,8 @@ class PasswordChangeDialog:
             font=("Arial", 10, "bold"),
             padx=20,
             pady=5
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        self.change_button.pack(side=tk.LEFT, padx=5)
         
         tk.Button(
             button_frame,
@@ -1299,8 +1633,32 @@ class PasswordChangeDialog:
             messagebox.showerror("Error", "Passwords do not match")
             return
         
-        self.result = password
-        self.dialog.destroy()
+        if not self.save_password:
+            self.result = password
+            self.dialog.destroy()
+            return
+        
+        # Hash and store the password in a worker while showing progress
+        self.change_button.config(state=tk.DISABLED)
+        self.progress = ttk.Progressbar(self.dialog, mode='indeterminate', length=300)
+        self.progress.pack(pady=(0, 10))
+        self.progress.start(10)
+        
+        def on_done(success):
+            self.progress.destroy()
+            if success:
+                self.result = password
+                self.dialog.destroy()
+            else:
+                self.change_button.config(state=tk.NORMAL)
+                messagebox.showerror("Error", "Failed to change password", parent=self.dialog)
+        
+        def on_error(error):
+            self.progress.destroy()
+            self.change_button.config(state=tk.NORMAL)
+            messagebox.showerror("Error", f"Failed to change password: {error}", parent=self.dialog)
+        
+        run_in_background(self.dialog, self.save_password, on_done, on_error, password)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+"""
+User Directory
+==============
+
+In-memory copy of the administrative user list used by the User
+Administration GUI. Users are fetched once and kept together with a
+prebuilt lowercase search key and typed sort keys for every column, so
+column sorting never goes back to the database. Searches can also be
+answered by the server-side full-text index (UserAdministration.search_users)
+and applied here as a ranked list of user IDs. The directory is invalidated
+by UserAdministration change events and reloaded on next use.
+
+Author: Workflow Manager System
+Version: 2.0.0
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from treeview_sync import TreeRow
+
+# User list columns, in display order
+USER_COLUMNS = ("ID", "Username", "Email", "Role", "Status", "Company", "Position", "Created Date")
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    """Dates come back as datetime from MySQL and as text from SQLite"""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+class DirectoryEntry:
+    """One user with its display row, search key and sort keys"""
+
+    __slots__ = ('user', 'row', 'search_key', 'sort_keys')
+
+    def __init__(self, user):
+        created = _as_datetime(user.created_date)
+        self.user = user
+        self.row = TreeRow(f"user:{user.user_id}", values=(
+            user.user_id,
+            user.username,
+            user.email,
+            user.role,
+            user.status,
+            user.company or "",
+            user.position or "",
+            created.strftime("%Y-%m-%d %H:%M") if created else ""
+        ))
+        # Fields matched by the search box
+        self.search_key = "\0".join(
+            (user.username or "", user.email or "", user.company or "")
+        ).lower()
+        self.sort_keys: Dict[str, Any] = {
+            "ID": user.user_id,
+            "Username": (user.username or "").lower(),
+            "Email": (user.email or "").lower(),
+            "Role": user.role or "",
+            "Status": user.status or "",
+            "Company": (user.company or "").lower(),
+            "Position": (user.position or "").lower(),
+            "Created Date": created or datetime.min,
+        }
+
+
+class UserDirectory:
+    """Cached, searchable list of users"""
+
+    def __init__(self, loader: Callable[[], List[Any]]):
+        """
+        Initialize the directory
+
+        Args:
+            loader: Returns the full user list (e.g. UserAdministration.get_all_users)
+        """
+        self.loader = loader
+        self._entries: Optional[List[DirectoryEntry]] = None
+        self._by_id: Dict[int, DirectoryEntry] = {}
+
+    def invalidate(self, *args):
+        """Drop the cached users; accepts and ignores change-event arguments"""
+        self._entries = None
+        self._by_id = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether users are currently cached"""
+        return self._entries is not None
+
+    def entries(self) -> List[DirectoryEntry]:
+        """All users, loading them if the cache is empty"""
+        entries = self._entries
+        if entries is None:
+            entries = [DirectoryEntry(user) for user in self.loader()]
+            self._by_id = {entry.user.user_id: entry for entry in entries}
+            self._entries = entries
+        return entries
+
+    def query(self, search: str = "", status: str = None, role: str = None,
+              sort_column: str = None, descending: bool = False,
+              user_ids: Optional[Sequence[int]] = None) -> List[DirectoryEntry]:
+        """
+        Filter and sort the cached users
+
+        Args:
+            search: Case-insensitive substring of username, email or company
+            status: Only users with this status (None or "All" for any)
+            role: Only users with this role (None or "All" for any)
+            sort_column: Column name from USER_COLUMNS to sort by (None keeps
+                the directory order, or the order of user_ids)
+            descending: Reverse the sort order
+            user_ids: Only these users, in this order (e.g. ranked search
+                results); replaces the substring search
+
+        Returns:
+            Matching directory entries
+        """
+        search = search.strip().lower() if user_ids is None else ""
+        status = None if status in (None, "", "All") else status
+        role = None if role in (None, "", "All") else role
+
+        entries = self.entries()
+        if user_ids is not None:
+            entries = [self._by_id[user_id] for user_id in user_ids if user_id in self._by_id]
+
+        result = [
+            entry for entry in entries
+            if (not status or entry.user.status == status)
+            and (not role or entry.user.role == role)
+            and (not search or search in entry.search_key)
+        ]
+
+        if sort_column in USER_COLUMNS:
+            result.sort(key=lambda entry: entry.sort_keys[sort_column], reverse=descending)
+        return result
@@ -10,6 +10,7 @@ Version: 1.0.0
 """
 
 import hashlib
+import hmac
 import secrets
 import tkinter as tk
 from tkinter import ttk, messagebox
@@ -17,7 +18,12 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple
 import json
 import os
-from db_config import get_database_connection
+from db_config import get_database_connection, DatabaseConnection, begin_transaction
+from permissions import permission_resolver, ROLE_RANKS
+from activity_log_writer import ActivityLogWriter, DEFAULT_FLUSH_INTERVAL, DEFAULT_BATCH_SIZE
+from session_tokens import (SessionTokenSigner, SessionActivityTracker, SessionClaims,
+                            DEFAULT_TOKEN_TTL_HOURS, DEFAULT_IDLE_TIMEOUT_MINUTES,
+                            DEFAULT_ACTIVITY_FLUSH_SECONDS, DEFAULT_SWEEP_INTERVAL_SECONDS)
 
 
 class User:
@@ -37,29 +43,59 @@ class User:
 class UserSession:
     """User session data class"""
     def __init__(self, session_id: str, user_id: int, login_time: datetime, 
-                 last_activity: datetime, ip_address: str = None):
+                 last_activity: datetime, ip_address: str = None, token: str = None):
         self.session_id = session_id
         self.user_id = user_id
         self.login_time = login_time
         self.last_activity = last_activity
         self.ip_address = ip_address
+        self.token = token  # Signed token, validated without a database lookup
 
 
 class UserManager:
     """User management and authentication system"""
     
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(self, config_file: str = "config.json", db_conn: DatabaseConnection = None):
         """
         Initialize User Manager
         
         Args:
             config_file: Path to database configuration file
+            db_conn: Shared (pooled) database connection; created from
+                config_file if None
         """
         self.config_file = config_file
-        self.db_conn = get_database_connection(config_file)
+        self.db_conn = db_conn or get_database_connection(config_file)
         self.current_user: Optional[User] = None
         self.current_session: Optional[UserSession] = None
         
+        # Compiled role + privilege set of the logged-in user
+        self.permissions = permission_resolver
+        if self.permissions.db_conn is None:
+            self.permissions.db_conn = self.db_conn
+        
+        # Activity events are written in batches by a background thread
+        log_config = self.db_conn.config.config.get('activity_log', {})
+        self.activity_writer = ActivityLogWriter(
+            self.db_conn,
+            flush_interval=float(log_config.get('flush_interval_seconds', DEFAULT_FLUSH_INTERVAL)),
+            batch_size=int(log_config.get('batch_size', DEFAULT_BATCH_SIZE)),
+            sample_rates=log_config.get('sample_rates')
+        )
+        
+        # Signed session tokens; last_activity is written in batches
+        session_config = self.db_conn.config.config.get('sessions', {})
+        self.session_signer = SessionTokenSigner(
+            session_config.get('secret'),
+            ttl_hours=float(session_config.get('token_ttl_hours', DEFAULT_TOKEN_TTL_HOURS))
+        )
+        self.session_tracker = SessionActivityTracker(
+            self.db_conn,
+            flush_interval=float(session_config.get('activity_flush_seconds', DEFAULT_ACTIVITY_FLUSH_SECONDS)),
+            idle_timeout_minutes=float(session_config.get('idle_timeout_minutes', DEFAULT_IDLE_TIMEOUT_MINUTES)),
+            sweep_interval=float(session_config.get('sweep_interval_seconds', DEFAULT_SWEEP_INTERVAL_SECONDS))
+        )
+        
         # Initialize database tables
         self._create_user_tables()
     
@@ -266,12 +302,15 @@ class UserManager:
         Returns:
             User object if successful, None otherwise
         """
+        conn = None
         try:
+            # One connection and one transaction for the whole login
             conn = self.db_conn.connect()
             cursor = conn.cursor()
+            is_mysql = self._is_mysql(conn)
+            placeholder = '%s' if is_mysql else '?'
+            begin_transaction(conn)
             
-            # Check if user is locked
-            placeholder = self._get_placeholder()
             cursor.execute(f"""
                 SELECT id, username, email, password_hash, salt, role, is_active,
                        failed_login_attempts, locked_until
@@ -281,93 +320,131 @@ class UserManager:
             
             result = cursor.fetchone()
             if not result:
-                cursor.close()
-                conn.close()
+                conn.rollback()
                 return None
             
             user_id, db_username, email, password_hash, salt, role, is_active, \
             failed_attempts, locked_until = result
             
-            # Check if account is locked
+            # Check if account is locked (SQLite returns the timestamp as text)
+            if isinstance(locked_until, str):
+                locked_until = datetime.fromisoformat(locked_until)
             if locked_until and datetime.now() < locked_until:
-                cursor.close()
-                conn.close()
+                conn.rollback()
                 return None
             
             # Verify password
             hashed_password, _ = self._hash_password(password, salt)
-            if hashed_password != password_hash:
+            if not hmac.compare_digest(hashed_password, password_hash):
                 # Increment failed login attempts
-                placeholder = self._get_placeholder()
-                is_mysql = hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
-                
                 if is_mysql:
-                    cursor.execute(f"""
-                        UPDATE users 
-                        SET failed_login_attempts = failed_login_attempts + 1,
-                            locked_until = CASE 
-                                WHEN failed_login_attempts >= 4 THEN DATE_ADD(NOW(), INTERVAL 15 MINUTE)
-                                ELSE locked_until
-                            END
-                        WHERE id = {placeholder}
-                    """, (user_id,))
+                    lock_expiry = "DATE_ADD(NOW(), INTERVAL 15 MINUTE)"
                 else:
-                    # SQLite version
-                    cursor.execute(f"""
-                        UPDATE users 
-                        SET failed_login_attempts = failed_login_attempts + 1,
-                            locked_until = CASE 
-                                WHEN failed_login_attempts >= 4 THEN datetime('now', '+15 minutes')
-                                ELSE locked_until
-                            END
-                        WHERE id = {placeholder}
-                    """, (user_id,))
-                conn.commit()
-                cursor.close()
-                conn.close()
-                return None
-            
-            # Reset failed login attempts on successful login
-            placeholder = self._get_placeholder()
-            is_mysql = hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
-            
-            if is_mysql:
+                    lock_expiry = "datetime('now', 'localtime', '+15 minutes')"
                 cursor.execute(f"""
                     UPDATE users 
-                    SET failed_login_attempts = 0, 
-                        locked_until = NULL,
-                        last_login = NOW()
-                    WHERE id = {placeholder}
-                """, (user_id,))
-            else:
-                # SQLite version
-                cursor.execute(f"""
-                    UPDATE users 
-                    SET failed_login_attempts = 0, 
-                        locked_until = NULL,
-                        last_login = datetime('now')
+                    SET failed_login_attempts = failed_login_attempts + 1,
+                        locked_until = CASE 
+                            WHEN failed_login_attempts >= 4 THEN {lock_expiry}
+                            ELSE locked_until
+                        END
                     WHERE id = {placeholder}
                 """, (user_id,))
+                conn.commit()
+                return None
             
-            conn.commit()
-            cursor.close()
-            conn.close()
+            # Reset failed login attempts on successful login
+            now_sql = "NOW()" if is_mysql else "datetime('now')"
+            cursor.execute(f"""
+                UPDATE users 
+                SET failed_login_attempts = 0, 
+                    locked_until = NULL,
+                    last_login = {now_sql}
+                WHERE id = {placeholder}
+            """, (user_id,))
             
             # Create user object
             user = User(user_id, db_username, email, role, is_active)
             user.last_login = datetime.now()
             
-            # Create session
-            self._create_session(user, ip_address)
+            # Permissions are compiled once per login, on the same connection
+            self.permissions.load(user, cursor)
+            
+            # Session and login activity in the same transaction
+            session = self._insert_session(cursor, placeholder, is_mysql, user, ip_address)
+            self._insert_activity(cursor, placeholder, is_mysql, user.user_id, session.session_id,
+                                  'login', f'User {username} logged in', ip_address)
             
-            # Log successful login
-            self.log_activity(user.user_id, 'login', f'User {username} logged in', ip_address)
+            conn.commit()
             
+            self.session_tracker.register(session.session_id)
+            self.current_user = user
+            self.current_session = session
             return user
             
         except Exception as e:
             print(f"Error authenticating user: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
             return None
+        finally:
+            if conn:
+                conn.close()
+    
+    def _is_mysql(self, conn) -> bool:
+        """Check whether a connection is a MySQL connection"""
+        return hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
+    
+    def _insert_session(self, cursor, placeholder: str, is_mysql: bool,
+                        user: User, ip_address: str = None) -> UserSession:
+        """
+        Deactivate the user's old sessions and insert a new one
+        
+        Runs on the caller's cursor so it can share the caller's transaction.
+        
+        Returns:
+            The new UserSession, with its signed token
+        """
+        session_id = secrets.token_urlsafe(32)
+        now = datetime.now()
+        
+        # Deactivate old sessions for this user
+        cursor.execute(f"""
+            UPDATE user_sessions 
+            SET is_active = FALSE 
+            WHERE user_id = {placeholder} AND is_active = TRUE
+        """, (user.user_id,))
+        
+        # SQLite stores the timestamps as strings
+        timestamp = now if is_mysql else now.strftime('%Y-%m-%d %H:%M:%S')
+        cursor.execute(f"""
+            INSERT INTO user_sessions (session_id, user_id, login_time, last_activity, ip_address)
+            VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
+        """, (session_id, user.user_id, timestamp, timestamp, ip_address))
+        
+        return UserSession(session_id, user.user_id, now, now, ip_address,
+                           token=self.session_signer.issue(session_id, user.user_id))
+    
+    def _insert_activity(self, cursor, placeholder: str, is_mysql: bool, user_id: int,
+                         session_id: Optional[str], activity_type: str,
+                         description: str, ip_address: str = None):
+        """Insert one activity log row on the caller's cursor"""
+        if is_mysql:
+            cursor.execute(f"""
+                INSERT INTO user_activity_log (user_id, session_id, activity_type, 
+                                             activity_description, ip_address)
+                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
+            """, (user_id, session_id, activity_type, description, ip_address))
+        else:
+            # SQLite version - use current timestamp
+            cursor.execute(f"""
+                INSERT INTO user_activity_log (user_id, session_id, activity_type, 
+                                             activity_description, ip_address, timestamp)
+                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, datetime('now'))
+            """, (user_id, session_id, activity_type, description, ip_address))
     
     def _create_session(self, user: User, ip_address: str = None) -> str:
         """
@@ -380,46 +457,24 @@ class UserManager:
         Returns:
             Session ID
         """
-        session_id = secrets.token_urlsafe(32)
-        now = datetime.now()
-        
         try:
             conn = self.db_conn.connect()
             cursor = conn.cursor()
+            is_mysql = self._is_mysql(conn)
             
-            # Deactivate old sessions for this user
-            placeholder = self._get_placeholder()
-            cursor.execute(f"""
-                UPDATE user_sessions 
-                SET is_active = FALSE 
-                WHERE user_id = {placeholder} AND is_active = TRUE
-            """, (user.user_id,))
-            
-            # Create new session
-            is_mysql = hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
-            
-            if is_mysql:
-                cursor.execute(f"""
-                    INSERT INTO user_sessions (session_id, user_id, login_time, last_activity, ip_address)
-                    VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-                """, (session_id, user.user_id, now, now, ip_address))
-            else:
-                # SQLite version - convert datetime to string
-                now_str = now.strftime('%Y-%m-%d %H:%M:%S')
-                cursor.execute(f"""
-                    INSERT INTO user_sessions (session_id, user_id, login_time, last_activity, ip_address)
-                    VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-                """, (session_id, user.user_id, now_str, now_str, ip_address))
+            session = self._insert_session(cursor, '%s' if is_mysql else '?', is_mysql,
+                                           user, ip_address)
             
             conn.commit()
             cursor.close()
             conn.close()
             
             # Store current session
+            self.session_tracker.register(session.session_id)
             self.current_user = user
-            self.current_session = UserSession(session_id, user.user_id, now, now, ip_address)
+            self.current_session = session
             
-            return session_id
+            return session.session_id
             
         except Exception as e:
             print(f"Error creating session: {e}")
@@ -428,28 +483,32 @@ class UserManager:
     def logout(self):
         """Logout current user"""
         if self.current_session:
+            # The token stops validating at once; its pending touch is dropped
+            self.session_tracker.end(self.current_session.session_id)
             try:
                 conn = self.db_conn.connect()
                 cursor = conn.cursor()
                 
                 # Deactivate session
-                placeholder = self._get_placeholder()
+                placeholder = '%s' if self._is_mysql(conn) else '?'
                 cursor.execute(f"""
                     UPDATE user_sessions 
                     SET is_active = FALSE 
                     WHERE session_id = {placeholder}
                 """, (self.current_session.session_id,))
                 
-                # Log logout activity
-                self.log_activity(self.current_user.user_id, 'logout', 
-                                f'User {self.current_user.username} logged out')
-                
                 conn.commit()
                 cursor.close()
                 conn.close()
                 
             except Exception as e:
                 print(f"Error during logout: {e}")
+            
+            # Log logout activity and write everything queued for this session
+            self.log_activity(self.current_user.user_id, 'logout', 
+                            f'User {self.current_user.username} logged out')
+            self.flush_activity_log()
+            self.permissions.invalidate(self.current_user.username)
         
         self.current_user = None
         self.current_session = None
@@ -459,41 +518,49 @@ class UserManager:
         """
         Log user activity
         
+        The event is queued and written in the background by the activity
+        log writer, so this returns immediately.
+        
         Args:
             user_id: User ID
             activity_type: Type of activity
             description: Activity description
             ip_address: Client IP address
         """
-        try:
-            conn = self.db_conn.connect()
-            cursor = conn.cursor()
-            
-            session_id = self.current_session.session_id if self.current_session else None
-            
-            placeholder = self._get_placeholder()
-            is_mysql = hasattr(conn, 'server_version') or 'mysql' in str(type(conn)).lower()
-            
-            if is_mysql:
-                cursor.execute(f"""
-                    INSERT INTO user_activity_log (user_id, session_id, activity_type, 
-                                                 activity_description, ip_address)
-                    VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-                """, (user_id, session_id, activity_type, description, ip_address))
-            else:
-                # SQLite version - use current timestamp
-                cursor.execute(f"""
-                    INSERT INTO user_activity_log (user_id, session_id, activity_type, 
-                                                 activity_description, ip_address, timestamp)
-                    VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, datetime('now'))
-                """, (user_id, session_id, activity_type, description, ip_address))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
+        session_id = self.current_session.session_id if self.current_session else None
+        self.activity_writer.log(user_id, session_id, activity_type, description, ip_address)
+        self.session_tracker.touch(session_id)
+    
+    def flush_activity_log(self) -> bool:
+        """Write all queued activity events now"""
+        return self.activity_writer.flush()
+    
+    def validate_session_token(self, token: str, touch: bool = True) -> Optional[SessionClaims]:
+        """
+        Validate a session token without a database lookup
+        
+        Checks the signature and expiry, and that the session has not been
+        ended or gone idle in this process.
+        
+        Args:
+            token: Token from UserSession.token
+            touch: Count the validation as session activity (pass False for
+                status checks, so polling cannot keep an idle session alive)
             
-        except Exception as e:
-            print(f"Error logging activity: {e}")
+        Returns:
+            The token's claims, or None if the token is not valid
+        """
+        claims = self.session_signer.verify(token)
+        if claims is None or not self.session_tracker.is_active(claims.session_id):
+            return None
+        if touch:
+            self.session_tracker.touch(claims.session_id)
+        return claims
+    
+    def close(self):
+        """Write the remaining activity and stop the background writers"""
+        self.activity_writer.close()
+        self.session_tracker.close()
     
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
@@ -543,6 +610,28 @@ class UserManager:
             print(f"Error getting user by email: {e}")
             return None
     
+    def has_users(self) -> bool:
+        """Check whether any user account exists.
+        
+        Uses EXISTS so the database stops at the first primary key entry
+        instead of reading the whole users table.
+        """
+        try:
+            conn = self.db_conn.connect()
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM users)")
+            result = cursor.fetchone()
+            
+            cursor.close()
+            conn.close()
+            
+            return bool(result and result[0])
+            
+        except Exception as e:
+            print(f"Error checking for users: {e}")
+            return False
+    
     def get_all_users(self) -> List[User]:
         """Get all users"""
         try:
@@ -658,8 +747,13 @@ class UserManager:
             return []
     
     def is_authenticated(self) -> bool:
-        """Check if user is currently authenticated"""
-        return self.current_user is not None and self.current_session is not None
+        """
+        Check if user is currently authenticated (token valid and not idle)
+        
+        A status check, not activity: it never extends the session.
+        """
+        return (self.current_user is not None and self.current_session is not None
+                and self.validate_session_token(self.current_session.token, touch=False) is not None)
     
     def get_current_user(self) -> Optional[User]:
         """Get current authenticated user"""
@@ -670,18 +764,25 @@ class UserManager:
         if not self.current_user:
             return False
         
-        role_hierarchy = {'user': 1, 'manager': 2, 'admin': 3}
-        current_level = role_hierarchy.get(self.current_user.role, 0)
-        required_level = role_hierarchy.get(required_role, 0)
+        # Unknown roles rank lowest, as before
+        if required_role not in ROLE_RANKS:
+            required_role = 'guest'
+        return self.can(f"role:{required_role}")
+    
+    def can(self, privilege: str) -> bool:
+        """
+        Check a fine-grained privilege (or role:<name>) for the current user
         
-        return current_level >= required_level
+        Answered from the permission set compiled at login; expired grants
+        trigger a recompile.
+        """
+        return self.permissions.can(self.current_user, privilege)
 
 
 def create_default_admin_user(user_manager: UserManager) -> bool:
     """Create default admin user if no users exist"""
     try:
-        users = user_manager.get_all_users()
-        if not users:
+        if not user_manager.has_users():
             return user_manager.create_user('admin', 'admin@workflow.local', 'admin123', 'admin')
         return True
     except Exception as e: